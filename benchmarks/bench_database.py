@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark: DatabaseManager fetch throughput against SQLite."""
+
+from pathlib import Path
+from typing import Tuple
+
+from src.reports.processor import REPORT_QUERY
+
+from .fixtures import (
+    create_reports_db, write_config, database_section, sqlite_database, REPORT_DATE
+)
+from .harness import Timer
+
+
+def fetch_all(size: int, workdir: Path) -> Tuple[int, float]:
+    """Fetch one day of `size` rows with DatabaseManager.execute_query."""
+    db_path = create_reports_db(workdir / 'bench.db', size)
+    config = write_config(workdir, {'DATABASE': database_section(db_path)})
+    db = sqlite_database(config)
+
+    try:
+        with Timer() as timer:
+            rows = db.execute_query(REPORT_QUERY, {'date': REPORT_DATE})
+    finally:
+        db.disconnect()
+
+    return len(rows), timer.seconds
+
+
+def fetch_streaming(size: int, workdir: Path) -> Tuple[int, float]:
+    """Stream one day of `size` rows with DatabaseManager.iter_query."""
+    db_path = create_reports_db(workdir / 'bench.db', size)
+    config = write_config(workdir, {'DATABASE': database_section(db_path)})
+    db = sqlite_database(config)
+    rows = 0
+
+    try:
+        with Timer() as timer:
+            for batch in db.iter_query(REPORT_QUERY, {'date': REPORT_DATE}, batch_size=5000):
+                rows += len(batch)
+    finally:
+        db.disconnect()
+
+    return rows, timer.seconds
+
+
+def fetch_columnar(size: int, workdir: Path) -> Tuple[int, float]:
+    """Stream one day of `size` rows as columnar batches with iter_columnar."""
+    db_path = create_reports_db(workdir / 'bench.db', size)
+    config = write_config(workdir, {'DATABASE': database_section(db_path)})
+    db = sqlite_database(config)
+    rows = 0
+
+    try:
+        with Timer() as timer:
+            for batch in db.iter_columnar(REPORT_QUERY, {'date': REPORT_DATE}, batch_size=5000):
+                rows += batch.num_rows
+    finally:
+        db.disconnect()
+
+    return rows, timer.seconds
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: ExcelGenerator rendering.
+
+Run directly to time both engines on the same rows and check that they
+produce the same cells:
+
+    python -m benchmarks.bench_excel [size]
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from typing import Tuple, List, Iterator
+
+from src.core.excel import ExcelGenerator
+
+from .fixtures import make_rows, headers
+from .harness import Timer
+
+
+def _generate(size: int, workdir: Path, engine: str) -> Tuple[int, float]:
+    rows = make_rows(size)
+    generator = ExcelGenerator()
+    generator.engine = engine
+
+    with Timer() as timer:
+        generator.generate_excel(rows, workdir / f'bench_{engine}.xlsx', headers())
+
+    return size, timer.seconds
+
+
+def generate_excel(size: int, workdir: Path) -> Tuple[int, float]:
+    """Render `size` rows with ExcelGenerator.generate_excel."""
+    return _generate(size, workdir, 'openpyxl')
+
+
+def generate_excel_native(size: int, workdir: Path) -> Tuple[int, float]:
+    """Render `size` rows with the native xlsx engine."""
+    return _generate(size, workdir, 'nativo')
+
+
+def cells(path: Path) -> Iterator[Tuple]:
+    """(value, number format, bold) of every cell of every sheet."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True)
+    for ws in wb.worksheets:
+        for row in ws.iter_rows():
+            for cell in row:
+                if cell.value is not None:
+                    yield cell.coordinate, cell.value, cell.number_format, bool(cell.font.b)
+
+
+def main(argv: List[str] = None) -> int:
+    """Time both engines and compare their output cell by cell."""
+    argv = sys.argv[1:] if argv is None else argv
+    size = int(argv[0]) if argv else 100000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        _, reference = generate_excel(size, workdir)
+        _, native = generate_excel_native(size, workdir)
+        same = list(cells(workdir / 'bench_openpyxl.xlsx')) == list(cells(workdir / 'bench_nativo.xlsx'))
+
+    print(f"{size} rows: openpyxl {reference:.2f}s, nativo {native:.2f}s "
+          f"({reference / native if native else 0:.1f}x)")
+    print(f"Identical cells: {'yes' if same else 'NO'}")
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
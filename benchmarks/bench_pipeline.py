@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark: end-to-end ReportProcessor.process with FTP/SMTP stand-ins."""
+
+from pathlib import Path
+from typing import Tuple
+
+from src.core.email import EmailManager
+from src.core.excel import ExcelGenerator
+from src.core.ftp import FTPManager
+from src.reports.processor import ReportProcessor
+
+from .fixtures import (
+    create_reports_db, write_config, database_section, sqlite_database,
+    REPORT_DATE, headers
+)
+from .harness import Timer
+from .standins import ftp_standin, smtp_standin
+
+
+def process(size: int, workdir: Path) -> Tuple[int, float]:
+    """Extract, render, upload and email one day of `size` rows."""
+    db_path = create_reports_db(workdir / 'bench.db', size)
+
+    with ftp_standin() as ftp_server, smtp_standin() as smtp_server:
+        config = write_config(workdir, {
+            'DATABASE': database_section(db_path),
+            'FTP': {'habilitado': 'true', 'servidor': '127.0.0.1',
+                    'puerto': ftp_server.port, 'usuario': 'bench'},
+            'EMAIL': {'habilitado': 'true', 'servidor_smtp': '127.0.0.1',
+                      'puerto_smtp': smtp_server.port,
+                      'remitente_email': 'bench@localhost',
+                      'destinatarios_principales': 'ops@localhost',
+                      'destinatarios_error': 'ops@localhost',
+                      'max_tamano_adjunto_mb': 4096},
+        })
+        db = sqlite_database(config)
+        processor = ReportProcessor(
+            config, db, EmailManager(config), ExcelGenerator(config), FTPManager(config)
+        )
+
+        try:
+            with Timer() as timer:
+                result = processor.process(REPORT_DATE, workdir / 'report.xlsx', headers())
+        finally:
+            db.disconnect()
+
+        if not result.success:
+            raise RuntimeError(result.error)
+        if ftp_server.messages != 1 or smtp_server.messages != 1:
+            raise RuntimeError("Report was not delivered to the FTP/SMTP stand-ins")
+
+    return result.records_processed, timer.seconds
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: cold-start import time of a single report run.
+
+Runs ``python -X importtime`` in a fresh interpreter and reads the
+cumulative import time of the report processor, which is what the
+``daily-report`` command loads before running a date. Run directly to list the
+slowest imports and which heavy dependencies were loaded:
+
+    python -m benchmarks.bench_startup [module]
+"""
+
+import sys
+import subprocess
+from pathlib import Path
+from typing import Tuple, List, Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+STARTUP_MODULE = 'src.reports.processor'
+HEAVY_MODULES = ('oracledb', 'openpyxl', 'pandas', 'numpy', 'pyarrow', 'smtplib', 'ftplib')
+
+
+def import_times(module: str = STARTUP_MODULE) -> Dict[str, int]:
+    """
+    Import a module in a fresh interpreter.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        Dict of imported module name to cumulative import time in microseconds
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def cold_start(size: int, workdir: Path) -> Tuple[int, float]:
+    """Cold-import the processor `size` times (at most 5); return mean seconds."""
+    runs = max(1, min(size, 5))
+    total = sum(import_times()[STARTUP_MODULE] for _ in range(runs))
+    return runs, total / runs / 1_000_000
+
+
+def main(argv: List[str] = None) -> int:
+    """Print the slowest imports of a module."""
+    argv = sys.argv[1:] if argv is None else argv
+    module = argv[0] if argv else STARTUP_MODULE
+    times = import_times(module)
+
+    print(f"{module}: {times[module] / 1000:.1f} ms")
+    for name, micros in sorted(times.items(), key=lambda item: -item[1])[1:16]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+    loaded = [name for name in HEAVY_MODULES if name in times]
+    print(f"Heavy modules loaded: {', '.join(loaded) or 'none'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
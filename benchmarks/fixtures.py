@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Shared data and configuration for benchmark cases."""
+
+import sqlite3
+from pathlib import Path
+from datetime import datetime
+from typing import List, Tuple, Dict
+
+from src.core.config import ConfigManager
+from src.core.database import DatabaseManager
+from src.utils.synthetic import SyntheticDataGenerator, SyntheticSpec
+
+
+REPORT_DATE = datetime(2025, 1, 15)
+
+
+def generator(size: int) -> SyntheticDataGenerator:
+    """Seeded generator for one report day of `size` rows."""
+    return SyntheticDataGenerator(
+        SyntheticSpec(rows=size, columns=6, start_date=REPORT_DATE, days=1,
+                      null_ratio=0.02, cardinality=500, seed=7)
+    )
+
+
+def headers() -> List[str]:
+    """Column headers of the generated rows."""
+    return [name.upper() for name in generator(0).column_names]
+
+
+def make_rows(size: int) -> List[Tuple]:
+    """Deterministic report rows with native datetimes."""
+    return generator(size).rows(native_dates=True)
+
+
+def create_reports_db(path: Path, size: int) -> Path:
+    """Create a SQLite file with a `reports` table holding one day of rows."""
+    generator(size).load_sqlite(path)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE VIEW transactions AS SELECT report_date AS transaction_date FROM reports")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def write_config(workdir: Path, sections: Dict[str, Dict[str, object]]) -> ConfigManager:
+    """Write an ini file into workdir and load it."""
+    lines = []
+    for section, values in sections.items():
+        lines.append(f"[{section}]")
+        lines.extend(f"{key} = {value}" for key, value in values.items())
+        lines.append("")
+    path = Path(workdir) / 'config.ini'
+    path.write_text('\n'.join(lines), encoding='utf-8')
+    return ConfigManager(str(path))
+
+
+def database_section(path: Path) -> Dict[str, object]:
+    """DATABASE section using the SQLite backend on `path`."""
+    return {'motor': 'sqlite', 'ruta': path}
+
+
+def sqlite_database(config: ConfigManager) -> DatabaseManager:
+    """Connected DatabaseManager for a config from database_section."""
+    db = DatabaseManager(config)
+    db.connect()
+    return db
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmark harness: isolated runs, peak RSS, JSON results and baselines."""
+
+import sys
+import json
+import time
+import queue as queue_module
+import tempfile
+import platform
+import multiprocessing
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass, asdict
+from typing import Callable, Optional, List, Dict, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Longest a single case may run before it is reported as failed
+CASE_TIMEOUT = 1800
+# Interval at which a waiting parent checks whether the child died
+POLL_SECONDS = 1.0
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurement of one benchmark case at one size."""
+    name: str
+    rows: int
+    seconds: float
+    peak_rss_mb: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Throughput in rows per second."""
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """Serialize including derived throughput."""
+        data = asdict(self)
+        data['rows_per_sec'] = round(self.rows_per_sec, 1)
+        return data
+
+
+class Timer:
+    """Context manager measuring the wall time of the benchmarked section."""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.seconds = 0.0
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.seconds = time.perf_counter() - self.start
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the current process in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def _child(func: Callable, size: int, workdir: str, queue) -> None:
+    """Run a case in a fresh process and report (rows, seconds, rss, error)."""
+    try:
+        rows, seconds = func(size, Path(workdir))
+        queue.put((rows, seconds, peak_rss_mb(), None))
+    except Exception as e:
+        queue.put((0, 0.0, peak_rss_mb(), f"{type(e).__name__}: {e}"))
+
+
+def _wait_result(process, queue, timeout: float) -> Tuple[int, float, Optional[float], Optional[str]]:
+    """Wait for the child's report, turning a crash or hang into an error."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return queue.get(timeout=POLL_SECONDS)
+        except queue_module.Empty:
+            pass
+
+        if process.exitcode is not None:
+            # The report may still be in flight when the child exits
+            try:
+                return queue.get(timeout=POLL_SECONDS)
+            except queue_module.Empty:
+                return 0, 0.0, None, f"Process exited with code {process.exitcode}"
+
+        if time.monotonic() >= deadline:
+            process.terminate()
+            return 0, 0.0, None, f"Timed out after {timeout:g}s"
+
+
+def run_case(
+    name: str,
+    func: Callable,
+    size: int,
+    timeout: float = CASE_TIMEOUT
+) -> BenchmarkResult:
+    """
+    Run one benchmark case in a separate process.
+
+    Each case runs in a freshly spawned interpreter so peak RSS is not
+    polluted by earlier cases. A child that crashes or exceeds the
+    timeout yields an errored result instead of blocking the run.
+
+    Args:
+        name: Case name
+        func: Top-level function (size, workdir) -> (rows, seconds)
+        size: Number of rows to benchmark with
+        timeout: Seconds to wait for the case
+
+    Returns:
+        BenchmarkResult: Measurement
+    """
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+
+    with tempfile.TemporaryDirectory(prefix='bench_') as workdir:
+        process = context.Process(target=_child, args=(func, size, workdir, queue))
+        process.start()
+        rows, seconds, rss, error = _wait_result(process, queue, timeout)
+        process.join()
+
+    # Errored cases keep the requested size so they match the baseline key
+    return BenchmarkResult(name=name, rows=rows if error is None else size,
+                           seconds=round(seconds, 4), peak_rss_mb=rss, error=error)
+
+
+def save_results(results: List[BenchmarkResult], path: Path) -> Path:
+    """Write results as JSON, with environment details."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': [r.to_dict() for r in results],
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding='utf-8')
+    return path
+
+
+def load_results(path: Path) -> Dict[Tuple[str, int], dict]:
+    """Load saved results keyed by (name, rows)."""
+    payload = json.loads(Path(path).read_text(encoding='utf-8'))
+    return {(r['name'], r['rows']): r for r in payload['results']}
+
+
+def compare(
+    results: List[BenchmarkResult],
+    baseline_path: Path,
+    tolerance: float = 0.2
+) -> List[str]:
+    """
+    Compare results against a stored baseline.
+
+    A case regresses when its throughput drops, or its peak RSS grows,
+    by more than the tolerance. A case that errored always fails.
+
+    Args:
+        results: Current results
+        baseline_path: Baseline JSON from save_results
+        tolerance: Allowed relative change (0.2 = 20%)
+
+    Returns:
+        List of regression and failure descriptions (empty if none)
+    """
+    baseline = load_results(baseline_path)
+    regressions = []
+
+    for result in results:
+        if result.error:
+            regressions.append(f"{result.name}[{result.rows}]: failed: {result.error}")
+            continue
+
+        previous = baseline.get((result.name, result.rows))
+        if not previous:
+            continue
+
+        old_rate = previous.get('rows_per_sec') or 0
+        if old_rate and result.rows_per_sec < old_rate * (1 - tolerance):
+            regressions.append(
+                f"{result.name}[{result.rows}]: {result.rows_per_sec:,.0f} rows/s "
+                f"vs baseline {old_rate:,.0f} rows/s"
+            )
+
+        old_rss = previous.get('peak_rss_mb')
+        if old_rss and result.peak_rss_mb and result.peak_rss_mb > old_rss * (1 + tolerance):
+            regressions.append(
+                f"{result.name}[{result.rows}]: peak RSS {result.peak_rss_mb:,.1f} MB "
+                f"vs baseline {old_rss:,.1f} MB"
+            )
+
+    return regressions
+
+
+def format_table(results: List[BenchmarkResult]) -> str:
+    """Render results as a fixed-width table."""
+    lines = [f"{'case':<28}{'rows':>10}{'seconds':>10}{'rows/s':>12}{'peak MB':>10}"]
+    lines.append('-' * len(lines[0]))
+    for r in results:
+        if r.error:
+            lines.append(f"{r.name:<28}{'':>10}  ERROR {r.error}")
+            continue
+        rss = f"{r.peak_rss_mb:,.1f}" if r.peak_rss_mb is not None else '-'
+        lines.append(
+            f"{r.name:<28}{r.rows:>10,}{r.seconds:>10.3f}{r.rows_per_sec:>12,.0f}{rss:>10}"
+        )
+    return '\n'.join(lines)
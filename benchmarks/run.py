@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Run the benchmark suite.
+
+Usage:
+    python -m benchmarks.run [--suite excel,database,pipeline,startup]
+                             [--sizes 10000,100000,1000000]
+                             [--save results.json] [--baseline baseline.json]
+                             [--tolerance 0.2]
+
+Exits with status 1 when a case failed, or when a baseline is given and
+a case regressed.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+from . import bench_excel, bench_database, bench_pipeline, bench_startup
+from .harness import run_case, save_results, compare, format_table
+
+
+SUITES = {
+    'excel': [
+        ('excel.generate_excel', bench_excel.generate_excel),
+        ('excel.generate_excel_native', bench_excel.generate_excel_native),
+    ],
+    'database': [
+        ('database.fetch_all', bench_database.fetch_all),
+        ('database.fetch_streaming', bench_database.fetch_streaming),
+        ('database.fetch_columnar', bench_database.fetch_columnar),
+    ],
+    'pipeline': [('pipeline.process', bench_pipeline.process)],
+    'startup': [('startup.cold_start', bench_startup.cold_start)],
+}
+# Suites measured once with this many repetitions instead of per size
+FIXED_SIZES = {'startup': [5]}
+DEFAULT_SIZES = '10000,100000,1000000'
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Report pipeline benchmarks")
+    parser.add_argument('--suite', default=','.join(SUITES),
+                        help="Comma-separated suites to run")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help="Comma-separated row counts")
+    parser.add_argument('--save', type=Path, help="Write results to this JSON file")
+    parser.add_argument('--baseline', type=Path, help="Compare against this JSON file")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed relative regression (default 0.2)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run selected suites and report results."""
+    args = parse_args(argv)
+    suites = [s.strip() for s in args.suite.split(',') if s.strip()]
+    unknown = [s for s in suites if s not in SUITES]
+    if unknown:
+        print(f"Unknown suite(s): {', '.join(unknown)}. Available: {', '.join(SUITES)}")
+        return 2
+
+    sizes = [int(s) for s in args.sizes.split(',')]
+    results = []
+
+    for suite in suites:
+        for name, func in SUITES[suite]:
+            for size in FIXED_SIZES.get(suite, sizes):
+                print(f"Running {name} [{size:,} rows]...", flush=True)
+                results.append(run_case(name, func, size))
+
+    print()
+    print(format_table(results))
+
+    if args.save:
+        print(f"\nResults saved to {save_results(results, args.save)}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\nNo regressions vs {args.baseline}")
+
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
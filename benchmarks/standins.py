@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+In-process FTP and SMTP stand-ins.
+
+They implement just enough of each protocol for ftplib and smtplib, so
+FTPManager and EmailManager can be exercised without external servers.
+Received payloads are counted and discarded.
+"""
+
+import socket
+import threading
+import socketserver
+from typing import Optional
+
+
+class _StandinServer(socketserver.ThreadingTCPServer):
+    """Threaded TCP server on an ephemeral localhost port."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handler):
+        super().__init__(('127.0.0.1', 0), handler)
+        self.messages = 0
+        self.bytes_received = 0
+        self.lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        """Listening port."""
+        return self.server_address[1]
+
+    def record(self, size: int) -> None:
+        """Count one received payload."""
+        with self.lock:
+            self.messages += 1
+            self.bytes_received += size
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+        self.server_close()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP session: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT."""
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode('ascii'))
+
+    def handle(self):
+        self.reply("220 standin ESMTP")
+        for raw in self.rfile:
+            command = raw.decode('ascii', 'replace').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply("250 standin")
+            elif command.startswith(('MAIL', 'RCPT', 'RSET', 'NOOP')):
+                self.reply("250 OK")
+            elif command == 'DATA':
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                for line in self.rfile:
+                    if line in (b'.\r\n', b'.\n'):
+                        break
+                    size += len(line)
+                self.server.record(size)
+                self.reply("250 OK queued")
+            elif command == 'QUIT':
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _FTPHandler(socketserver.StreamRequestHandler):
+    """Minimal passive-mode FTP session accepting STOR uploads."""
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode('ascii'))
+
+    def handle(self):
+        data_listener = None
+        self.reply("220 standin FTP")
+
+        for raw in self.rfile:
+            line = raw.decode('ascii', 'replace').strip()
+            command = line.split(' ', 1)[0].upper()
+
+            if command == 'USER':
+                self.reply("331 Password required")
+            elif command == 'PASS':
+                self.reply("230 Logged in")
+            elif command in ('TYPE', 'NOOP'):
+                self.reply("200 OK")
+            elif command == 'CWD':
+                self.reply("250 OK")
+            elif command == 'PASV':
+                data_listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                data_listener.bind(('127.0.0.1', 0))
+                data_listener.listen(1)
+                port = data_listener.getsockname()[1]
+                self.reply(f"227 Entering Passive Mode (127,0,0,1,{port >> 8},{port & 0xFF})")
+            elif command == 'STOR' and data_listener is not None:
+                self.reply("150 Opening data connection")
+                conn, _ = data_listener.accept()
+                size = 0
+                with conn:
+                    while True:
+                        chunk = conn.recv(1024 * 1024)
+                        if not chunk:
+                            break
+                        size += len(chunk)
+                data_listener.close()
+                data_listener = None
+                self.server.record(size)
+                self.reply("226 Transfer complete")
+            elif command == 'QUIT':
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+def smtp_standin() -> _StandinServer:
+    """Create an SMTP stand-in; use as a context manager to serve."""
+    return _StandinServer(_SMTPHandler)
+
+
+def ftp_standin() -> _StandinServer:
+    """Create an FTP stand-in; use as a context manager to serve."""
+    return _StandinServer(_FTPHandler)
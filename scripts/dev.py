@@ -9,6 +9,7 @@ COMMANDS = {
     'install-dev': ['pip', 'install', '-r', 'requirements.txt', '-r', 'requirements-dev.txt'],
     'test': ['pytest', 'tests/', '-v'],
     'test-cov': ['pytest', 'tests/', '--cov=src', '--cov-report=html'],
+    'bench': ['python', '-m', 'benchmarks.run', '--save', 'benchmarks/results.json'],
     'demo': ['python', 'demo/demo_report.py'],
 }
 
@@ -21,4 +22,4 @@ if __name__ == '__main__':
         sys.exit(1)
     
     cmd = COMMANDS[sys.argv[1]]
-    subprocess.run(cmd)
\ No newline at end of file
+    subprocess.run(cmd)
\ No newline at end of file
@@ -4,4 +4,9 @@ setup(
     name="daily-report-pipeline",
     version="0.1.0",
     packages=find_packages(),
-)
\ No newline at end of file
+    entry_points={
+        'console_scripts': [
+            'daily-report=src.cli:main',
+        ],
+    },
+)
\ No newline at end of file
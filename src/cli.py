@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+cli.py
+======
+Command-line entry point (``daily-report``).
+
+Runs the report for one date, or backfills a date range through the
+shared work queue with several worker processes, and prints how long
+each pipeline stage took.
+
+Heavy dependencies (oracledb, openpyxl, pandas, pyarrow, smtplib,
+ftplib) are imported by src.core on first use, so a run only pays for
+the components it touches.
+"""
+
+import sys
+import argparse
+import multiprocessing
+from pathlib import Path
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple
+
+DATE_FORMAT = '%Y-%m-%d'
+DEFAULT_OUTPUT = 'output/reporte_{fecha}.{formato}'
+FORMATS = ('xlsx', 'csv', 'parquet')
+
+
+def parse_date(text: str) -> datetime:
+    """Parse a YYYY-MM-DD command-line date."""
+    try:
+        return datetime.strptime(text, DATE_FORMAT)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {text!r}, expected YYYY-MM-DD")
+
+
+def parse_formats(text: str) -> str:
+    """Parse a comma-separated list of output formats."""
+    formats = [f.strip().lower() for f in text.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in FORMATS]
+    if not formats or unknown:
+        raise argparse.ArgumentTypeError(
+            f"invalid format {text!r}, expected a comma-separated list of {', '.join(FORMATS)}"
+        )
+    return ','.join(formats)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog='daily-report',
+        description="Generate and deliver the daily report for a date or a date range"
+    )
+    parser.add_argument('date', nargs='?', type=parse_date,
+                        help="Report date YYYY-MM-DD (default: yesterday)")
+    parser.add_argument('--start', type=parse_date, help="First date of a backfill range")
+    parser.add_argument('--end', type=parse_date,
+                        help="Last date of a backfill range (default: yesterday)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes for a backfill range (default: 1)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Skip dates a previous backfill of the range completed")
+    parser.add_argument('--format', type=parse_formats,
+                        help="Output format, or several separated by commas written "
+                             "from one extraction (xlsx, csv, parquet; default: "
+                             "[REPORTE] formato or xlsx)")
+    parser.add_argument('--no-ftp', action='store_true', help="Do not upload to FTP")
+    parser.add_argument('--no-email', action='store_true', help="Do not send emails")
+    parser.add_argument('--config', default='config.ini', help="Configuration file")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help="Output file; {fecha} is replaced by YYYYMMDD and "
+                             "{formato} by the (first) format")
+    return parser
+
+
+def output_path(pattern: str, date: datetime, output_format: str = 'xlsx') -> Path:
+    """Output file of a report date."""
+    return Path(pattern.format(fecha=date.strftime('%Y%m%d'), formato=output_format))
+
+
+def _yesterday() -> datetime:
+    today = datetime.now()
+    return datetime(today.year, today.month, today.day) - timedelta(days=1)
+
+
+def _build_processor(config, output_format: Optional[str]):
+    """Connected processor from config, with the command-line format applied."""
+    from .reports.processor import ReportProcessor
+
+    processor = ReportProcessor.from_config(config)
+    if output_format:
+        processor.output_format = output_format
+    processor.db.ensure_connected()
+    return processor
+
+
+def _date_callback(processor, config, options: Dict[str, Any]):
+    """Callback processing one date, raising PipelineError on failure."""
+    from .utils.reprocessor import DateRangeReprocessor
+
+    return DateRangeReprocessor(config, Path('.')).processor_callback(
+        processor,
+        Path('.'),
+        options['output'],
+        upload_ftp=not options['no_ftp'],
+        send_email=not options['no_email']
+    )
+
+
+def run_range_worker(config_path: str, options: Dict[str, Any]) -> Tuple[Any, Dict]:
+    """
+    Drain the range's queued dates in this process.
+
+    Args:
+        config_path: Configuration file
+        options: report, dates, output, format, no_ftp and no_email
+
+    Returns:
+        Tuple of (worker ProcessResult, stage timer snapshot)
+    """
+    from .core.config import ConfigManager
+    from .core.exceptions import PipelineError
+    from .utils.workqueue import WorkQueue, QueueWorker
+
+    config = ConfigManager(config_path)
+    processor = _build_processor(config, options['format'])
+    callback = _date_callback(processor, config, options)
+
+    try:
+        # One grouped query answers every date this worker may claim
+        callback.prefetch(options['dates'])
+    except PipelineError:
+        pass
+
+    try:
+        worker = QueueWorker(WorkQueue(config), {options['report']: callback})
+        result = worker.run(until_empty=True)
+    finally:
+        processor.db.disconnect()
+
+    return result, processor.timer.snapshot()
+
+
+def run_single(args, config) -> Tuple[bool, Dict]:
+    """Process one date; returns (success, stage timer snapshot)."""
+    date = args.date or _yesterday()
+    processor = _build_processor(config, args.format)
+    path = output_path(args.output, date, processor.output_format.split(',')[0])
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        result = processor.process(
+            date, path, upload_ftp=not args.no_ftp, send_email=not args.no_email
+        )
+    finally:
+        processor.db.disconnect()
+
+    if result.success:
+        note = f" ({result.reason})" if result.skipped else ''
+        print(f"{date:%Y-%m-%d}: {result.records_processed} records -> "
+              f"{result.file_generated}{note}")
+    else:
+        print(f"{date:%Y-%m-%d}: failed - {result.error}", file=sys.stderr)
+    return result.success, processor.timer.snapshot()
+
+
+def run_range(args, config) -> Tuple[bool, List[Dict]]:
+    """Backfill a date range; returns (all done, stage timer snapshots)."""
+    from .utils.workqueue import WorkQueue, DONE, FAILED, PENDING
+
+    start, end = args.start, args.end or _yesterday()
+    dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    report = config.get('REPORTE', 'nombre', default='reporte')
+    queue = WorkQueue(config)
+    queue.enqueue(report, dates)
+    # Without --resume completed dates run again; failed ones always do
+    queue.requeue(report, dates, include_done=not args.resume)
+
+    options = {
+        'report': report,
+        'dates': dates,
+        'output': args.output,
+        'format': args.format,
+        'no_ftp': args.no_ftp,
+        'no_email': args.no_email,
+    }
+    workers = max(1, min(args.workers, len(dates)))
+
+    if workers == 1:
+        outcomes = [run_range_worker(args.config, options)]
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(run_range_worker, args.config, options) for _ in range(workers)]
+            outcomes = [future.result() for future in futures]
+
+    counts = queue.counts(report)
+    print(f"{start:%Y-%m-%d}..{end:%Y-%m-%d}: {len(dates)} dates, {counts[DONE]} done, "
+          f"{counts[FAILED]} failed, {counts[PENDING]} pending ({workers} worker(s))")
+    return counts[FAILED] == 0 and counts[PENDING] == 0, [timings for _, timings in outcomes]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the report for one date or a date range.
+
+    Args:
+        argv: Command-line arguments (sys.argv[1:] by default)
+
+    Returns:
+        int: Exit status, 0 when every date succeeded
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.date and (args.start or args.end):
+        parser.error("give either a date or --start/--end, not both")
+    if args.end and not args.start:
+        parser.error("--end requires --start")
+    if args.start and args.start > (args.end or _yesterday()):
+        parser.error("--start must be <= --end")
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+
+    from .core.config import ConfigManager
+    from .core.instrumentation import StageTimer
+
+    config = ConfigManager(args.config)
+    timer = StageTimer()
+
+    if args.start:
+        success, snapshots = run_range(args, config)
+    else:
+        success, snapshot = run_single(args, config)
+        snapshots = [snapshot]
+
+    for snapshot in snapshots:
+        timer.merge(snapshot)
+    if timer.seconds:
+        print()
+        print(timer.format_table())
+
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
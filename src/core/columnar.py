@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Columnar, array-backed batches of query results."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from datetime import datetime, date
+from dataclasses import dataclass
+from typing import List, Tuple, Any, Optional, Sequence
+
+from .lazy import lazy_import
+
+np = lazy_import('numpy')
+pa = lazy_import('pyarrow')
+
+
+@dataclass
+class ColumnBatch:
+    """
+    A batch of rows stored as one typed array per column.
+
+    Numeric columns are int64/float64, timestamps datetime64[us] and
+    anything else an object array. ``masks[i]`` is a boolean array that
+    is True where column i is NULL, or None when the column has no NULLs;
+    the value stored under a NULL is a filler (0, NaN, NaT or None).
+    """
+    names: List[str]
+    columns: List[np.ndarray]
+    masks: List[Optional[np.ndarray]]
+
+    @property
+    def num_rows(self) -> int:
+        """Number of rows in the batch."""
+        return len(self.columns[0]) if self.columns else 0
+
+    @staticmethod
+    def _to_array(values: Sequence[Any]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Convert one column of Python values to a typed array and NULL mask."""
+        mask = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+        has_nulls = bool(mask.any())
+        sample = next((v for v in values if v is not None), None)
+
+        try:
+            if isinstance(sample, bool) or sample is None:
+                array = np.array(values, dtype=object)
+            elif isinstance(sample, int) and all(
+                    isinstance(v, int) for v in values if v is not None):
+                filled = [0 if v is None else v for v in values] if has_nulls else values
+                array = np.array(filled, dtype=np.int64)
+            elif isinstance(sample, (int, float, Decimal)):
+                array = np.array(
+                    [np.nan if v is None else float(v) for v in values], dtype=np.float64
+                )
+            elif isinstance(sample, (datetime, date)):
+                array = np.array(values, dtype='datetime64[us]')
+            else:
+                array = np.array(values, dtype=object)
+        except (TypeError, ValueError, OverflowError):
+            array = np.array(values, dtype=object)
+
+        return array, (mask if has_nulls else None)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Sequence[Any]],
+        names: Optional[List[str]] = None
+    ) -> 'ColumnBatch':
+        """
+        Transpose row tuples into typed column arrays.
+
+        Args:
+            rows: Row tuples
+            names: Optional column names (generic names if omitted)
+
+        Returns:
+            ColumnBatch
+        """
+        width = len(rows[0]) if rows else len(names or [])
+        if not names or len(names) != width:
+            names = [f"col_{i}" for i in range(1, width + 1)]
+
+        columns, masks = [], []
+        for values in (zip(*rows) if rows else [()] * width):
+            array, mask = cls._to_array(values)
+            columns.append(array)
+            masks.append(mask)
+
+        return cls(names=list(names), columns=columns, masks=masks)
+
+    def column(self, name: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Get (values, null mask) of a column by name, ignoring case."""
+        for idx, column_name in enumerate(self.names):
+            if column_name.lower() == name.lower():
+                return self.columns[idx], self.masks[idx]
+        raise KeyError(name)
+
+    def to_arrow(self) -> pa.RecordBatch:
+        """Convert to an Arrow record batch, with NULLs from the masks."""
+        arrays = []
+        for values, mask in zip(self.columns, self.masks):
+            if values.dtype == object:
+                arrays.append(pa.array(values.tolist(), from_pandas=True))
+            else:
+                arrays.append(pa.array(values, mask=mask))
+        return pa.RecordBatch.from_arrays(arrays, names=self.names)
+
+    def to_rows(self) -> List[Tuple]:
+        """Convert back to row tuples of Python values."""
+        columns = []
+        for values, mask in zip(self.columns, self.masks):
+            if values.dtype.kind == 'M':
+                python_values = values.astype(object).tolist()
+            else:
+                python_values = values.tolist()
+            if mask is not None:
+                python_values = [None if null else v for v, null in zip(python_values, mask)]
+            columns.append(python_values)
+        return list(zip(*columns))
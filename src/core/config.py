@@ -6,7 +6,7 @@
 
 import configparser
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict
 
 class ConfigManager:
     """Handles configuration files operations."""
@@ -58,4 +58,10 @@ class ConfigManager:
 
     def has_section(self, section: str) -> bool:
         """Check if section exists."""
-        return self.config.has_section(section)
\ No newline at end of file
+        return self.config.has_section(section)
+
+    def items(self, section: str) -> Dict[str, str]:
+        """Get all keys of a section (empty if the section is missing)."""
+        if not self.config.has_section(section):
+            return {}
+        return dict(self.config.items(section))
\ No newline at end of file
@@ -2,13 +2,264 @@
 # -*- coding: utf-8 -*-
 """Database connection and query management."""
 
-import oracledb 
+import sqlite3
+import hashlib
+import importlib.util
 from pathlib import Path 
-from typing import Optional, List, Tuple, Any
-from datetime import datetime 
+from collections import OrderedDict
+from typing import Optional, List, Tuple, Any, Iterator, Dict, Type, Iterable
+from datetime import datetime, timedelta, date as date_type
 
 from .config import ConfigManager 
-from .exceptions import DatabaseError
+from .lazy import lazy_import
+from .columnar import ColumnBatch
+from .instrumentation import QueryInstrumentation, StatementStats, RunStats
+from .throttle import DatabaseThrottle
+from .exceptions import DatabaseError, ConfigurationError
+
+oracledb = lazy_import('oracledb')
+
+DEFAULT_FETCH_SIZE = 1000
+DEFAULT_STATEMENT_CACHE = 20
+
+CHECK_DATA_QUERY = """
+    SELECT COUNT(*)
+    FROM transactions
+    WHERE TRUNC(transaction_date) = TRUNC(:check_date)
+"""
+
+PROBE_DATES_QUERY = """
+    SELECT TRUNC(transaction_date), COUNT(*)
+    FROM transactions
+    WHERE transaction_date >= :start_date
+    AND transaction_date < :end_date
+    GROUP BY TRUNC(transaction_date)
+"""
+
+
+class DatabaseBackend:
+    """Interface of a database engine used by DatabaseManager."""
+
+    name = ''
+
+    @property
+    def error_types(self) -> Tuple[Type[BaseException], ...]:
+        """Driver exception types wrapped into DatabaseError."""
+        raise NotImplementedError
+
+    def is_available(self) -> bool:
+        """Check whether the driver can be used on this machine."""
+        raise NotImplementedError
+
+    def connect(self, config: ConfigManager):
+        """Open a DB-API connection from configuration."""
+        raise NotImplementedError
+
+    def translate(self, query: str) -> str:
+        """Adapt Oracle-style SQL text to this engine."""
+        return query
+
+    def translate_params(self, params: Optional[dict]) -> Optional[dict]:
+        """Adapt bind values to this engine."""
+        return params
+
+    def prepare(self, cursor, query: str) -> Optional[str]:
+        """
+        Prepare a statement on a dedicated cursor.
+
+        Returns:
+            Statement to pass to cursor.execute() on every run
+        """
+        return self.translate(query)
+
+    def input_sizes(self, params: Optional[dict]) -> Dict[str, Any]:
+        """Bind types to declare with cursor.setinputsizes()."""
+        return {}
+
+    def hash_bucket(self, column: str, buckets: int) -> str:
+        """SQL expression mapping a column to a bucket in [0, buckets)."""
+        raise NotImplementedError
+
+    def rowid_bucket(self, buckets: int) -> str:
+        """SQL expression mapping a row's physical location to a bucket."""
+        raise NotImplementedError
+
+    def execute(
+        self,
+        cursor,
+        query: str,
+        params: Optional[dict] = None,
+        batch_size: int = DEFAULT_FETCH_SIZE,
+        stats: Optional[StatementStats] = None
+    ) -> Iterator[List[Tuple]]:
+        """
+        Execute a query and stream its rows in batches.
+
+        Args:
+            cursor: DB-API cursor
+            query: SQL query string (Oracle style)
+            params: Dictionary of parameters for query
+            batch_size: Rows per fetch round trip
+            stats: Optional measurements to update
+
+        Yields:
+            Lists of row tuples
+        """
+        cursor.arraysize = batch_size
+        params = self.translate_params(params)
+        if params:
+            cursor.execute(self.translate(query), params)
+        else:
+            cursor.execute(self.translate(query))
+        if stats:
+            stats.executed()
+
+        while True:
+            if stats:
+                stats.fetch_started()
+            rows = cursor.fetchmany(batch_size)
+            if stats:
+                stats.fetched(rows)
+            if not rows:
+                break
+            yield rows
+
+
+class OracleBackend(DatabaseBackend):
+    """Oracle database through python-oracledb."""
+
+    name = 'oracle'
+
+    @property
+    def error_types(self) -> Tuple[Type[BaseException], ...]:
+        return (oracledb.Error,)
+
+    def is_available(self) -> bool:
+        # oracledb is a lazy stand-in, so look for the driver without importing it
+        return importlib.util.find_spec('oracledb') is not None
+
+    def connect(self, config: ConfigManager):
+        dsn = oracledb.makedsn(
+            config.get('DATABASE', 'host'),
+            config.getint('DATABASE', 'port'),
+            service_name=config.get('DATABASE', 'service_name')
+        )
+
+        return oracledb.connect(
+            user=config.get('DATABASE', 'user'),
+            password=config.get('DATABASE', 'password'),
+            dsn=dsn,
+            stmtcachesize=config.getint(
+                'DATABASE', 'cache_sentencias', default=DEFAULT_STATEMENT_CACHE
+            )
+        )
+
+    def prepare(self, cursor, query: str) -> Optional[str]:
+        cursor.prepare(query)
+        return None
+
+    def input_sizes(self, params: Optional[dict]) -> Dict[str, Any]:
+        # Fixed DATE binds keep one child cursor per statement
+        return {
+            key: oracledb.DB_TYPE_DATE
+            for key, value in (params or {}).items()
+            if isinstance(value, (datetime, date_type))
+        }
+
+    def hash_bucket(self, column: str, buckets: int) -> str:
+        return f"ORA_HASH({column}, {buckets - 1})"
+
+    def rowid_bucket(self, buckets: int) -> str:
+        # Rows of one data block land in the same bucket
+        return f"MOD(DBMS_ROWID.ROWID_BLOCK_NUMBER(ROWID), {buckets})"
+
+
+class SQLiteBackend(DatabaseBackend):
+    """
+    Local SQLite file, for development, CI and benchmarks.
+
+    Oracle's TRUNC() on dates is provided as a SQL function, and datetime
+    binds are sent as 'YYYY-MM-DD HH:MM:SS' text, the format dates are
+    stored in. Named ``:name`` binds work unchanged.
+    """
+
+    name = 'sqlite'
+
+    @property
+    def error_types(self) -> Tuple[Type[BaseException], ...]:
+        return (sqlite3.Error,)
+
+    def is_available(self) -> bool:
+        return True
+
+    @staticmethod
+    def _trunc(value: Any) -> Optional[str]:
+        """SQLite implementation of Oracle TRUNC(date)."""
+        return str(value)[:10] if value is not None else None
+
+    def connect(self, config: ConfigManager):
+        path = config.get('DATABASE', 'ruta', default=':memory:')
+        connection = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            cached_statements=config.getint(
+                'DATABASE', 'cache_sentencias', default=DEFAULT_STATEMENT_CACHE
+            )
+        )
+        connection.create_function('TRUNC', 1, self._trunc, deterministic=True)
+        return connection
+
+    def translate_params(self, params: Optional[dict]) -> Optional[dict]:
+        if not params:
+            return params
+
+        translated = {}
+        for key, value in params.items():
+            if isinstance(value, datetime):
+                value = value.strftime('%Y-%m-%d %H:%M:%S')
+            elif isinstance(value, date_type):
+                value = value.strftime('%Y-%m-%d 00:00:00')
+            translated[key] = value
+        return translated
+
+    def hash_bucket(self, column: str, buckets: int) -> str:
+        # Integer keys only; SQLite has no built-in hash function
+        return f"(ABS({column}) % {buckets})"
+
+    def rowid_bucket(self, buckets: int) -> str:
+        return f"(ROWID % {buckets})"
+
+
+BACKENDS: Dict[str, Type[DatabaseBackend]] = {
+    OracleBackend.name: OracleBackend,
+    SQLiteBackend.name: SQLiteBackend,
+}
+
+
+def get_backend(name: str) -> DatabaseBackend:
+    """
+    Get a backend instance by name.
+
+    Args:
+        name: Backend name ('oracle' or 'sqlite')
+
+    Returns:
+        DatabaseBackend instance
+
+    Raises:
+        ConfigurationError: If the backend is unknown or unavailable
+    """
+    backend_class = BACKENDS.get(name.lower())
+    if backend_class is None:
+        raise ConfigurationError(
+            f"Unknown database backend: {name} (available: {', '.join(BACKENDS)})"
+        )
+
+    backend = backend_class()
+    if not backend.is_available():
+        raise ConfigurationError(f"Database backend not available: {name}")
+    return backend
+
 
 class DatabaseManager:
     """Handles all database operations"""
@@ -23,12 +274,19 @@ class DatabaseManager:
         self.config = config
         self.connection = None
         self.cursor = None
-
-        self.host = config.get('DATABASE', 'host')
-        self.port = config.getint('DATABASE', 'port')
-        self.service = config.get('DATABASE', 'service_name')
-        self.user = config.get('DATABASE', 'user')
-        self.password = config.get('DATABASE', 'password')
+        self.backend = get_backend(config.get('DATABASE', 'motor', default='oracle'))
+        self.instrumentation = QueryInstrumentation(config)
+        self.throttle = DatabaseThrottle.shared(config)
+        self.statement_cache_size = config.getint(
+            'DATABASE', 'cache_sentencias', default=DEFAULT_STATEMENT_CACHE
+        )
+        self._statements: "OrderedDict[str, Tuple[Any, Optional[str]]]" = OrderedDict()
+        column = config.get('DEDUP', 'columna_modificacion', default='last_modified')
+        self._fingerprint_query = f"""
+            SELECT COUNT(*), MAX({column})
+            FROM reports
+            WHERE report_date = :check_date
+        """
 
     def connect(self) -> bool:
         """
@@ -41,18 +299,7 @@ class DatabaseManager:
             DatabaseError: If connection fails
         """
         try: 
-            dsn = oracledb.makedsn(
-                self.host,
-                self.port,
-                service_name=self.service
-            )
-
-            self.connection = oracledb.connect(
-                user=self.user,
-                password=self.password,
-                dsn=dsn
-            )
-
+            self.connection = self.backend.connect(self.config)
             self.cursor = self.connection.cursor()
 
             return True
@@ -61,8 +308,42 @@ class DatabaseManager:
             error_msg = f"Database connection failed: {e}"
             raise DatabaseError(error_msg)
 
+    def ensure_connected(self) -> bool:
+        """
+        Reconnect if the connection was never opened or has dropped.
+
+        Long-running processes call this before each job so a connection
+        closed by the server or a network blip is replaced transparently.
+
+        Returns:
+            bool: True once connected
+
+        Raises:
+            DatabaseError: If reconnection fails
+        """
+        if self.connection is not None:
+            ping = getattr(self.connection, 'ping', None)
+            if ping is None:
+                return True
+            try:
+                ping()
+                return True
+            except Exception:
+                try:
+                    self.disconnect()
+                except Exception:
+                    self.connection = None
+                    self.cursor = None
+                self._statements.clear()
+
+        return self.connect()
+
     def disconnect(self):
         """Close database connection safely"""
+        for cursor, _ in self._statements.values():
+            cursor.close()
+        self._statements.clear()
+
         if self.cursor:
             self.cursor.close()
             self.cursor = None
@@ -89,16 +370,198 @@ class DatabaseManager:
             raise DatabaseError("Not connected to database")
 
         try:
-            if params: 
-                self.cursor.execute(query, params)
-            else:
-                self.cursor.execute(query)
+            with self.throttle.slot(), self.instrumentation.measure(query, params) as stats:
+                params = self.backend.translate_params(params)
+                if params: 
+                    self.cursor.execute(self.backend.translate(query), params)
+                else:
+                    self.cursor.execute(self.backend.translate(query))
+                stats.executed()
+
+                rows = self.cursor.fetchall()
+                stats.fetched(rows, self._fetch_round_trips(len(rows)))
+                return rows
+
+        except self.backend.error_types as e:
+            raise DatabaseError(f"Query failed: {e}")
+
+    def _fetch_round_trips(self, rows: int) -> int:
+        """Round trips a fetchall() of `rows` rows takes at the cursor arraysize."""
+        arraysize = getattr(self.cursor, 'arraysize', None)
+        if not isinstance(arraysize, int) or arraysize < 1:
+            arraysize = DEFAULT_FETCH_SIZE
+        return rows // arraysize + 1
+
+    def _prepared(self, query: str) -> Tuple[Any, Optional[str]]:
+        """
+        Get the dedicated cursor of a statement, preparing it on first use.
+
+        Cursors are kept in LRU order up to the statement cache size, so
+        re-running a statement skips parsing entirely.
+        """
+        entry = self._statements.get(query)
+        if entry is not None:
+            self._statements.move_to_end(query)
+            return entry
+
+        cursor = self.connection.cursor()
+        entry = (cursor, self.backend.prepare(cursor, query))
+        self._statements[query] = entry
+
+        while len(self._statements) > max(self.statement_cache_size, 1):
+            _, (evicted, _) = self._statements.popitem(last=False)
+            evicted.close()
+
+        return entry
+
+    def execute_prepared(self, query: str, params: Optional[dict] = None) -> List[Tuple]:
+        """
+        Execute a repeated SELECT on its own prepared cursor.
+
+        Meant for short statements run many times with different binds
+        (availability checks, fingerprints); bind types are declared with
+        setinputsizes so every run shares one server-side cursor.
+
+        Args:
+            query: SQL query string
+            params: Dictionary of parameters for query
+
+        Returns:
+            List of tuples with query results
+
+        Raises:
+            DatabaseError: If query fails
+        """
+        if not self.connection:
+            raise DatabaseError("Not connected to database")
+
+        try:
+            with self.throttle.slot(), self.instrumentation.measure(query, params) as stats:
+                cursor, statement = self._prepared(query)
+                sizes = self.backend.input_sizes(params)
+                if sizes:
+                    cursor.setinputsizes(**sizes)
+                cursor.execute(statement, self.backend.translate_params(params) or {})
+                stats.executed()
 
-            return self.cursor.fetchall()
+                rows = cursor.fetchall()
+                stats.fetched(rows)
+                return rows
 
-        except oracledb.Error as e:
+        except self.backend.error_types as e:
             raise DatabaseError(f"Query failed: {e}")
 
+    def iter_query(
+        self,
+        query: str,
+        params: Optional[dict] = None,
+        batch_size: int = DEFAULT_FETCH_SIZE
+    ) -> Iterator[List[Tuple]]:
+        """
+        Execute SELECT query and stream results in batches.
+
+        Args:
+            query: SQL query string
+            params: Dictionary of parameters for query
+            batch_size: Rows per batch (and per fetch round trip)
+
+        Yields:
+            Lists of row tuples
+
+        Raises:
+            DatabaseError: If query fails
+        """
+        if not self.connection:
+            raise DatabaseError("Not connected to database")
+
+        try:
+            with self.throttle.slot() as lease, self.instrumentation.measure(query, params) as stats:
+                try:
+                    yield from self.backend.execute(self.cursor, query, params, batch_size, stats)
+                finally:
+                    lease.latency = stats.total_seconds
+
+        except self.backend.error_types as e:
+            raise DatabaseError(f"Query failed: {e}")
+
+    def iter_columnar(
+        self,
+        query: str,
+        params: Optional[dict] = None,
+        batch_size: int = DEFAULT_FETCH_SIZE
+    ) -> Iterator[ColumnBatch]:
+        """
+        Execute SELECT query and stream results as columnar batches.
+
+        Each fetched batch is transposed once into typed NumPy arrays with
+        NULL masks, so consumers can aggregate or write whole columns
+        without touching per-row tuples.
+
+        Args:
+            query: SQL query string
+            params: Dictionary of parameters for query
+            batch_size: Rows per batch (and per fetch round trip)
+
+        Yields:
+            ColumnBatch per fetched batch
+
+        Raises:
+            DatabaseError: If query fails
+        """
+        names = None
+        for rows in self.iter_query(query, params, batch_size):
+            if names is None:
+                names = self.get_column_names()
+            yield ColumnBatch.from_rows(rows, names)
+
+    def fetch_since(
+        self,
+        query: str,
+        params: Optional[dict],
+        watermark_column: str,
+        watermark: Optional[Any] = None
+    ) -> List[Tuple]:
+        """
+        Execute SELECT query returning only rows at or past a high-water mark.
+
+        Rows at the mark itself are fetched again, since a row committed or
+        updated later can carry the same timestamp; callers merge by key.
+
+        Args:
+            query: SQL query string
+            params: Dictionary of parameters for query
+            watermark_column: Timestamp or sequence column of the query
+            watermark: Last value already fetched (None fetches everything)
+
+        Returns:
+            List of tuples with new or changed rows, plus the rows at the mark
+
+        Raises:
+            DatabaseError: If query fails or column name is invalid
+        """
+        if watermark is None:
+            return self.execute_query(query, params)
+
+        if not watermark_column.replace('_', '').isalnum():
+            raise DatabaseError(f"Invalid watermark column: {watermark_column}")
+
+        incremental_query = f"SELECT * FROM ({query}) WHERE {watermark_column} >= :watermark"
+        bind = dict(params or {})
+        bind['watermark'] = watermark
+
+        return self.execute_query(incremental_query, bind)
+
+    def get_column_names(self) -> List[str]:
+        """
+        Get column names of the last executed query.
+
+        Returns:
+            List of column names (empty if no query was executed)
+        """
+        if not self.cursor or not self.cursor.description:
+            return []
+        return [column[0] for column in self.cursor.description]
+
     def check_data_exists(self, date: datetime) -> Tuple[bool, int]:
         """
         Check if data exists for given date.
@@ -109,20 +572,85 @@ class DatabaseManager:
         Returns: 
             Tuple of (exits: bool, count: int)
         """
-        query = """"
-            SELECT COUNT(*)
-            FROM transactions
-            WHERE TRUNC(transaction_date) = TRUNC(:check_date)
-        """
-
         try: 
-            self.cursor.execute(query, {'check_date': date})
-            count = self.cursor.fetchone()[0] 
+            rows = self.execute_prepared(CHECK_DATA_QUERY, {'check_date': date})
+            count = rows[0][0] 
             return(count > 0, count)
 
-        except oracledb.Error as e:
+        except DatabaseError as e:
+            raise DatabaseError(f"Error checking data: {e}")
+
+    def check_data_exists_many(self, dates: Iterable[datetime]) -> Dict[date_type, int]:
+        """
+        Count rows of several dates in one round trip.
+
+        A single grouped query over the covering range replaces one
+        check_data_exists call per date.
+
+        Args:
+            dates: Dates to check
+
+        Returns:
+            Dict mapping each requested date to its row count (0 if none)
+
+        Raises:
+            DatabaseError: If query fails
+        """
+        days = sorted({datetime(d.year, d.month, d.day) for d in dates})
+        if not days:
+            return {}
+
+        try:
+            rows = self.execute_prepared(
+                PROBE_DATES_QUERY,
+                {'start_date': days[0], 'end_date': days[-1] + timedelta(days=1)}
+            )
+        except DatabaseError as e:
             raise DatabaseError(f"Error checking data: {e}")
 
+        found = {}
+        for day, count in rows:
+            if isinstance(day, str):
+                day = datetime.strptime(day[:10], '%Y-%m-%d')
+            found[day.date() if isinstance(day, datetime) else day] = count
+
+        return {day.date(): found.get(day.date(), 0) for day in days}
+
+    def get_source_fingerprint(self, date: datetime) -> str:
+        """
+        Get a cheap fingerprint of the source rows for given date.
+
+        Combines row count and latest modification timestamp, so any
+        insert, delete or update of the day's rows changes the result.
+
+        Args:
+            date: Report date
+
+        Returns:
+            str: Hex fingerprint of the day's source data
+
+        Raises:
+            DatabaseError: If query fails
+        """
+        try:
+            rows = self.execute_prepared(self._fingerprint_query, {'check_date': date})
+            count, last_modified = rows[0]
+
+        except DatabaseError as e:
+            raise DatabaseError(f"Error computing fingerprint: {e}")
+
+        raw = f"{count}|{last_modified}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get_run_stats(self) -> RunStats:
+        """
+        Get aggregate statement measurements since this manager was created.
+
+        Returns:
+            RunStats: Execute/fetch time, rows, round trips and bytes
+        """
+        return self.instrumentation.summary()
+
     def __enter__(self):
         """Context manager entry - allows 'with DatabaseManager() as db:'"""
         self.connect()
@@ -130,4 +658,4 @@ class DatabaseManager:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit - ensures connection is closed"""
-        self.disconnect()
\ No newline at end of file
+        self.disconnect()
\ No newline at end of file
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Delivery ledger used to skip regeneration of unchanged reports."""
+
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass, asdict
+from typing import Optional, Iterable, Sequence, Any, Dict, List
+
+from .config import ConfigManager
+from .exceptions import PipelineError
+
+
+@dataclass
+class LedgerEntry:
+    """Last delivery recorded for a report date."""
+    source_fingerprint: str
+    content_hash: str
+    records: int
+    delivered_at: str
+    # None for entries written before channels and files were tracked
+    channels: Optional[List[str]] = None
+    files: Optional[List[str]] = None
+
+    def covers(self, channels: Iterable[str]) -> bool:
+        """Check whether every given channel was part of this delivery."""
+        return self.channels is None or set(channels) <= set(self.channels)
+
+    def files_exist(self, output_path: Path) -> bool:
+        """Check that every delivered file is still on disk."""
+        return all(Path(f).exists() for f in (self.files or [output_path]))
+
+
+class ContentHasher:
+    """Incremental hash of report rows, independent of file metadata."""
+
+    def __init__(self):
+        self._hash = hashlib.sha256()
+
+    def update(self, row: Sequence[Any]) -> None:
+        """Feed one row into the hash."""
+        self._hash.update(repr(tuple(row)).encode('utf-8'))
+        self._hash.update(b'\n')
+
+    def update_many(self, rows: Iterable[Sequence[Any]]) -> None:
+        """Feed several rows into the hash."""
+        for row in rows:
+            self.update(row)
+
+    def hexdigest(self) -> str:
+        """Return the hash of all rows fed so far."""
+        return self._hash.hexdigest()
+
+
+class DeliveryLedger:
+    """Persists source fingerprints and output hashes per report date."""
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize delivery ledger.
+
+        Args:
+            config: Configuration manager instance
+        """
+        self.config = config
+        self.enabled = config.getboolean('DEDUP', 'habilitado', default=False)
+        self.path = Path(config.get('DEDUP', 'archivo_estado', default='state/entregas.json'))
+        self._entries: Optional[Dict[str, dict]] = None
+
+    @staticmethod
+    def make_key(date: datetime, output_path: Path) -> str:
+        """Build the ledger key for a report date and output file."""
+        return f"{date.strftime('%Y-%m-%d')}|{Path(output_path).name}"
+
+    def _load(self) -> Dict[str, dict]:
+        """Load ledger file lazily."""
+        if self._entries is None:
+            if self.path.exists():
+                try:
+                    self._entries = json.loads(self.path.read_text(encoding='utf-8'))
+                except (OSError, ValueError) as e:
+                    raise PipelineError(f"Failed to read ledger {self.path}: {e}") from e
+            else:
+                self._entries = {}
+        return self._entries
+
+    def get(self, date: datetime, output_path: Path) -> Optional[LedgerEntry]:
+        """
+        Get last delivery for a report date.
+
+        Args:
+            date: Report date
+            output_path: Report output file
+
+        Returns:
+            LedgerEntry or None if never delivered
+        """
+        data = self._load().get(self.make_key(date, output_path))
+        return LedgerEntry(**data) if data else None
+
+    def record(
+        self,
+        date: datetime,
+        output_path: Path,
+        source_fingerprint: str,
+        content_hash: str,
+        records: int,
+        channels: Optional[Iterable[str]] = None,
+        files: Optional[Iterable[Path]] = None
+    ) -> LedgerEntry:
+        """
+        Record a delivery and persist the ledger.
+
+        Args:
+            date: Report date
+            output_path: Report output file
+            source_fingerprint: Fingerprint of source rows
+            content_hash: Hash of generated rows and output settings
+            records: Number of records delivered
+            channels: Channels the report went out on ('ftp', 'email')
+            files: Every file written for the report
+
+        Returns:
+            LedgerEntry: The stored entry
+
+        Raises:
+            PipelineError: If ledger cannot be written
+        """
+        entry = LedgerEntry(
+            source_fingerprint=source_fingerprint,
+            content_hash=content_hash,
+            records=records,
+            delivered_at=datetime.now().isoformat(timespec='seconds'),
+            channels=list(channels) if channels is not None else None,
+            files=[str(f) for f in files] if files is not None else None
+        )
+        entries = self._load()
+        entries[self.make_key(date, output_path)] = asdict(entry)
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            tmp_path.write_text(json.dumps(entries, indent=2, sort_keys=True), encoding='utf-8')
+            tmp_path.replace(self.path)
+        except OSError as e:
+            raise PipelineError(f"Failed to write ledger {self.path}: {e}") from e
+
+        return entry
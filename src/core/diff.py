@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Day-over-day differences between cached report snapshots."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Tuple, Iterator
+
+from .config import ConfigManager
+from .lazy import lazy_import
+from .exceptions import PipelineError
+
+pa = lazy_import('pyarrow')
+
+
+ADDED = 'nuevo'
+REMOVED = 'eliminado'
+CHANGED = 'modificado'
+CHANGE_HEADERS = ['CAMBIO', 'COLUMNAS_MODIFICADAS']
+# Report date column of the report query; differs on every carried-over row
+DATE_COLUMN = 'REPORT_DATE'
+
+
+@dataclass
+class DiffResult:
+    """Rows added, removed and changed since a previous report."""
+    previous_date: datetime
+    column_names: List[str]
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    rows: List[List[Any]] = field(default_factory=list)
+
+    @property
+    def headers(self) -> List[str]:
+        """Headers of the difference report."""
+        return CHANGE_HEADERS + list(self.column_names)
+
+
+def row_digest(values: Tuple) -> bytes:
+    """Short digest of a row's values."""
+    return hashlib.blake2b(repr(values).encode('utf-8'), digest_size=8).digest()
+
+
+class DiffStage:
+    """
+    Compares a day's snapshot with the previous cached one by key.
+
+    A hash join: the previous snapshot is streamed batch by batch into a
+    map of key to row digest, the current one is streamed against it,
+    and a last pass over the previous snapshot picks up removed rows and
+    the old values of changed ones. Memory holds keys and 8-byte digests,
+    plus the changed rows themselves, never either full table.
+    """
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize difference stage.
+
+        Args:
+            config: Configuration manager instance
+        """
+        self.config = config
+        self.enabled = config.getboolean('DIFERENCIAL', 'habilitado', default=False)
+        self.key_columns: List[str] = []
+        self.ignore_columns: List[str] = []
+        self.only_changes = False
+
+        if self.enabled:
+            self.key_columns = [
+                c.strip() for c in config.get('DIFERENCIAL', 'columna_clave', default='ID').split(',')
+                if c.strip()
+            ]
+            # adjunto: difference file next to the full report; solo: instead of it
+            self.only_changes = config.get('DIFERENCIAL', 'modo', default='adjunto') == 'solo'
+            # Per-run columns that would flag every carried-over row as changed
+            self.ignore_columns = [
+                c.strip() for c in config.get(
+                    'DIFERENCIAL', 'ignorar_columnas', default=DATE_COLUMN
+                ).split(',') if c.strip()
+            ]
+            if config.getboolean('INCREMENTAL', 'habilitado', default=False):
+                self.ignore_columns.append(
+                    config.get('INCREMENTAL', 'columna_marca', default='LAST_MODIFIED')
+                )
+
+    @staticmethod
+    def _columns(table: pa.Table, names: List[str]) -> List[Optional[str]]:
+        """Column of `table` for each name (case-insensitive), None if missing."""
+        lookup = {column.lower(): column for column in table.column_names}
+        return [lookup.get(name.lower()) for name in names]
+
+    @staticmethod
+    def _rows(table: pa.Table, columns: List[Optional[str]]) -> Iterator[Tuple]:
+        """Rows of a table batch by batch, laid out as `columns`."""
+        for batch in table.to_batches():
+            values = [
+                batch.column(name).to_pylist() if name else [None] * batch.num_rows
+                for name in columns
+            ]
+            yield from zip(*values)
+
+    def compare(
+        self,
+        previous: pa.Table,
+        current: pa.Table,
+        previous_date: datetime
+    ) -> DiffResult:
+        """
+        Find the rows added, removed and changed between two snapshots.
+
+        Columns are those of the current snapshot; previous rows are
+        matched to them by name. Ignored columns (report date, watermark)
+        are reported with current values but never make a row changed.
+
+        Args:
+            previous: Snapshot of the earlier report
+            current: Snapshot of this report
+            previous_date: Date of the earlier report
+
+        Returns:
+            DiffResult: Counts and difference rows (added and changed rows
+            with current values, removed rows with previous values)
+
+        Raises:
+            PipelineError: If a key column does not exist
+        """
+        names = list(current.column_names)
+        result = DiffResult(previous_date=previous_date, column_names=names)
+        key_positions = []
+        for key in self.key_columns:
+            matches = [i for i, name in enumerate(names) if name.lower() == key.lower()]
+            if not matches:
+                raise PipelineError(f"Difference key column not found: {key}")
+            key_positions.append(matches[0])
+
+        ignored = {name.lower() for name in self.ignore_columns}
+        compared = [i for i, name in enumerate(names) if name.lower() not in ignored]
+
+        def key_of(row: Tuple) -> Any:
+            return tuple(row[i] for i in key_positions)
+
+        def digest_of(row: Tuple) -> bytes:
+            return row_digest(tuple(row[i] for i in compared))
+
+        previous_columns = self._columns(previous, names)
+        index: Dict[Any, bytes] = {}
+        for row in self._rows(previous, previous_columns):
+            index[key_of(row)] = digest_of(row)
+
+        changed: Dict[Any, Tuple] = {}
+        for row in self._rows(current, names):
+            key = key_of(row)
+            digest = index.pop(key, None)
+            if digest is None:
+                result.added += 1
+                result.rows.append([ADDED, ''] + list(row))
+            elif digest != digest_of(row):
+                changed[key] = row
+            else:
+                result.unchanged += 1
+
+        # What is left in the index was removed; changed rows need their old values
+        if index or changed:
+            for row in self._rows(previous, previous_columns):
+                key = key_of(row)
+                if key in index:
+                    result.removed += 1
+                    result.rows.append([REMOVED, ''] + list(row))
+                    del index[key]
+                elif key in changed:
+                    new = changed.pop(key)
+                    columns = [names[i] for i in compared if row[i] != new[i]]
+                    result.changed += 1
+                    result.rows.append([CHANGED, ', '.join(columns)] + list(new))
+
+        return result
@@ -2,15 +2,17 @@
 # -*- coding: utf-8 -*-
 """Email notification management."""
 
-import smtplib
 from pathlib import Path
-from email.message import EmailMessage
 from typing import List, Optional
 from datetime import datetime
 
 from .config import ConfigManager
+from .lazy import lazy_import
 from .exceptions import PipelineError
 
+smtplib = lazy_import('smtplib')
+email_message = lazy_import('email.message')
+
 
 class EmailManager:
     """Handles email notifications for reports."""
@@ -24,6 +26,8 @@ class EmailManager:
         """
         self.config = config
         self.enabled = config.getboolean('EMAIL', 'habilitado', default=False)
+        self.keep_alive = False
+        self._smtp = None
         
         if self.enabled:
             self.server = config.get('EMAIL', 'servidor_smtp')
@@ -32,6 +36,7 @@ class EmailManager:
             self.password = config.get('EMAIL', 'remitente_password', default='')
             self.use_ssl = config.getboolean('EMAIL', 'usar_ssl', default=False)
             self.max_attachment_mb = config.getint('EMAIL', 'max_tamano_adjunto_mb', default=10)
+            self.keep_alive = config.getboolean('EMAIL', 'mantener_conexion', default=False)
             
             recipients_str = config.get('EMAIL', 'destinatarios_principales')
             self.recipients_success = [r.strip() for r in recipients_str.split(',')]
@@ -96,7 +101,7 @@ class EmailManager:
             self.validate_attachment_size(attachment_path)
         
         try:
-            msg = EmailMessage()
+            msg = email_message.EmailMessage()
             msg['From'] = self.sender
             msg['To'] = ", ".join(recipients)
             msg['Subject'] = subject
@@ -113,7 +118,9 @@ class EmailManager:
                         filename=attachment_path.name
                     )
             
-            if self.use_ssl:
+            if self.keep_alive:
+                self._smtp_session().send_message(msg)
+            elif self.use_ssl:
                 with smtplib.SMTP_SSL(self.server, self.port) as server:
                     if self.password:
                         server.login(self.sender, self.password)
@@ -129,6 +136,32 @@ class EmailManager:
         except Exception as e:
             raise PipelineError(f"Failed to send email: {e}") from e
 
+    def _smtp_session(self):
+        """Get the kept-alive SMTP session, reopening it if it dropped."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        server = smtp_class(self.server, self.port)
+        if self.password:
+            server.login(self.sender, self.password)
+        self._smtp = server
+        return server
+
+    def close(self) -> None:
+        """Close the kept-alive SMTP session, if any."""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self._smtp.close()
+            self._smtp = None
+
     def notify_success(
         self,
         date: datetime,
@@ -239,4 +272,4 @@ class EmailManager:
             traceback=error_details
         )
         
-        return self._send_email(subject, body, self.recipients_error)
\ No newline at end of file
+        return self._send_email(subject, body, self.recipients_error)
\ No newline at end of file
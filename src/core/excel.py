@@ -2,15 +2,172 @@
 # -*- coding: utf-8 -*-
 """Excel file generation utilities."""
 
-from pathlib import Path
-from typing import List, Any, Optional
-from datetime import datetime
+from __future__ import annotations
 
-from openpyxl import Workbook
-from openpyxl.styles import Font
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Any, Optional, Tuple, Iterable, Dict, Set
+from datetime import datetime, date
+from dataclasses import dataclass
 
+from . import xlsx
 from .config import ConfigManager
-from .exceptions import PipelineError
+from .lazy import lazy_import
+from .instrumentation import estimate_row_bytes
+from .exceptions import PipelineError, ConfigurationError
+
+openpyxl = lazy_import('openpyxl')
+
+
+EXCEL_MAX_ROWS = 1048576
+SHEET_TITLE_MAX = 31
+INVALID_TITLE_CHARS = '[]:*?/\\'
+DATETIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+RENDER_BLOCK_ROWS = 20000
+MIN_COLUMN_WIDTH = 8
+DATETIME_WIDTH = 19
+
+
+def sheet_title(text: str, taken: Set[str]) -> str:
+    """
+    Make a valid worksheet title not yet in `taken` and reserve it.
+
+    Args:
+        text: Desired title
+        taken: Lower-cased titles already used in the workbook
+
+    Returns:
+        str: Title of at most 31 characters without []:*?/\\
+    """
+    base = ''.join('_' if c in INVALID_TITLE_CHARS else c for c in text).strip("'") or 'Hoja'
+    title = base[:SHEET_TITLE_MAX]
+    number = 1
+    while title.lower() in taken:
+        number += 1
+        suffix = f"~{number}"
+        title = base[:SHEET_TITLE_MAX - len(suffix)] + suffix
+    taken.add(title.lower())
+    return title
+
+
+def part_path(file_path: Path, index: int) -> Path:
+    """Path of the index-th (1-based) file of a split report."""
+    file_path = Path(file_path)
+    return file_path.with_name(f"{file_path.stem}_parte{index}{file_path.suffix}")
+
+
+@dataclass
+class SplitPolicy:
+    """
+    When a streamed report continues on a new sheet or a new file.
+
+    A sheet holds at most ``max_sheet_rows`` rows including the header
+    (never more than Excel's 1,048,576). Files are split after
+    ``max_file_rows`` rows or about ``max_file_bytes`` bytes of cell
+    content (0 disables either). With ``key_column`` every distinct value
+    of that column gets its own sheet.
+    """
+    max_sheet_rows: int = EXCEL_MAX_ROWS
+    max_file_rows: int = 0
+    max_file_bytes: int = 0
+    key_column: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> 'SplitPolicy':
+        """
+        Read the policy from [DIVISION].
+
+        Keys: ``filas_por_hoja``, ``filas_por_archivo``,
+        ``megabytes_por_archivo`` and ``columna``.
+
+        Raises:
+            ConfigurationError: If a limit is out of range
+        """
+        max_sheet_rows = config.getint('DIVISION', 'filas_por_hoja', default=EXCEL_MAX_ROWS)
+        max_file_rows = config.getint('DIVISION', 'filas_por_archivo', default=0)
+        megabytes = float(config.get('DIVISION', 'megabytes_por_archivo', default='0'))
+
+        if not 2 <= max_sheet_rows <= EXCEL_MAX_ROWS:
+            raise ConfigurationError(
+                f"DIVISION filas_por_hoja must be between 2 and {EXCEL_MAX_ROWS}"
+            )
+        if max_file_rows < 0 or megabytes < 0:
+            raise ConfigurationError("DIVISION file limits must be >= 0")
+
+        return cls(
+            max_sheet_rows=max_sheet_rows,
+            max_file_rows=max_file_rows,
+            max_file_bytes=int(megabytes * 1024 * 1024),
+            key_column=config.get('DIVISION', 'columna', default='') or None
+        )
+
+
+@dataclass
+class LayoutOptions:
+    """
+    Sheet layout applied while writing.
+
+    Column widths come from the longest value seen in each column: a
+    running maximum when the whole sheet passes through openpyxl's object
+    model, otherwise the first ``sample_rows`` rows, because widths and
+    frozen panes precede the rows in the sheet XML. The autofilter covers
+    the header row and every data row.
+    """
+    auto_width: bool = False
+    sample_rows: int = 1000
+    max_width: int = 60
+    freeze_header: bool = False
+    autofilter: bool = False
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> 'LayoutOptions':
+        """
+        Read the options from [DISENO].
+
+        Keys: ``ancho_automatico``, ``filas_muestra``, ``ancho_maximo``,
+        ``fijar_encabezado`` and ``autofiltro``. The sample and width are
+        at least 1.
+        """
+        return cls(
+            auto_width=config.getboolean('DISENO', 'ancho_automatico', default=False),
+            sample_rows=max(1, config.getint('DISENO', 'filas_muestra', default=1000)),
+            max_width=max(1, config.getint('DISENO', 'ancho_maximo', default=60)),
+            freeze_header=config.getboolean('DISENO', 'fijar_encabezado', default=False),
+            autofilter=config.getboolean('DISENO', 'autofiltro', default=False)
+        )
+
+
+class ColumnWidths:
+    """Running maximum display width of each column."""
+
+    def __init__(self, max_width: int = 60, decimals: int = 2):
+        self.max_width = max_width
+        self.decimals = decimals
+        self.lengths: List[int] = []
+
+    def update(self, row: Iterable[Any]) -> None:
+        """Account for one row of values."""
+        lengths = self.lengths
+        for i, value in enumerate(row):
+            if value is None:
+                continue
+            if isinstance(value, float):
+                length = len(f"{value:,.{self.decimals}f}")
+            elif isinstance(value, int):
+                length = len(f"{value:,}")
+            elif isinstance(value, datetime):
+                length = DATETIME_WIDTH
+            else:
+                length = len(str(value))
+            if i >= len(lengths):
+                lengths.extend([0] * (i + 1 - len(lengths)))
+            if length > lengths[i]:
+                lengths[i] = length
+
+    def widths(self) -> List[int]:
+        """Column widths in characters, padded and capped."""
+        return [min(max(length + 2, MIN_COLUMN_WIDTH), self.max_width) for length in self.lengths]
 
 
 class ExcelGenerator:
@@ -28,9 +185,16 @@ class ExcelGenerator:
         if config:
             self.number_format = config.get('ARCHIVOS', 'formato_numero', default='europeo')
             self.decimals = config.getint('ARCHIVOS', 'decimales', default=2)
+            self.processes = config.getint('ARCHIVOS', 'procesos', default=1)
+            self.engine = config.get('ARCHIVOS', 'motor_excel', default='openpyxl')
         else:
             self.number_format = 'europeo'
             self.decimals = 2
+            self.processes = 1
+            self.engine = 'openpyxl'
+        self.layout = LayoutOptions.from_config(config) if config else LayoutOptions()
+        self.max_sheet_rows = EXCEL_MAX_ROWS
+        self.block_rows = RENDER_BLOCK_ROWS
     
     def get_number_format_string(self) -> str:
         """
@@ -63,7 +227,7 @@ class ExcelGenerator:
         data: List[List[Any]],
         headers: Optional[List[str]] = None,
         sheet_name: str = "Reporte"
-    ) -> Workbook:
+    ) -> openpyxl.Workbook:
         """
         Create Excel workbook from data.
         
@@ -75,18 +239,41 @@ class ExcelGenerator:
         Returns:
             Workbook: openpyxl Workbook object
         """
-        wb = Workbook()
-        ws = wb.active
-        ws.title = sheet_name
-        
+        return self.create_workbook_sheets([(sheet_name, data, headers)])
+
+    def _layout(
+        self,
+        sheets: List[Tuple[str, List[List[Any]], Optional[List[str]]]]
+    ) -> List[Tuple[str, List[List[Any]], Optional[List[str]]]]:
+        """Continue sheets past the row limit on extra sheets and make titles valid."""
+        taken: Set[str] = set()
+        layout = []
+
+        for sheet_name, data, headers in sheets:
+            per_sheet = self.max_sheet_rows - (1 if headers else 0)
+            chunks = [data[start:start + per_sheet] for start in range(0, len(data), per_sheet)]
+            for number, chunk in enumerate(chunks or [data], start=1):
+                title = sheet_name if number == 1 else f"{sheet_name} ({number})"
+                layout.append((sheet_title(title, taken), chunk, headers))
+
+        return layout
+
+    def _write_sheet(
+        self,
+        ws,
+        data: List[List[Any]],
+        headers: Optional[List[str]] = None
+    ) -> None:
+        """Write headers and formatted rows into a worksheet."""
         current_row = 1
         num_format = self.get_number_format_string()
+        tracker = ColumnWidths(self.layout.max_width, self.decimals) if self.layout.auto_width else None
         
         if headers:
             for col_idx, header in enumerate(headers, start=1):
                 cell = ws.cell(row=current_row, column=col_idx)
                 cell.value = header
-                cell.font = Font(bold=True)
+                cell.font = openpyxl.styles.Font(bold=True)
             current_row += 1
         
         for row_data in data:
@@ -98,15 +285,126 @@ class ExcelGenerator:
                     cell.number_format = num_format
                 elif isinstance(value, datetime):
                     cell.value = value
-                    cell.number_format = 'YYYY-MM-DD HH:MM:SS'
+                    cell.number_format = DATETIME_FORMAT
                 else:
                     cell.value = str(value) if value is not None else ''
             
+            if tracker:
+                tracker.update(row_data)
             current_row += 1
+
+        if tracker and headers:
+            tracker.update(headers)
+        self.prepare_sheet(ws, tracker.widths() if tracker else None, bool(headers))
+        self.finish_sheet(ws, headers, len(data))
+
+    def column_widths(
+        self,
+        sample: Iterable[Iterable[Any]],
+        headers: Optional[List[str]] = None
+    ) -> Optional[List[int]]:
+        """Column widths from headers and a sample of rows, if auto width is on."""
+        if not self.layout.auto_width:
+            return None
+        tracker = ColumnWidths(self.layout.max_width, self.decimals)
+        if headers:
+            tracker.update(headers)
+        for row in sample:
+            tracker.update(row)
+        return tracker.widths()
+
+    def prepare_sheet(self, ws, widths: Optional[List[int]], has_headers: bool) -> None:
+        """
+        Set column widths and the frozen header row.
+
+        Write-only worksheets take these only before the first row.
+        """
+        for i, width in enumerate(widths or []):
+            ws.column_dimensions[xlsx.column_letter(i)].width = width
+        if self.layout.freeze_header and has_headers:
+            ws.freeze_panes = 'A2'
+
+    def autofilter_ref(self, headers: Optional[List[str]], rows: int) -> Optional[str]:
+        """Autofilter range over the header and `rows` data rows, if enabled."""
+        if self.layout.autofilter and headers:
+            return f"A1:{xlsx.column_letter(len(headers) - 1)}{rows + 1}"
+        return None
+
+    def finish_sheet(self, ws, headers: Optional[List[str]], rows: int) -> None:
+        """Set the autofilter over the header and `rows` data rows."""
+        ref = self.autofilter_ref(headers, rows)
+        if ref:
+            ws.auto_filter.ref = ref
+
+    def sheet_layout(
+        self,
+        data: List[List[Any]],
+        headers: Optional[List[str]] = None
+    ) -> xlsx.SheetLayout:
+        """Layout of a natively rendered sheet, sizing columns on the first rows."""
+        return xlsx.SheetLayout(
+            widths=self.column_widths(data[:self.layout.sample_rows], headers) or [],
+            freeze_header=self.layout.freeze_header and bool(headers),
+            autofilter=self.autofilter_ref(headers, len(data))
+        )
+
+    def create_workbook_sheets(
+        self,
+        sheets: List[Tuple[str, List[List[Any]], Optional[List[str]]]]
+    ) -> openpyxl.Workbook:
+        """
+        Create Excel workbook with several worksheets.
+        
+        Args:
+            sheets: List of (sheet_name, data, headers) tuples
+            
+        Returns:
+            Workbook: openpyxl Workbook object
+        """
+        wb = openpyxl.Workbook()
+        wb.remove(wb.active)
+        
+        for title, data, headers in self._layout(sheets):
+            ws = wb.create_sheet(title=title)
+            self._write_sheet(ws, data, headers)
         
         return wb
+
+    def stream_cells(self, ws, row: Iterable[Any], num_format: str) -> List[Any]:
+        """
+        Convert a row for a write-only worksheet, formatted like _write_sheet.
+
+        Args:
+            ws: Write-only worksheet
+            row: Row values
+            num_format: Number format string
+
+        Returns:
+            List of cells and plain values for ws.append()
+        """
+        cells = []
+        for value in row:
+            if isinstance(value, (int, float)):
+                cell = openpyxl.cell.WriteOnlyCell(ws, value)
+                cell.number_format = num_format
+            elif isinstance(value, datetime):
+                cell = openpyxl.cell.WriteOnlyCell(ws, value)
+                cell.number_format = DATETIME_FORMAT
+            else:
+                cell = str(value) if value is not None else ''
+            cells.append(cell)
+        return cells
+
+    def header_cells(self, ws, headers: List[str]) -> List[Any]:
+        """Bold header cells for a write-only worksheet."""
+        cells = []
+        for header in headers:
+            cell = openpyxl.cell.WriteOnlyCell(ws, header)
+            cell.font = openpyxl.styles.Font(bold=True)
+            cells.append(cell)
+        return cells
     
-    def save_workbook(self, workbook: Workbook, file_path: Path) -> None:
+    def save_workbook(self, workbook: openpyxl.Workbook, file_path: Path) -> None:
         """
         Save workbook to file.
         
@@ -143,6 +441,417 @@ class ExcelGenerator:
         Returns:
             Path: Path to generated file
         """
+        if self.processes > 1:
+            return self.generate_excel_parallel([(sheet_name, data, headers)], file_path)
+        if self.engine == 'nativo':
+            return self.generate_excel_native([(sheet_name, data, headers)], file_path)
         wb = self.create_workbook(data, headers, sheet_name)
         self.save_workbook(wb, file_path)
-        return Path(file_path)
\ No newline at end of file
+        return Path(file_path)
+
+    def generate_excel_sheets(
+        self,
+        sheets: List[Tuple[str, List[List[Any]], Optional[List[str]]]],
+        file_path: Path
+    ) -> Path:
+        """
+        Generate multi-sheet Excel file in one step.
+        
+        Args:
+            sheets: List of (sheet_name, data, headers) tuples
+            file_path: Output file path
+            
+        Returns:
+            Path: Path to generated file
+        """
+        if self.processes > 1:
+            return self.generate_excel_parallel(sheets, file_path)
+        if self.engine == 'nativo':
+            return self.generate_excel_native(sheets, file_path)
+        wb = self.create_workbook_sheets(sheets)
+        self.save_workbook(wb, file_path)
+        return Path(file_path)
+
+    def generate_excel_native(
+        self,
+        sheets: List[Tuple[str, List[List[Any]], Optional[List[str]]]],
+        file_path: Path
+    ) -> Path:
+        """
+        Write the workbook with the native SpreadsheetML writer.
+
+        Selected with [ARCHIVOS] motor_excel = nativo. Rows are rendered
+        block by block straight into the zip, with text in a shared
+        strings table, skipping openpyxl's per-cell objects. Cells are
+        formatted as in _write_sheet.
+
+        Args:
+            sheets: List of (sheet_name, data, headers) tuples
+            file_path: Output file path
+
+        Returns:
+            Path: Path to generated file
+
+        Raises:
+            PipelineError: If writing fails
+        """
+        strings = xlsx.SharedStrings()
+        return xlsx.write_package(
+            file_path,
+            ((title, self._native_rows(data, headers, strings), self.sheet_layout(data, headers))
+             for title, data, headers in self._layout(sheets)),
+            self.get_number_format_string(),
+            strings.strings
+        )
+
+    def _native_rows(
+        self,
+        data: List[List[Any]],
+        headers: Optional[List[str]],
+        strings: xlsx.SharedStrings
+    ) -> Iterable[bytes]:
+        """Header and data rows of a sheet, rendered in blocks."""
+        first_row = 1
+        if headers:
+            yield xlsx.render_rows([headers], 1, xlsx.STYLE_HEADER, strings)
+            first_row = 2
+        for start in range(0, len(data), self.block_rows):
+            yield xlsx.render_rows(data[start:start + self.block_rows], first_row + start,
+                                   strings=strings)
+
+    def generate_excel_parallel(
+        self,
+        sheets: List[Tuple[str, List[List[Any]], Optional[List[str]]]],
+        file_path: Path,
+        processes: Optional[int] = None
+    ) -> Path:
+        """
+        Render worksheet XML in a process pool and assemble the xlsx.
+
+        Every sheet is cut into blocks of rows rendered independently by
+        xlsx.render_rows, so both multi-sheet workbooks and single large
+        sheets spread over the pool. Blocks are written into the zip in
+        order as they complete. Cells are formatted as in _write_sheet.
+
+        Args:
+            sheets: List of (sheet_name, data, headers) tuples
+            file_path: Output file path
+            processes: Pool size (defaults to [ARCHIVOS] procesos)
+
+        Returns:
+            Path: Path to generated file
+
+        Raises:
+            PipelineError: If rendering or writing fails
+        """
+        layout = self._layout(sheets)
+        context = multiprocessing.get_context('spawn')
+
+        try:
+            with ProcessPoolExecutor(max_workers=processes or self.processes,
+                                     mp_context=context) as pool:
+                parts = []
+                for title, data, headers in layout:
+                    first_row = 2 if headers else 1
+                    futures = [
+                        pool.submit(xlsx.render_rows, data[start:start + self.block_rows],
+                                    first_row + start)
+                        for start in range(0, len(data), self.block_rows)
+                    ]
+                    header = xlsx.render_rows([headers], 1, xlsx.STYLE_HEADER) if headers else b''
+                    parts.append((title, header, futures, self.sheet_layout(data, headers)))
+
+                return xlsx.write_package(
+                    file_path,
+                    ((title, self._chunks(header, futures), layout)
+                     for title, header, futures, layout in parts),
+                    self.get_number_format_string()
+                )
+        except PipelineError:
+            raise
+        except Exception as e:
+            raise PipelineError(f"Parallel Excel rendering failed: {e}") from e
+
+    @staticmethod
+    def _chunks(header: bytes, futures) -> Iterable[bytes]:
+        """Header XML followed by rendered blocks in row order."""
+        if header:
+            yield header
+        for future in futures:
+            yield future.result()
+
+    def generate_excel_stream(
+        self,
+        rows: Iterable[Iterable[Any]],
+        file_path: Path,
+        headers: Optional[List[str]] = None,
+        sheet_name: str = "Reporte",
+        policy: Optional[SplitPolicy] = None,
+        column_names: Optional[List[str]] = None,
+        extra_sheets: Optional[List[Tuple[str, List[List[Any]], Optional[List[str]]]]] = None
+    ) -> List[Path]:
+        """
+        Stream rows into one or more workbooks in a single pass.
+
+        The configured engine is honored: openpyxl write-only sheets by
+        default, the native writer with motor_excel = nativo, and native
+        blocks rendered in a process pool with procesos > 1.
+
+        Args:
+            rows: Rows (any iterable, consumed once)
+            file_path: Output file path; split files are named ``_parteN``
+            headers: Optional column headers, repeated on every sheet
+            sheet_name: Worksheet name (unless splitting by key column)
+            policy: Split policy (sheets only past Excel's row limit by default)
+            column_names: Column names to find the key column when
+                headers are not given
+            extra_sheets: (sheet_name, data, headers) tuples added after
+                the streamed rows to the last file, e.g. a summary
+
+        Returns:
+            List of generated file paths
+
+        Raises:
+            PipelineError: If writing fails or the key column is unknown
+        """
+        writer = SplitExcelWriter(self, file_path, headers, policy, sheet_name, column_names,
+                                  extra_sheets)
+        try:
+            for row in rows:
+                writer.write(row)
+            return writer.close()
+        finally:
+            writer.release()
+
+
+class SplitExcelWriter:
+    """
+    Writes rows into write-only workbooks, opening new sheets and files
+    as a SplitPolicy requires.
+
+    Rows are never held in memory: each goes straight into the current
+    sheet of its key. The first file is written to ``file_path`` unless a
+    second one is needed, in which case files are ``<stem>_parte1``,
+    ``<stem>_parte2``, ...
+
+    Sheets are openpyxl write-only worksheets, or xlsx.SheetWriter
+    sheets when the generator uses the native engine or several
+    processes.
+    """
+
+    def __init__(
+        self,
+        generator: ExcelGenerator,
+        file_path: Path,
+        headers: Optional[List[str]] = None,
+        policy: Optional[SplitPolicy] = None,
+        sheet_name: str = "Reporte",
+        column_names: Optional[List[str]] = None,
+        extra_sheets: Optional[List[Tuple[str, List[List[Any]], Optional[List[str]]]]] = None
+    ):
+        """
+        Initialize writer.
+
+        Args:
+            generator: Excel generator providing formats and limits
+            file_path: Output file path
+            headers: Optional column headers
+            policy: Split policy
+            sheet_name: Worksheet name (unless splitting by key column)
+            column_names: Column names to find the key column
+            extra_sheets: (sheet_name, data, headers) tuples written to
+                the last file after the streamed rows
+
+        Raises:
+            PipelineError: If the key column is unknown
+        """
+        self.generator = generator
+        self.file_path = Path(file_path)
+        self.headers = headers
+        self.policy = policy or SplitPolicy()
+        self.sheet_name = sheet_name
+        self.extra_sheets = extra_sheets or []
+        self.num_format = generator.get_number_format_string()
+        self.files: List[Path] = []
+        self.rows = 0
+        self.native = generator.engine == 'nativo' or generator.processes > 1
+        self._pool = None
+        if generator.processes > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=generator.processes,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+
+        max_sheet_rows = min(self.policy.max_sheet_rows, generator.max_sheet_rows)
+        self.sheet_rows = max_sheet_rows - (1 if headers else 0)
+
+        self.key_index: Optional[int] = None
+        if self.policy.key_column:
+            names = [str(n).lower() for n in (headers or column_names or [])]
+            try:
+                self.key_index = names.index(self.policy.key_column.lower())
+            except ValueError:
+                raise PipelineError(f"Split column not found: {self.policy.key_column}")
+
+        self._workbook = None
+        self._sheets: Dict[Any, list] = {}
+        self._file_sheets: List[list] = []
+        self._titles: Set[str] = set()
+        self._sample: Optional[List[List[Any]]] = [] if generator.layout.auto_width else None
+        self._widths: Optional[List[int]] = None
+        self._file_index = 0
+        self._file_rows = 0
+        self._file_bytes = 0
+
+    def _key_title(self, key: Any) -> str:
+        if self.key_index is None:
+            return self.sheet_name
+        if key is None or key == '':
+            return '(vacio)'
+        if isinstance(key, (datetime, date)):
+            return key.strftime('%Y-%m-%d')
+        return str(key)
+
+    def _save(self, last: bool) -> None:
+        """Write the current workbook to its file."""
+        if last and self._file_index == 1:
+            path = self.file_path
+        else:
+            path = part_path(self.file_path, self._file_index)
+        for ws, rows, _ in self._file_sheets:
+            self._finish(ws, self.headers, rows)
+        if self.native:
+            self._workbook.save(path)
+        else:
+            self.generator.save_workbook(self._workbook, path)
+        self.files.append(path)
+        self._workbook = None
+
+    def _open_file(self) -> None:
+        """Finish the current file, if any, and start the next one."""
+        if self._workbook is not None:
+            self._save(last=False)
+        if self.native:
+            self._workbook = xlsx.WorkbookWriter(self.num_format, self._pool)
+        else:
+            self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheets = {}
+        self._file_sheets = []
+        self._titles = set()
+        self._file_index += 1
+        self._file_rows = 0
+        self._file_bytes = 0
+
+    def _new_sheet(self, key: Any, number: int):
+        base = self._key_title(key)
+        title = base if number == 1 else f"{base} ({number})"
+        return self._add_sheet(title, self.headers, self._widths)
+
+    def _add_sheet(self, title: str, headers: Optional[List[str]], widths: Optional[List[int]]):
+        """Create a sheet in the current workbook and write its header."""
+        title = sheet_title(title, self._titles)
+        if self.native:
+            ws = self._workbook.add_sheet(title, xlsx.SheetLayout(
+                widths=widths or [],
+                freeze_header=self.generator.layout.freeze_header and bool(headers)
+            ))
+            if headers:
+                ws.header(headers)
+            return ws
+
+        ws = self._workbook.create_sheet(title)
+        self.generator.prepare_sheet(ws, widths, bool(headers))
+        if headers:
+            ws.append(self.generator.header_cells(ws, headers))
+        return ws
+
+    def _append(self, ws, row: List[Any]) -> None:
+        if self.native:
+            ws.append(row)
+        else:
+            ws.append(self.generator.stream_cells(ws, row, self.num_format))
+
+    def _finish(self, ws, headers: Optional[List[str]], rows: int) -> None:
+        if self.native:
+            ws.layout.autofilter = self.generator.autofilter_ref(headers, rows)
+        else:
+            self.generator.finish_sheet(ws, headers, rows)
+
+    def _flush_sample(self) -> None:
+        """Size the columns on the buffered rows, then write them."""
+        sample, self._sample = self._sample, None
+        self._widths = self.generator.column_widths(sample, self.headers)
+        for row in sample:
+            self._write(row)
+
+    def write(self, row: Iterable[Any]) -> None:
+        """
+        Append one row.
+
+        With auto width the first rows are buffered until the column
+        widths are known, since sheets need them before their first row.
+
+        Args:
+            row: Row values
+        """
+        if self._sample is None:
+            self._write(list(row))
+            return
+        self._sample.append(list(row))
+        if len(self._sample) >= self.generator.layout.sample_rows:
+            self._flush_sample()
+
+    def _write(self, row: List[Any]) -> None:
+        policy = self.policy
+        if (self._workbook is None
+                or (policy.max_file_rows and self._file_rows >= policy.max_file_rows)
+                or (policy.max_file_bytes and self._file_bytes >= policy.max_file_bytes)):
+            self._open_file()
+
+        key = row[self.key_index] if self.key_index is not None else None
+        state = self._sheets.get(key)
+        if state is None or state[1] >= self.sheet_rows:
+            number = state[2] + 1 if state else 1
+            state = [self._new_sheet(key, number), 0, number]
+            self._sheets[key] = state
+            self._file_sheets.append(state)
+
+        self._append(state[0], row)
+        state[1] += 1
+        self._file_rows += 1
+        self.rows += 1
+        if policy.max_file_bytes:
+            self._file_bytes += estimate_row_bytes(row)
+
+    def close(self) -> List[Path]:
+        """
+        Save the last file.
+
+        Returns:
+            List of generated file paths (one file with headers when no
+            rows were written)
+        """
+        if self._sample is not None:
+            self._flush_sample()
+        if self._workbook is None:
+            self._open_file()
+        if not self._sheets:
+            self._sheets[None] = [self._new_sheet(None, 1), 0, 1]
+            self._file_sheets.append(self._sheets[None])
+        for title, data, headers in self.extra_sheets:
+            sample = data[:self.generator.layout.sample_rows]
+            ws = self._add_sheet(title, headers, self.generator.column_widths(sample, headers))
+            for row in data:
+                self._append(ws, list(row))
+            self._finish(ws, headers, len(data))
+        self._save(last=True)
+        return self.files
+
+    def release(self) -> None:
+        """Stop the render pool and drop an unsaved workbook."""
+        if self.native and self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -2,13 +2,15 @@
 # -*- coding: utf-8 -*-
 """FTP/SFTP file transfer management."""
 
-import ftplib
 from pathlib import Path
 from typing import Optional
 
 from .config import ConfigManager
+from .lazy import lazy_import
 from .exceptions import PipelineError
 
+ftplib = lazy_import('ftplib')
+
 
 class FTPManager:
     """Handles FTP file transfers."""
@@ -22,6 +24,7 @@ class FTPManager:
         """
         self.config = config
         self.enabled = config.getboolean('FTP', 'habilitado', default=False)
+        self.keep_alive = False
         
         if self.enabled:
             self.host = config.get('FTP', 'servidor')
@@ -30,6 +33,7 @@ class FTPManager:
             self.password = config.get('FTP', 'password', default='')
             self.remote_dir = config.get('FTP', 'directorio_remoto', default='/')
             self.use_passive = config.getboolean('FTP', 'modo_pasivo', default=True)
+            self.keep_alive = config.getboolean('FTP', 'mantener_conexion', default=False)
             
         self.connection = None
     
@@ -71,14 +75,27 @@ class FTPManager:
                 self.connection.close()
             self.connection = None
     
+    def is_alive(self) -> bool:
+        """Check whether the open connection still answers."""
+        if not self.connection:
+            return False
+        try:
+            self.connection.voidcmd('NOOP')
+            return True
+        except ftplib.all_errors:
+            return False
+
     def __enter__(self):
-        """Context manager entry."""
-        self.connect()
+        """Context manager entry (reuses a live kept-alive connection)."""
+        if not (self.keep_alive and self.is_alive()):
+            self.disconnect()
+            self.connect()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
-        self.disconnect()
+        """Context manager exit (keeps the connection open if keep_alive)."""
+        if not self.keep_alive:
+            self.disconnect()
 
     def upload_file(self, local_path: Path, remote_filename: Optional[str] = None) -> bool:
         """
@@ -139,4 +156,4 @@ class FTPManager:
                     f"File size ({size_mb:.2f}MB) exceeds limit ({max_size_mb}MB)"
                 )
         
-        return True
\ No newline at end of file
+        return True
\ No newline at end of file
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Per-statement timing, round-trip counters and slow-query log."""
+
+import json
+import time
+import threading
+from pathlib import Path
+from datetime import datetime, date
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Optional, List, Dict, Any, Callable, Sequence, Iterator
+
+from loguru import logger
+
+from .config import ConfigManager
+
+
+DEFAULT_SLOW_QUERY_MS = 1000
+
+
+def estimate_row_bytes(row: Sequence[Any]) -> int:
+    """Approximate wire size of a row: text/binary length, 8 bytes otherwise."""
+    size = 0
+    for value in row:
+        if value is None:
+            continue
+        if isinstance(value, (str, bytes, bytearray)):
+            size += len(value)
+        else:
+            size += 8
+    return size
+
+
+@dataclass
+class StatementStats:
+    """Measurements of one executed statement."""
+    statement: str
+    params: Optional[Dict[str, Any]] = None
+    execute_seconds: float = 0.0
+    fetch_seconds: float = 0.0
+    rows: int = 0
+    round_trips: int = 0
+    bytes: int = 0
+    failed: bool = False
+    _mark: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def total_seconds(self) -> float:
+        """Execute plus fetch time."""
+        return self.execute_seconds + self.fetch_seconds
+
+    def executed(self) -> None:
+        """Record the end of the execute call."""
+        now = time.perf_counter()
+        self.execute_seconds += now - self._mark
+        self._mark = now
+
+    def fetch_started(self) -> None:
+        """
+        Record the start of a fetch call.
+
+        Streaming callers yield between fetches; calling this right before
+        each fetch keeps the consumer's time out of ``fetch_seconds``.
+        """
+        self._mark = time.perf_counter()
+
+    def fetched(self, rows: Sequence[Sequence[Any]], round_trips: int = 1) -> None:
+        """
+        Record a fetch call.
+
+        Bytes are estimated from the first row of the batch, which keeps
+        the cost independent of the batch size.
+
+        Args:
+            rows: Rows returned by the fetch
+            round_trips: Driver round trips the fetch took
+        """
+        now = time.perf_counter()
+        self.fetch_seconds += now - self._mark
+        self._mark = now
+        self.rows += len(rows)
+        self.round_trips += round_trips
+        if rows:
+            self.bytes += estimate_row_bytes(rows[0]) * len(rows)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable view of the measurements."""
+        data = {k: v for k, v in asdict(self).items() if not k.startswith('_')}
+        data['params'] = {
+            k: v.isoformat() if isinstance(v, (datetime, date)) else v
+            for k, v in (self.params or {}).items()
+        }
+        data['total_seconds'] = self.total_seconds
+        return data
+
+
+@dataclass
+class RunStats:
+    """Aggregate measurements of all statements of a run."""
+    statements: int = 0
+    execute_seconds: float = 0.0
+    fetch_seconds: float = 0.0
+    rows: int = 0
+    round_trips: int = 0
+    bytes: int = 0
+    slow_statements: int = 0
+    failed: int = 0
+    by_statement: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    @property
+    def rows_per_round_trip(self) -> float:
+        """Average rows returned per fetch round trip."""
+        return self.rows / self.round_trips if self.round_trips else 0.0
+
+
+class QueryInstrumentation:
+    """
+    Collects statement measurements for a DatabaseManager.
+
+    Statements slower than ``[METRICAS] umbral_lento_ms`` are logged as
+    warnings, with their bind values, and appended as JSON lines to
+    ``[METRICAS] archivo_lentas`` when it is set. Callables registered
+    with add_hook() receive every StatementStats once it completes.
+    """
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize instrumentation.
+
+        Args:
+            config: Configuration manager instance
+        """
+        self.slow_query_ms = float(
+            config.get('METRICAS', 'umbral_lento_ms', default=str(DEFAULT_SLOW_QUERY_MS))
+        )
+        slow_log = config.get('METRICAS', 'archivo_lentas', default='')
+        self.slow_log = Path(slow_log) if slow_log else None
+        self.hooks: List[Callable[[StatementStats], None]] = []
+        self._stats = RunStats()
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Callable[[StatementStats], None]) -> None:
+        """Register a callable receiving every completed statement."""
+        self.hooks.append(hook)
+
+    @contextmanager
+    def measure(self, query: str, params: Optional[dict] = None) -> Iterator[StatementStats]:
+        """
+        Measure one statement.
+
+        The caller marks executed() and fetched() on the yielded stats;
+        the statement is recorded when the block exits, also on errors.
+
+        Args:
+            query: SQL query string
+            params: Bind values
+
+        Yields:
+            StatementStats to update
+        """
+        stats = StatementStats(statement=' '.join(query.split()), params=params)
+        try:
+            yield stats
+        except Exception:
+            stats.failed = True
+            raise
+        finally:
+            self.record(stats)
+
+    def record(self, stats: StatementStats) -> None:
+        """Fold a completed statement into the run totals."""
+        elapsed_ms = stats.total_seconds * 1000
+        slow = elapsed_ms >= self.slow_query_ms
+
+        with self._lock:
+            run = self._stats
+            run.statements += 1
+            run.execute_seconds += stats.execute_seconds
+            run.fetch_seconds += stats.fetch_seconds
+            run.rows += stats.rows
+            run.round_trips += stats.round_trips
+            run.bytes += stats.bytes
+            run.slow_statements += slow
+            run.failed += stats.failed
+
+            totals = run.by_statement.setdefault(
+                stats.statement, {'calls': 0, 'seconds': 0.0, 'rows': 0}
+            )
+            totals['calls'] += 1
+            totals['seconds'] += stats.total_seconds
+            totals['rows'] += stats.rows
+
+        if slow:
+            self._log_slow(stats, elapsed_ms)
+
+        for hook in self.hooks:
+            hook(stats)
+
+    def _log_slow(self, stats: StatementStats, elapsed_ms: float) -> None:
+        """Write a slow statement to the log and the slow-query file."""
+        logger.warning(
+            f"Slow query ({elapsed_ms:.0f} ms: execute {stats.execute_seconds * 1000:.0f} ms, "
+            f"fetch {stats.fetch_seconds * 1000:.0f} ms, {stats.rows} rows, "
+            f"{stats.round_trips} round trips): {stats.statement} params={stats.params}"
+        )
+
+        if self.slow_log:
+            entry = stats.to_dict()
+            entry['logged_at'] = datetime.now().isoformat(timespec='seconds')
+            self.slow_log.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.slow_log, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, default=str) + '\n')
+
+    def summary(self) -> RunStats:
+        """
+        Get aggregate measurements of the run so far.
+
+        Returns:
+            RunStats: Copy of the running totals
+        """
+        with self._lock:
+            run = self._stats
+            return RunStats(
+                statements=run.statements,
+                execute_seconds=run.execute_seconds,
+                fetch_seconds=run.fetch_seconds,
+                rows=run.rows,
+                round_trips=run.round_trips,
+                bytes=run.bytes,
+                slow_statements=run.slow_statements,
+                failed=run.failed,
+                by_statement={k: dict(v) for k, v in run.by_statement.items()}
+            )
+
+    def reset(self) -> None:
+        """Discard the running totals."""
+        with self._lock:
+            self._stats = RunStats()
+
+
+class StageTimer:
+    """Wall time and call counts per pipeline stage, mergeable across processes."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the block as one call of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        """Add time to a stage."""
+        with self._lock:
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+            self.calls[name] = self.calls.get(name, 0) + calls
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Stage name to {'calls', 'seconds'} (picklable)."""
+        with self._lock:
+            return {
+                name: {'calls': self.calls[name], 'seconds': self.seconds[name]}
+                for name in self.seconds
+            }
+
+    def merge(self, snapshot: Dict[str, Dict[str, float]]) -> None:
+        """Add the stages of another timer's snapshot."""
+        for name, values in snapshot.items():
+            self.add(name, values['seconds'], int(values['calls']))
+
+    def format_table(self) -> str:
+        """Render stages as a text table in order of first use."""
+        stages = self.snapshot()
+        total = sum(values['seconds'] for values in stages.values()) or 1.0
+        lines = [
+            f"{'stage':<14}{'calls':>8}{'seconds':>12}{'mean ms':>12}{'share':>8}",
+            '-' * 54,
+        ]
+        for name, values in stages.items():
+            mean_ms = values['seconds'] / values['calls'] * 1000 if values['calls'] else 0.0
+            lines.append(
+                f"{name:<14}{values['calls']:>8}{values['seconds']:>12.3f}"
+                f"{mean_ms:>12.1f}{values['seconds'] / total:>8.0%}"
+            )
+        return '\n'.join(lines)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Deferred imports of heavy dependencies."""
+
+import types
+import importlib
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Attributes set on the stand-in (e.g. by mock.patch) shadow the real
+    module's without modifying it.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attribute: str) -> Any:
+        # Only called for attributes not found on the stand-in itself
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the real module has been imported."""
+        return self.__dict__['_module'] is not None
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Get a module that is only imported when first used.
+
+    Args:
+        name: Absolute module name, e.g. 'pyarrow.compute'
+
+    Returns:
+        LazyModule standing in for the module
+    """
+    return LazyModule(name)
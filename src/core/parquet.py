@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Parquet file generation."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from itertools import islice
+from typing import List, Any, Optional, Iterable
+
+from .config import ConfigManager
+from .lazy import lazy_import
+from .snapshot import SnapshotCache
+from .exceptions import PipelineError
+
+pa = lazy_import('pyarrow')
+pq = lazy_import('pyarrow.parquet')
+
+
+class ParquetGenerator:
+    """Writes report rows to a Parquet file, one row group per batch."""
+
+    def __init__(self, config: Optional[ConfigManager] = None):
+        """
+        Initialize Parquet generator.
+
+        Settings in [ARCHIVOS]: ``compresion_parquet`` ('snappy' by
+        default) and ``filas_por_grupo`` (rows per row group).
+
+        Args:
+            config: Optional configuration manager
+        """
+        if config:
+            self.compression = config.get('ARCHIVOS', 'compresion_parquet', default='snappy')
+            self.batch_rows = config.getint('ARCHIVOS', 'filas_por_grupo', default=100000)
+        else:
+            self.compression = 'snappy'
+            self.batch_rows = 100000
+
+    def generate_parquet(
+        self,
+        data: Iterable[List[Any]],
+        file_path: Path,
+        column_names: Optional[List[str]] = None
+    ) -> Path:
+        """
+        Write rows to a Parquet file.
+
+        Column types come from the first batch. When a later batch needs a
+        wider type (integers followed by decimals, or a column that was all
+        NULL so far), the schema is promoted and the row groups already
+        written are rewritten with it.
+
+        Args:
+            data: Rows (any iterable, consumed once)
+            file_path: Output file path
+            column_names: Optional column names (generic names if omitted)
+
+        Returns:
+            Path: Path to generated file
+
+        Raises:
+            PipelineError: If writing fails
+        """
+        file_path = Path(file_path)
+        batch_rows = max(1, self.batch_rows)
+        iterator = iter(data)
+        writer = None
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            table = SnapshotCache.table_from_rows(list(islice(iterator, batch_rows)), column_names)
+            writer = pq.ParquetWriter(file_path, table.schema, compression=self.compression)
+            writer.write_table(table)
+
+            while True:
+                batch = list(islice(iterator, batch_rows))
+                if not batch:
+                    break
+                table = SnapshotCache.table_from_rows(batch, column_names)
+                schema = pa.unify_schemas(
+                    [writer.schema, table.schema], promote_options='permissive'
+                )
+                if not schema.equals(writer.schema):
+                    writer = self._promote(writer, file_path, schema)
+                writer.write_table(table.cast(schema))
+        except Exception as e:
+            raise PipelineError(f"Failed to save Parquet file: {e}") from e
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return file_path
+
+    def _promote(self, writer: pq.ParquetWriter, file_path: Path, schema: pa.Schema) -> pq.ParquetWriter:
+        """
+        Rewrite the row groups written so far with a wider schema.
+
+        Args:
+            writer: Open writer for ``file_path``; it is closed
+            file_path: File being written
+            schema: Promoted schema
+
+        Returns:
+            pq.ParquetWriter: Open writer for ``file_path`` with ``schema``
+        """
+        writer.close()
+        partial = file_path.with_name(file_path.name + '.part')
+        os.replace(file_path, partial)
+        try:
+            source = pq.ParquetFile(partial)
+            promoted = pq.ParquetWriter(file_path, schema, compression=self.compression)
+            try:
+                for index in range(source.num_row_groups):
+                    promoted.write_table(source.read_row_group(index).cast(schema))
+            except Exception:
+                promoted.close()
+                raise
+            finally:
+                source.close()
+        finally:
+            partial.unlink()
+        return promoted
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""On-disk columnar snapshot cache of extracted report data."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from datetime import datetime
+from typing import Optional, List, Tuple, Any, Sequence, Dict
+
+from .config import ConfigManager
+from .lazy import lazy_import
+from .exceptions import PipelineError
+
+pa = lazy_import('pyarrow')
+ipc = lazy_import('pyarrow.ipc')
+pc = lazy_import('pyarrow.compute')
+
+
+FINGERPRINT_KEY = b'fingerprint'
+WATERMARK_KEY = b'watermark'
+
+
+class SnapshotCache:
+    """Stores one Arrow IPC file per report/date with LRU eviction."""
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize snapshot cache.
+
+        Args:
+            config: Configuration manager instance
+        """
+        self.config = config
+        self.enabled = config.getboolean('CACHE', 'habilitado', default=False)
+        self.directory = Path(config.get('CACHE', 'directorio', default='cache'))
+        self.max_bytes = config.getint('CACHE', 'max_tamano_mb', default=1024) * 1024 * 1024
+
+    def path_for(self, report: str, date: datetime) -> Path:
+        """Get snapshot file path for a report date."""
+        return self.directory / report / f"{date.strftime('%Y%m%d')}.arrow"
+
+    def previous_date(self, report: str, date: datetime) -> Optional[datetime]:
+        """
+        Find the latest cached snapshot date of a report before `date`.
+
+        Returns:
+            datetime or None if no earlier snapshot is cached
+        """
+        earlier = []
+        for path in (self.directory / report).glob('*.arrow'):
+            try:
+                cached = datetime.strptime(path.stem, '%Y%m%d')
+            except ValueError:
+                continue
+            if cached.date() < date.date():
+                earlier.append(cached)
+        return max(earlier, default=None)
+
+    @staticmethod
+    def table_from_rows(
+        rows: Sequence[Sequence[Any]],
+        column_names: Optional[List[str]] = None
+    ) -> pa.Table:
+        """
+        Build an Arrow table from row tuples.
+
+        Columns whose values Arrow cannot type consistently are stored as text.
+
+        Args:
+            rows: Row tuples as returned by the database
+            column_names: Optional column names (generic names if omitted)
+
+        Returns:
+            pa.Table: Columnar table
+        """
+        width = len(rows[0]) if rows else len(column_names or [])
+        if not column_names or len(column_names) != width:
+            column_names = [f"col_{i}" for i in range(1, width + 1)]
+
+        arrays = []
+        for values in zip(*rows) if rows else [[] for _ in range(width)]:
+            try:
+                arrays.append(pa.array(values))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+                arrays.append(pa.array([str(v) if v is not None else None for v in values]))
+
+        return pa.Table.from_arrays(arrays, names=list(column_names))
+
+    @staticmethod
+    def table_rows(table: pa.Table) -> List[Tuple]:
+        """Convert an Arrow table back to row tuples."""
+        columns = [column.to_pylist() for column in table.columns]
+        return list(zip(*columns))
+
+    @staticmethod
+    def resolve_column(table: pa.Table, name: str) -> str:
+        """
+        Find a column by name, ignoring case.
+
+        Raises:
+            PipelineError: If the column does not exist
+        """
+        for column in table.column_names:
+            if column.lower() == name.lower():
+                return column
+        raise PipelineError(f"Column not found in snapshot: {name}")
+
+    @staticmethod
+    def max_watermark(table: pa.Table, column: str) -> Optional[str]:
+        """
+        Get the encoded high-water mark of a column.
+
+        Returns:
+            str: ISO timestamp or integer as text, None if column is empty
+        """
+        value = pc.max(table.column(SnapshotCache.resolve_column(table, column))).as_py()
+        if value is None:
+            return None
+        return value.isoformat() if isinstance(value, datetime) else str(value)
+
+    @staticmethod
+    def read_watermark(table: pa.Table) -> Optional[Any]:
+        """
+        Decode the high-water mark stored with a snapshot.
+
+        Returns:
+            int, datetime or None if the snapshot has no watermark
+        """
+        raw = (table.schema.metadata or {}).get(WATERMARK_KEY)
+        if raw is None:
+            return None
+
+        value = raw.decode('utf-8')
+        try:
+            return int(value)
+        except ValueError:
+            return datetime.fromisoformat(value)
+
+    @staticmethod
+    def merge(table: pa.Table, delta: pa.Table, key_columns: List[str]) -> pa.Table:
+        """
+        Upsert delta rows into a snapshot by key.
+
+        Rows of the snapshot whose key appears in the delta are replaced,
+        new keys are appended.
+
+        Args:
+            table: Cached snapshot
+            delta: New or changed rows
+            key_columns: Columns identifying a row
+
+        Returns:
+            pa.Table: Merged table
+        """
+        if delta.num_rows == 0:
+            return table
+
+        keys = [SnapshotCache.resolve_column(table, name) for name in key_columns]
+        delta = delta.rename_columns(table.column_names)
+
+        if len(keys) == 1:
+            table_keys = table.column(keys[0])
+            delta_keys = delta.column(keys[0])
+        else:
+            table_keys = pc.binary_join_element_wise(
+                *[pc.cast(table.column(k), pa.string()) for k in keys], '\x1f'
+            )
+            delta_keys = pc.binary_join_element_wise(
+                *[pc.cast(delta.column(k), pa.string()) for k in keys], '\x1f'
+            )
+
+        keep = pc.invert(pc.is_in(table_keys, value_set=pc.unique(delta_keys)))
+        return pa.concat_tables(
+            [
+                table.filter(keep).replace_schema_metadata(None),
+                delta.replace_schema_metadata(None)
+            ],
+            promote_options='permissive'
+        )
+
+    def put(
+        self,
+        report: str,
+        date: datetime,
+        rows: Sequence[Sequence[Any]],
+        column_names: Optional[List[str]] = None,
+        fingerprint: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Path:
+        """
+        Store extracted rows as a snapshot.
+
+        Args:
+            report: Report name
+            date: Report date
+            rows: Extracted rows
+            column_names: Optional column names
+            fingerprint: Source fingerprint used for invalidation
+            metadata: Optional extra key/value metadata
+
+        Returns:
+            Path: Snapshot file path
+
+        Raises:
+            PipelineError: If snapshot cannot be written
+        """
+        table = self.table_from_rows(rows, column_names)
+        return self.put_table(report, date, table, fingerprint, metadata)
+
+    def put_table(
+        self,
+        report: str,
+        date: datetime,
+        table: pa.Table,
+        fingerprint: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Path:
+        """Store an Arrow table as a snapshot (see put)."""
+        schema_metadata = dict(table.schema.metadata or {})
+        for key, value in (metadata or {}).items():
+            if value is None:
+                continue
+            schema_metadata[key.encode('utf-8')] = str(value).encode('utf-8')
+        if fingerprint:
+            schema_metadata[FINGERPRINT_KEY] = fingerprint.encode('utf-8')
+        table = table.replace_schema_metadata(schema_metadata)
+
+        path = self.path_for(report, date)
+        tmp_path = path.with_suffix('.arrow.tmp')
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with pa.OSFile(str(tmp_path), 'wb') as sink:
+                with ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            tmp_path.replace(path)
+        except (OSError, pa.ArrowException) as e:
+            raise PipelineError(f"Failed to write snapshot {path}: {e}") from e
+
+        self.evict(keep=path)
+        return path
+
+    def read_metadata(self, report: str, date: datetime) -> Optional[Dict[str, str]]:
+        """
+        Read snapshot metadata without loading its data.
+
+        Returns:
+            Dict of metadata or None if no snapshot exists
+        """
+        path = self.path_for(report, date)
+        if not path.exists():
+            return None
+
+        try:
+            with pa.memory_map(str(path), 'r') as source:
+                raw = ipc.open_file(source).schema.metadata or {}
+        except (OSError, pa.ArrowException):
+            return None
+
+        return {k.decode('utf-8'): v.decode('utf-8') for k, v in raw.items()}
+
+    def get(
+        self,
+        report: str,
+        date: datetime,
+        fingerprint: Optional[str] = None
+    ) -> Optional[pa.Table]:
+        """
+        Load a snapshot, memory-mapped.
+
+        Args:
+            report: Report name
+            date: Report date
+            fingerprint: If given, snapshot must have been stored with it
+
+        Returns:
+            pa.Table or None if missing, unreadable or stale
+        """
+        path = self.path_for(report, date)
+        if not path.exists():
+            return None
+
+        try:
+            source = pa.memory_map(str(path), 'r')
+            table = ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowException):
+            self.invalidate(report, date)
+            return None
+
+        if fingerprint is not None:
+            stored = (table.schema.metadata or {}).get(FINGERPRINT_KEY)
+            if stored is None or stored.decode('utf-8') != fingerprint:
+                self.invalidate(report, date)
+                return None
+
+        os.utime(path, None)
+        return table
+
+    def invalidate(self, report: str, date: datetime) -> None:
+        """Remove snapshot for a report date if present."""
+        path = self.path_for(report, date)
+        if path.exists():
+            path.unlink()
+
+    def evict(self, keep: Optional[Path] = None) -> List[Path]:
+        """
+        Remove least recently used snapshots until cache fits its size limit.
+
+        Args:
+            keep: Optional snapshot that must not be evicted
+
+        Returns:
+            List of removed snapshot paths
+        """
+        if not self.directory.exists():
+            return []
+
+        files = [(p.stat().st_mtime, p.stat().st_size, p) for p in self.directory.rglob('*.arrow')]
+        total = sum(size for _, size, _ in files)
+        removed = []
+
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == keep:
+                continue
+            path.unlink()
+            total -= size
+            removed.append(path)
+
+        return removed
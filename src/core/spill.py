@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Row buffers that spill to disk past a memory budget."""
+
+import os
+import mmap
+import heapq
+import pickle
+import struct
+import tempfile
+from pathlib import Path
+from typing import List, Any, Optional, Iterable, Iterator, Callable, Tuple
+
+from .config import ConfigManager
+from .instrumentation import estimate_row_bytes
+from .exceptions import PipelineError
+
+
+# Python object overhead on top of the cell contents counted by estimate_row_bytes
+ROW_OVERHEAD = 56
+CELL_OVERHEAD = 40
+FRAME_HEADER = struct.Struct('<Q')
+
+
+def row_memory(row: List[Any]) -> int:
+    """Approximate memory held by a row of Python values."""
+    return ROW_OVERHEAD + CELL_OVERHEAD * len(row) + estimate_row_bytes(row)
+
+
+class SpillFile:
+    """
+    Append-only file of row batches, read back memory-mapped.
+
+    Each frame is a length prefix and a pickled batch of rows, which keeps
+    every value exactly as it was (Decimal scale, time zones, big ints).
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        fd, name = tempfile.mkstemp(prefix='spill_', suffix='.bin', dir=directory)
+        self.path = Path(name)
+        self._file = os.fdopen(fd, 'wb')
+        self.frames: List[Tuple[int, int]] = []
+
+    def write(self, rows: List[Any]) -> None:
+        """Append one batch of rows."""
+        payload = pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL)
+        offset = self._file.tell()
+        self._file.write(FRAME_HEADER.pack(len(payload)))
+        self._file.write(payload)
+        self.frames.append((offset + FRAME_HEADER.size, len(payload)))
+
+    def read(self, first: int = 0, last: Optional[int] = None) -> Iterator[List[Any]]:
+        """Batches of frames [first, last), one at a time."""
+        self._file.flush()
+        frames = self.frames[first:last]
+        if not frames:
+            return
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset, size in frames:
+                yield pickle.loads(mapped[offset:offset + size])
+
+    def close(self) -> None:
+        """Close and delete the file."""
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+
+class SpillBuffer:
+    """
+    Ordered row store that keeps at most about ``budget_bytes`` of rows in
+    memory, spilling the rest to a temporary file in batches.
+
+    Iteration returns rows in insertion order, reading spilled batches
+    back memory-mapped one at a time; sorted() is an external merge sort.
+    A budget of 0 never spills.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = 0,
+        directory: Optional[Path] = None,
+        batch_rows: int = 10000
+    ):
+        """
+        Initialize buffer.
+
+        Args:
+            budget_bytes: Memory budget for buffered rows (0 = unlimited)
+            directory: Directory for spill files (system temp by default)
+            batch_rows: Rows per spilled batch
+        """
+        self.budget_bytes = budget_bytes
+        self.directory = Path(directory) if directory else None
+        self.batch_rows = max(1, batch_rows)
+        self.rows: List[Any] = []
+        self.memory_bytes = 0
+        self.spilled_rows = 0
+        self._spill: Optional[SpillFile] = None
+        # Frame index where each spilled segment (one budget's worth) ends
+        self._segments: List[int] = []
+        self._runs: List[SpillFile] = []
+
+    @property
+    def spilled(self) -> bool:
+        """Whether any rows went to disk."""
+        return self.spilled_rows > 0
+
+    def __len__(self) -> int:
+        return self.spilled_rows + len(self.rows)
+
+    def append(self, row: List[Any]) -> None:
+        """Add one row, spilling the buffered rows if over budget."""
+        self.rows.append(row)
+        if self.budget_bytes:
+            self.memory_bytes += row_memory(row)
+            if self.memory_bytes > self.budget_bytes:
+                self._spill_rows()
+
+    def extend(self, rows: Iterable[List[Any]]) -> None:
+        """Add several rows."""
+        for row in rows:
+            self.append(row)
+
+    def _spill_rows(self) -> None:
+        """Move the buffered rows to the spill file as one segment."""
+        try:
+            if self._spill is None:
+                if self.directory:
+                    self.directory.mkdir(parents=True, exist_ok=True)
+                self._spill = SpillFile(self.directory)
+            for start in range(0, len(self.rows), self.batch_rows):
+                self._spill.write(self.rows[start:start + self.batch_rows])
+        except OSError as e:
+            raise PipelineError(f"Failed to spill rows to disk: {e}") from e
+
+        self._segments.append(len(self._spill.frames))
+        self.spilled_rows += len(self.rows)
+        self.rows = []
+        self.memory_bytes = 0
+
+    def _segment_rows(self, index: int) -> Iterator[Any]:
+        first = self._segments[index - 1] if index else 0
+        for batch in self._spill.read(first, self._segments[index]):
+            yield from batch
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._spill is not None:
+            for batch in self._spill.read():
+                yield from batch
+        yield from self.rows
+
+    def sorted(self, key: Callable[[Any], Any], reverse: bool = False) -> Iterator[Any]:
+        """
+        Rows ordered by `key`, holding one segment in memory at a time.
+
+        Each spilled segment is sorted into a run file, then the runs and
+        the in-memory rows are merged.
+
+        Args:
+            key: Sort key of a row
+            reverse: Descending order
+
+        Returns:
+            Iterator over the sorted rows
+        """
+        runs = []
+        for index in range(len(self._segments)):
+            segment = sorted(self._segment_rows(index), key=key, reverse=reverse)
+            run = SpillFile(self.directory)
+            for start in range(0, len(segment), self.batch_rows):
+                run.write(segment[start:start + self.batch_rows])
+            del segment
+            self._runs.append(run)
+            runs.append(run)
+
+        def run_rows(run: SpillFile) -> Iterator[Any]:
+            for batch in run.read():
+                yield from batch
+
+        tail = sorted(self.rows, key=key, reverse=reverse)
+        return heapq.merge(*(run_rows(run) for run in runs), tail, key=key, reverse=reverse)
+
+    def close(self) -> None:
+        """Delete spill files and drop buffered rows."""
+        for spill in [self._spill] + self._runs:
+            if spill is not None:
+                spill.close()
+        self._spill = None
+        self._runs = []
+        self._segments = []
+        self.rows = []
+        self.memory_bytes = 0
+        self.spilled_rows = 0
+
+    def __enter__(self) -> 'SpillBuffer':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+class MemoryBudget:
+    """
+    Memory settings of the report pipeline: how many bytes of prepared
+    rows stay in memory before spilling, and the optional row order.
+    """
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize memory budget.
+
+        Settings in [MEMORIA]: ``presupuesto_mb`` (0 or missing: no
+        limit), ``directorio_temporal`` and ``filas_por_lote``. Rows are
+        sorted by the columns of [REPORTE] ``ordenar_por``, descending
+        when ``orden_descendente`` is true.
+
+        Args:
+            config: Configuration manager instance
+        """
+        self.config = config
+        megabytes = float(config.get('MEMORIA', 'presupuesto_mb', default='0'))
+        self.budget_bytes = int(megabytes * 1024 * 1024)
+        self.directory = config.get('MEMORIA', 'directorio_temporal', default='') or None
+        self.batch_rows = config.getint('MEMORIA', 'filas_por_lote', default=10000)
+        self.sort_by = [
+            c.strip() for c in config.get('REPORTE', 'ordenar_por', default='').split(',') if c.strip()
+        ]
+        self.descending = config.getboolean('REPORTE', 'orden_descendente', default=False)
+        self.enabled = bool(self.budget_bytes or self.sort_by)
+
+    def buffer(self) -> SpillBuffer:
+        """New row buffer with this budget."""
+        return SpillBuffer(self.budget_bytes, self.directory, self.batch_rows)
+
+    def sort_key(self, column_names: List[str]) -> Callable[[Any], Any]:
+        """
+        Sort key over the ordenar_por columns, NULLs last (first when
+        descending).
+
+        Columns are matched by name (case-insensitive) or 1-based position.
+
+        Raises:
+            PipelineError: If a column does not exist
+        """
+        indexes = []
+        lowered = [str(name).lower() for name in column_names]
+        for name in self.sort_by:
+            if name.isdigit():
+                indexes.append(int(name) - 1)
+            elif name.lower() in lowered:
+                indexes.append(lowered.index(name.lower()))
+            else:
+                raise PipelineError(f"Sort column not found: {name}")
+
+        def key(row):
+            return tuple((row[i] is None, row[i]) for i in indexes)
+        return key
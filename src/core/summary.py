@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Vectorized totals computed while report rows stream through."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Sequence, Tuple
+
+from .config import ConfigManager
+from .lazy import lazy_import
+from .columnar import ColumnBatch
+from .exceptions import PipelineError
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+@dataclass
+class ColumnStats:
+    """Aggregates of one numeric column."""
+    count: int = 0
+    total: float = 0.0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+
+@dataclass
+class ReportSummary:
+    """Totals of a generated report."""
+    records: int
+    columns: Dict[str, ColumnStats]
+    group_by: Optional[str] = None
+    groups: Dict[Any, Dict[str, float]] = field(default_factory=dict)
+    total_amount: Optional[float] = None
+
+    def to_sheet(self) -> Tuple[List[str], List[List[Any]]]:
+        """
+        Lay out the summary as sheet rows.
+
+        Returns:
+            Tuple of (headers, rows)
+        """
+        headers = ['Columna', 'Registros', 'Total', 'Minimo', 'Maximo']
+        rows = [
+            [name, stats.count, stats.total, stats.minimum, stats.maximum]
+            for name, stats in self.columns.items()
+        ]
+
+        if self.group_by and self.groups:
+            rows.append([])
+            rows.append([self.group_by, 'Registros'] + list(self.columns))
+            for key in sorted(self.groups, key=str):
+                values = self.groups[key]
+                rows.append(
+                    [key, int(values['count'])] + [values[name] for name in self.columns]
+                )
+
+        return headers, rows
+
+
+class SummaryStage:
+    """Accumulates totals, counts, min/max and group sums batch by batch."""
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize summary stage.
+
+        Args:
+            config: Configuration manager instance
+        """
+        self.config = config
+        self.enabled = config.getboolean('RESUMEN', 'habilitado', default=False)
+        self.summary_sheet = False
+        self.columns: List[str] = []
+        self.group_by: Optional[str] = None
+        self.amount_column: Optional[str] = None
+
+        if self.enabled:
+            self.columns = [
+                c.strip() for c in config.get('RESUMEN', 'columnas').split(',') if c.strip()
+            ]
+            self.group_by = config.get('RESUMEN', 'agrupar_por', default='') or None
+            self.amount_column = config.get('RESUMEN', 'columna_total', default='') or None
+            self.summary_sheet = config.getboolean('RESUMEN', 'hoja_resumen', default=False)
+            if self.amount_column and self.amount_column not in self.columns:
+                self.columns.append(self.amount_column)
+
+        self._indexes: Dict[str, int] = {}
+        self._group_index: Optional[int] = None
+        self._records = 0
+        self._stats: Dict[str, ColumnStats] = {}
+        self._groups: Optional[pd.DataFrame] = None
+
+    @staticmethod
+    def _resolve(name: str, column_names: List[str]) -> int:
+        """Resolve a column by name (case-insensitive) or 1-based position."""
+        if name.isdigit():
+            return int(name) - 1
+        for idx, column in enumerate(column_names):
+            if column.lower() == name.lower():
+                return idx
+        raise PipelineError(f"Summary column not found: {name}")
+
+    def begin(self, column_names: Optional[List[str]] = None) -> None:
+        """
+        Reset accumulators for a new report.
+
+        Args:
+            column_names: Column names of the rows about to be fed
+
+        Raises:
+            PipelineError: If a configured column does not exist
+        """
+        names = list(column_names or [])
+        self._indexes = {c: self._resolve(c, names) for c in self.columns}
+        self._group_index = self._resolve(self.group_by, names) if self.group_by else None
+        self._records = 0
+        self._stats = {c: ColumnStats() for c in self.columns}
+        self._groups = None
+
+    def update(self, rows: Sequence[Sequence[Any]]) -> None:
+        """
+        Fold a batch of rows into the running aggregates.
+
+        Args:
+            rows: Batch of row tuples
+        """
+        if rows:
+            self.update_batch(ColumnBatch.from_rows(rows))
+
+    @staticmethod
+    def _as_float(name: str, values: np.ndarray, mask: Optional[np.ndarray]) -> np.ndarray:
+        """Get a column as float64 with NaN for NULLs."""
+        try:
+            if values.dtype.kind in 'iuf':
+                result = values.astype(np.float64)
+            elif values.dtype.kind == 'O':
+                result = np.array(
+                    [np.nan if v is None else v for v in values], dtype=np.float64
+                )
+            else:
+                raise TypeError(f"unsupported type {values.dtype}")
+        except (TypeError, ValueError) as e:
+            raise PipelineError(f"Summary column {name} is not numeric: {e}") from e
+
+        if mask is not None:
+            result[mask] = np.nan
+        return result
+
+    def update_batch(self, batch: ColumnBatch) -> None:
+        """
+        Fold a columnar batch into the running aggregates.
+
+        Args:
+            batch: Columnar batch (see DatabaseManager.iter_columnar)
+        """
+        if batch.num_rows == 0:
+            return
+
+        self._records += batch.num_rows
+        arrays = {}
+
+        for name, idx in self._indexes.items():
+            values = self._as_float(name, batch.columns[idx], batch.masks[idx])
+            arrays[name] = values
+            valid = ~np.isnan(values)
+            valid_count = int(valid.sum())
+            if valid_count == 0:
+                continue
+
+            stats = self._stats[name]
+            batch_min = float(np.nanmin(values))
+            batch_max = float(np.nanmax(values))
+            stats.count += valid_count
+            stats.total += float(np.nansum(values))
+            stats.minimum = batch_min if stats.minimum is None else min(stats.minimum, batch_min)
+            stats.maximum = batch_max if stats.maximum is None else max(stats.maximum, batch_max)
+
+        if self._group_index is not None:
+            keys = batch.columns[self._group_index].astype(object)
+            mask = batch.masks[self._group_index]
+            if mask is not None:
+                keys[mask] = None
+            frame = pd.DataFrame(arrays)
+            frame['count'] = 1
+            frame['__key'] = keys
+            partial = frame.groupby('__key', dropna=False).sum()
+            self._groups = partial if self._groups is None else self._groups.add(partial, fill_value=0)
+
+    def finish(self) -> ReportSummary:
+        """
+        Build the summary of all rows fed since begin().
+
+        Returns:
+            ReportSummary: Aggregated totals
+        """
+        groups = {}
+        if self._groups is not None:
+            groups = {
+                key: {k: float(v) for k, v in values.items()}
+                for key, values in self._groups.to_dict(orient='index').items()
+            }
+
+        amount = self.amount_column or (self.columns[0] if self.columns else None)
+        total_amount = self._stats[amount].total if amount in self._stats else None
+
+        return ReportSummary(
+            records=self._records,
+            columns=dict(self._stats),
+            group_by=self.group_by,
+            groups=groups,
+            total_amount=total_amount
+        )
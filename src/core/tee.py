@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Fan one row stream out to several file writers at once."""
+
+import time
+import queue
+import threading
+from itertools import islice
+from typing import List, Any, Dict, Callable, Iterable, Iterator
+
+from .exceptions import PipelineError
+
+
+_END = object()
+_ABORT = object()
+
+
+class RowTee:
+    """
+    Feeds one stream of rows to several writers, each in its own thread.
+
+    Rows travel in batches through one bounded queue per writer, so a
+    slow writer holds back the stream instead of letting batches pile up
+    in memory: at most ``buffer_batches`` batches wait for each writer.
+    A writer is any callable that consumes an iterable of rows once.
+    """
+
+    def __init__(self, buffer_batches: int = 4, batch_size: int = 1000):
+        """
+        Initialize tee.
+
+        Args:
+            buffer_batches: Batches queued per writer before the stream waits
+            batch_size: Rows per batch
+        """
+        self.buffer_batches = max(1, buffer_batches)
+        self.batch_size = max(1, batch_size)
+        self.writers: Dict[str, Callable[[Iterable[Any]], Any]] = {}
+        self.timings: Dict[str, float] = {}
+
+    def add(self, name: str, writer: Callable[[Iterable[Any]], Any]) -> None:
+        """
+        Register a writer.
+
+        Args:
+            name: Writer name, used for results and timings
+            writer: Callable consuming an iterable of rows
+        """
+        self.writers[name] = writer
+
+    @staticmethod
+    def _rows(channel: queue.Queue) -> Iterator[Any]:
+        """Rows of the batches arriving on a channel, until the end marker."""
+        while True:
+            batch = channel.get()
+            if batch is _END:
+                return
+            if batch is _ABORT:
+                raise PipelineError("Row stream aborted")
+            yield from batch
+
+    def _consume(self, name: str, channel: queue.Queue, results: Dict, errors: Dict) -> None:
+        """Run one writer on its channel, then drain whatever it left."""
+        started = time.perf_counter()
+        rows = self._rows(channel)
+        try:
+            results[name] = self.writers[name](rows)
+        except Exception as e:
+            errors[name] = e
+        finally:
+            self.timings[name] = time.perf_counter() - started
+            # Keep the channel moving so the stream never waits on a dead writer
+            for _ in rows:
+                pass
+
+    def run(self, rows: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Stream rows to every writer.
+
+        Args:
+            rows: Rows (any iterable, consumed once)
+
+        Returns:
+            Dict of writer name to the writer's return value
+
+        Raises:
+            PipelineError: If reading rows or any writer fails
+        """
+        channels = {name: queue.Queue(maxsize=self.buffer_batches) for name in self.writers}
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+        threads = [
+            threading.Thread(target=self._consume, args=(name, channel, results, errors),
+                             name=f"tee-{name}", daemon=True)
+            for name, channel in channels.items()
+        ]
+        for thread in threads:
+            thread.start()
+
+        marker = _END
+        try:
+            iterator = iter(rows)
+            while True:
+                batch: List[Any] = list(islice(iterator, self.batch_size))
+                if not batch:
+                    break
+                for channel in channels.values():
+                    channel.put(batch)
+        except Exception as e:
+            marker = _ABORT
+            errors['rows'] = e
+        finally:
+            for channel in channels.values():
+                channel.put(marker)
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            details = '; '.join(f"{name}: {error}" for name, error in errors.items())
+            raise PipelineError(f"Output writer failed: {details}")
+        return results
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Delimited text (CSV) file generation."""
+
+import csv
+from pathlib import Path
+from datetime import datetime
+from typing import List, Any, Optional, Iterable
+
+from .config import ConfigManager
+from .exceptions import PipelineError
+
+
+class TextGenerator:
+    """Writes report rows as delimited text, following the Excel number settings."""
+
+    def __init__(self, config: Optional[ConfigManager] = None):
+        """
+        Initialize text generator.
+
+        Settings in [ARCHIVOS]: ``formato_numero`` and ``decimales`` as
+        for Excel, ``separador`` (';' by default, since European decimals
+        use commas) and ``codificacion`` ('utf-8-sig' so Excel detects it).
+
+        Args:
+            config: Optional configuration manager
+        """
+        if config:
+            self.number_format = config.get('ARCHIVOS', 'formato_numero', default='europeo')
+            self.decimals = config.getint('ARCHIVOS', 'decimales', default=2)
+            self.delimiter = config.get('ARCHIVOS', 'separador', default=';')
+            self.encoding = config.get('ARCHIVOS', 'codificacion', default='utf-8-sig')
+        else:
+            self.number_format = 'europeo'
+            self.decimals = 2
+            self.delimiter = ';'
+            self.encoding = 'utf-8-sig'
+
+    def format_value(self, value: Any) -> str:
+        """
+        Render one cell.
+
+        Args:
+            value: Cell value
+
+        Returns:
+            str: Text of the cell
+        """
+        if value is None:
+            return ''
+        if isinstance(value, bool):
+            return str(value)
+        if isinstance(value, float):
+            text = f"{value:.{self.decimals}f}"
+            return text.replace('.', ',') if self.number_format == 'europeo' else text
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d %H:%M:%S')
+        return str(value)
+
+    def generate_csv(
+        self,
+        data: Iterable[List[Any]],
+        file_path: Path,
+        headers: Optional[List[str]] = None
+    ) -> Path:
+        """
+        Write rows to a delimited text file.
+
+        Args:
+            data: Rows (any iterable, consumed once)
+            file_path: Output file path
+            headers: Optional column headers
+
+        Returns:
+            Path: Path to generated file
+
+        Raises:
+            PipelineError: If writing fails
+        """
+        file_path = Path(file_path)
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(file_path, 'w', newline='', encoding=self.encoding) as f:
+                writer = csv.writer(f, delimiter=self.delimiter)
+                if headers:
+                    writer.writerow(headers)
+                writer.writerows(
+                    [self.format_value(value) for value in row] for row in data
+                )
+        except Exception as e:
+            raise PipelineError(f"Failed to save text file: {e}") from e
+
+        return file_path
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Concurrency and rate limits around database queries."""
+
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional, Dict, Tuple, Iterator
+
+from .config import ConfigManager
+from .exceptions import ConfigurationError
+
+
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_LEASE_SECONDS = 600
+ADAPT_TOLERANCE = 2.0
+ADAPT_DECREASE = 0.7
+ADAPT_SMOOTHING = 0.2
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum stored tokens (defaults to max(rate, 1))
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until one is available.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class ConcurrencyLimiter:
+    """
+    Bounds in-flight queries within the process.
+
+    In adaptive mode the limit follows observed latency: it is cut by 30%
+    when the smoothed latency exceeds the target (or twice the best
+    latency seen, without a target) and grows by one otherwise, at most
+    once per `limit` completed queries (AIMD).
+    """
+
+    def __init__(
+        self,
+        maximum: int,
+        adaptive: bool = False,
+        target_latency: Optional[float] = None
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            maximum: Maximum concurrent queries
+            adaptive: If True, adjust the limit to observed latency
+            target_latency: Latency in seconds above which to back off
+        """
+        self.maximum = maximum
+        self.adaptive = adaptive
+        self.target_latency = target_latency
+        self.limit = maximum
+        self.in_use = 0
+        self._smoothed: Optional[float] = None
+        self._best: Optional[float] = None
+        self._samples = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> float:
+        """
+        Wait for a free slot.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        start = time.monotonic()
+        with self._condition:
+            while self.in_use >= self.limit:
+                self._condition.wait()
+            self.in_use += 1
+        return time.monotonic() - start
+
+    def release(self, latency: Optional[float] = None) -> None:
+        """
+        Free a slot, feeding the query latency to the adaptive limit.
+
+        Args:
+            latency: Seconds the query took
+        """
+        with self._condition:
+            self.in_use -= 1
+            if self.adaptive and latency is not None:
+                self._adapt(latency)
+            self._condition.notify_all()
+
+    def _adapt(self, latency: float) -> None:
+        """Adjust the limit from one latency sample (lock held)."""
+        if self._smoothed is None:
+            self._smoothed = latency
+        else:
+            self._smoothed += ADAPT_SMOOTHING * (latency - self._smoothed)
+        self._best = latency if self._best is None else min(self._best, latency)
+
+        self._samples += 1
+        if self._samples < self.limit:
+            return
+        self._samples = 0
+
+        threshold = self.target_latency or self._best * ADAPT_TOLERANCE
+        if self._smoothed > threshold:
+            self.limit = max(1, int(self.limit * ADAPT_DECREASE))
+        elif self.limit < self.maximum:
+            self.limit += 1
+
+
+class SharedSlots:
+    """
+    Concurrency slots shared by every process using the same SQLite file.
+
+    Each running query holds a row; a row older than the lease (from a
+    crashed process) is reclaimed by the next acquirer.
+    """
+
+    def __init__(self, path: Path, limit: int, lease_seconds: int = DEFAULT_LEASE_SECONDS):
+        """
+        Initialize shared slots.
+
+        Args:
+            path: SQLite file shared by the processes
+            limit: Maximum concurrent queries across processes
+            lease_seconds: Age after which a slot is considered abandoned
+        """
+        self.path = Path(path)
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS slots "
+                "(id INTEGER PRIMARY KEY, pid INTEGER, acquired_at REAL)"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def acquire(self) -> Tuple[int, float]:
+        """
+        Wait for a free slot.
+
+        Returns:
+            Tuple of (slot id, seconds spent waiting)
+        """
+        start = time.monotonic()
+        delay = 0.01
+
+        while True:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                conn.execute(
+                    "DELETE FROM slots WHERE acquired_at < ?", (now - self.lease_seconds,)
+                )
+                (in_use,) = conn.execute("SELECT COUNT(*) FROM slots").fetchone()
+                if in_use < self.limit:
+                    slot_id = conn.execute(
+                        "INSERT INTO slots (pid, acquired_at) VALUES (?, ?)", (os.getpid(), now)
+                    ).lastrowid
+                    conn.execute("COMMIT")
+                    return slot_id, time.monotonic() - start
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+    def release(self, slot_id: int) -> None:
+        """Free a slot."""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM slots WHERE id = ?", (slot_id,))
+        finally:
+            conn.close()
+
+
+@dataclass
+class SlotLease:
+    """A held query slot; set `latency` to report the query's own time."""
+    latency: Optional[float] = None
+
+
+@dataclass
+class ThrottleStats:
+    """Waiting caused by the limits."""
+    queries: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    limit: int = 0
+
+
+class DatabaseThrottle:
+    """
+    Rate, process-wide and cross-process limits for database queries.
+
+    Configured in ``[LIMITES]``: ``max_concurrentes``,
+    ``consultas_por_segundo`` and ``rafaga`` (token bucket), ``adaptativo``
+    with optional ``latencia_objetivo_ms``, and ``archivo_compartido``,
+    a SQLite file that extends the concurrency limit to every process
+    pointing at it. Use shared() so all managers of a process obey the
+    same limits.
+    """
+
+    _shared: Dict[Tuple, 'DatabaseThrottle'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize throttle.
+
+        Args:
+            config: Configuration manager instance
+
+        Raises:
+            ConfigurationError: If the limits are invalid
+        """
+        self.enabled = config.getboolean('LIMITES', 'habilitado', default=False)
+        self.bucket: Optional[TokenBucket] = None
+        self.limiter: Optional[ConcurrencyLimiter] = None
+        self.slots: Optional[SharedSlots] = None
+        self._stats = ThrottleStats()
+        self._lock = threading.Lock()
+
+        if not self.enabled:
+            return
+
+        maximum = config.getint('LIMITES', 'max_concurrentes', default=DEFAULT_MAX_CONCURRENT)
+        rate = float(config.get('LIMITES', 'consultas_por_segundo', default='0'))
+        burst = float(config.get('LIMITES', 'rafaga', default='0'))
+        target_ms = float(config.get('LIMITES', 'latencia_objetivo_ms', default='0'))
+        shared_file = config.get('LIMITES', 'archivo_compartido', default='')
+
+        if maximum < 1 or rate < 0:
+            raise ConfigurationError("LIMITES max_concurrentes must be >= 1 and rates >= 0")
+
+        if rate:
+            self.bucket = TokenBucket(rate, burst or None)
+        self.limiter = ConcurrencyLimiter(
+            maximum,
+            adaptive=config.getboolean('LIMITES', 'adaptativo', default=False),
+            target_latency=target_ms / 1000 if target_ms else None
+        )
+        if shared_file:
+            self.slots = SharedSlots(Path(shared_file), maximum)
+
+    @classmethod
+    def shared(cls, config: ConfigManager) -> 'DatabaseThrottle':
+        """
+        Get the process-wide throttle for a configuration.
+
+        Args:
+            config: Configuration manager instance
+
+        Returns:
+            DatabaseThrottle shared by every caller with the same limits
+        """
+        key = tuple(
+            str(config.get('LIMITES', option, default=''))
+            for option in ('habilitado', 'max_concurrentes', 'consultas_por_segundo', 'rafaga',
+                           'adaptativo', 'latencia_objetivo_ms', 'archivo_compartido')
+        )
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(config)
+            return cls._shared[key]
+
+    @contextmanager
+    def slot(self) -> Iterator[SlotLease]:
+        """
+        Hold a query slot for the duration of the block.
+
+        The adaptive limit is fed the lease's ``latency`` when the caller
+        sets it, and the time the block took otherwise. Streamed queries
+        hold the slot while the consumer works, so they report the
+        statement's execute and fetch time instead.
+        """
+        lease = SlotLease()
+        if not self.enabled:
+            yield lease
+            return
+
+        waited = self.bucket.acquire() if self.bucket else 0.0
+        waited += self.limiter.acquire()
+        slot_id = None
+        start = time.monotonic()
+        try:
+            if self.slots:
+                slot_id, shared_wait = self.slots.acquire()
+                waited += shared_wait
+
+            with self._lock:
+                self._stats.queries += 1
+                if waited > 0.001:
+                    self._stats.waits += 1
+                    self._stats.wait_seconds += waited
+
+            start = time.monotonic()
+            yield lease
+        finally:
+            if slot_id is not None:
+                self.slots.release(slot_id)
+            if lease.latency is None:
+                lease.latency = time.monotonic() - start
+            self.limiter.release(lease.latency)
+
+    def stats(self) -> ThrottleStats:
+        """
+        Get waiting caused by the limits so far.
+
+        Returns:
+            ThrottleStats: Counters and the current concurrency limit
+        """
+        with self._lock:
+            return ThrottleStats(
+                queries=self._stats.queries,
+                waits=self._stats.waits,
+                wait_seconds=self._stats.wait_seconds,
+                limit=self.limiter.limit if self.limiter else 0
+            )
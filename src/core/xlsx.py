@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Direct SpreadsheetML (xlsx) rendering without an object model.
+
+Rows are rendered to worksheet XML by plain functions and streamed into
+the zip container. Styles are fixed: every workbook has the same four
+cell formats, so a rendered part never depends on the rest of the
+workbook. Text goes into a SharedStrings table when one is given, or
+inline otherwise so blocks of rows can be rendered in worker processes.
+"""
+
+import re
+import math
+import zipfile
+import tempfile
+from collections import deque
+from pathlib import Path
+from dataclasses import dataclass
+from datetime import datetime
+from xml.sax.saxutils import escape, quoteattr
+from typing import List, Any, Optional, Tuple, Iterable, Iterator, Sequence, Dict
+
+from .exceptions import PipelineError
+
+
+EXCEL_EPOCH = datetime(1899, 12, 30)
+NUMBER_FORMAT_ID = 164
+DATETIME_FORMAT_ID = 165
+DATETIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+
+# Indexes into cellXfs of STYLES_TEMPLATE
+STYLE_NUMBER = 1
+STYLE_DATETIME = 2
+STYLE_HEADER = 3
+
+# Rows rendered at a time by a streamed sheet
+STREAM_BLOCK_ROWS = 1000
+# Rendered blocks a streamed sheet lets wait on the pool
+MAX_PENDING_BLOCKS = 8
+COPY_CHUNK_BYTES = 1024 * 1024
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<worksheet xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">'
+)
+FROZEN_HEADER = (
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '<selection pane="bottomLeft"/></sheetView></sheetViews>'
+)
+
+STYLES_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<styleSheet xmlns="{MAIN_NS}">'
+    '<numFmts count="2">'
+    f'<numFmt numFmtId="{NUMBER_FORMAT_ID}" formatCode={{number_format}}/>'
+    f'<numFmt numFmtId="{DATETIME_FORMAT_ID}" formatCode="{DATETIME_FORMAT}"/>'
+    '</numFmts>'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    f'<xf numFmtId="{NUMBER_FORMAT_ID}" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    f'<xf numFmtId="{DATETIME_FORMAT_ID}" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+@dataclass
+class SheetLayout:
+    """Column widths, frozen header row and autofilter range of a sheet."""
+    widths: Sequence[float] = ()
+    freeze_header: bool = False
+    autofilter: Optional[str] = None
+
+    def head(self) -> bytes:
+        """Worksheet XML up to the first row."""
+        parts = [SHEET_START]
+        if self.freeze_header:
+            parts.append(FROZEN_HEADER)
+        if self.widths:
+            parts.append('<cols>')
+            parts.extend(
+                f'<col min="{i}" max="{i}" width="{width}" customWidth="1"/>'
+                for i, width in enumerate(self.widths, start=1)
+            )
+            parts.append('</cols>')
+        parts.append('<sheetData>')
+        return ''.join(parts).encode('utf-8')
+
+    def tail(self) -> bytes:
+        """Worksheet XML after the last row."""
+        autofilter = f'<autoFilter ref="{self.autofilter}"/>' if self.autofilter else ''
+        return f'</sheetData>{autofilter}</worksheet>'.encode('utf-8')
+
+
+def column_letter(index: int) -> str:
+    """Column letters of a 0-based column index (0 -> A, 26 -> AA)."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def excel_serial(value: datetime) -> float:
+    """Excel serial date (days since 1899-12-30) of a datetime."""
+    delta = value.replace(tzinfo=None) - EXCEL_EPOCH
+    return delta.days + (delta.seconds + delta.microseconds / 1e6) / 86400
+
+
+def clean_text(value: str) -> str:
+    """Escape text for XML, dropping characters XML 1.0 cannot hold."""
+    return escape(_ILLEGAL_XML.sub('', value))
+
+
+class SharedStrings:
+    """Shared strings table, filled while sheets are rendered."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def index(self, text: str) -> int:
+        """Index of `text`, adding it on first use."""
+        position = self._index.get(text)
+        if position is None:
+            position = self._index[text] = len(self.strings)
+            self.strings.append(text)
+        return position
+
+
+def render_cell(
+    ref: str,
+    value: Any,
+    style: int = 0,
+    strings: Optional[SharedStrings] = None
+) -> str:
+    """
+    Render one <c> element, formatted as ExcelGenerator formats cells.
+
+    Numbers take the report number format, datetimes the datetime
+    format, anything else is written as text.
+
+    Args:
+        ref: Cell reference, e.g. 'B3'
+        value: Cell value
+        style: Style index for text cells (STYLE_HEADER for headers)
+        strings: Shared strings table; inline strings when None
+
+    Returns:
+        str: XML of the cell, or '' for empty cells
+    """
+    if isinstance(value, bool):
+        return f'<c r="{ref}" s="{STYLE_NUMBER}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        if isinstance(value, float) and not math.isfinite(value):
+            return f'<c r="{ref}" s="{STYLE_NUMBER}" t="e"><v>#NUM!</v></c>'
+        return f'<c r="{ref}" s="{STYLE_NUMBER}"><v>{value!r}</v></c>'
+    if isinstance(value, datetime):
+        return f'<c r="{ref}" s="{STYLE_DATETIME}"><v>{excel_serial(value)!r}</v></c>'
+
+    text = str(value) if value is not None else ''
+    if not text:
+        return ''
+    style_attr = f' s="{style}"' if style else ''
+    if strings is not None:
+        return f'<c r="{ref}"{style_attr} t="s"><v>{strings.index(text)}</v></c>'
+    return (
+        f'<c r="{ref}"{style_attr} t="inlineStr"><is>'
+        f'<t xml:space="preserve">{clean_text(text)}</t></is></c>'
+    )
+
+
+def render_rows(
+    rows: Sequence[Sequence[Any]],
+    first_row: int = 1,
+    style: int = 0,
+    strings: Optional[SharedStrings] = None
+) -> bytes:
+    """
+    Render consecutive <row> elements of a worksheet.
+
+    A top-level function so blocks of rows can be rendered in worker
+    processes (without `strings`).
+
+    Args:
+        rows: Row values
+        first_row: 1-based row number of the first row
+        style: Style index for text cells
+        strings: Shared strings table; inline strings when None
+
+    Returns:
+        bytes: UTF-8 XML of the rows
+    """
+    letters: List[str] = []
+    parts = []
+    for number, row in enumerate(rows, start=first_row):
+        while len(letters) < len(row):
+            letters.append(column_letter(len(letters)))
+        cells = ''.join(
+            render_cell(f"{letters[i]}{number}", value, style, strings) for i, value in enumerate(row)
+        )
+        parts.append(f'<row r="{number}">{cells}</row>')
+    return ''.join(parts).encode('utf-8')
+
+
+def styles_xml(number_format: str) -> str:
+    """Stylesheet with the report number format."""
+    return STYLES_TEMPLATE.format(number_format=quoteattr(number_format))
+
+
+def _workbook_parts(titles: List[str]) -> List[Tuple[str, str]]:
+    """Fixed package parts for the given sheet titles."""
+    sheets = ''.join(
+        f'<sheet name={quoteattr(title)} sheetId="{i}" r:id="rId{i}"/>'
+        for i, title in enumerate(titles, start=1)
+    )
+    sheet_rels = ''.join(
+        f'<Relationship Id="rId{i}" Target="worksheets/sheet{i}.xml" '
+        f'Type="{REL_NS}/worksheet"/>'
+        for i in range(1, len(titles) + 1)
+    )
+    overrides = ''.join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, len(titles) + 1)
+    )
+    header = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    count = len(titles) + 1
+
+    return [
+        ('[Content_Types].xml', header +
+         '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+         '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+         '<Default Extension="xml" ContentType="application/xml"/>'
+         '<Override PartName="/xl/workbook.xml" ContentType="application/'
+         'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+         '<Override PartName="/xl/styles.xml" ContentType="application/'
+         'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+         '<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+         'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+         f'{overrides}</Types>'),
+        ('_rels/.rels', header +
+         f'<Relationships xmlns="{PKG_REL_NS}">'
+         f'<Relationship Id="rId1" Type="{REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+         '</Relationships>'),
+        ('xl/workbook.xml', header +
+         f'<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}"><sheets>{sheets}</sheets></workbook>'),
+        ('xl/_rels/workbook.xml.rels', header +
+         f'<Relationships xmlns="{PKG_REL_NS}">{sheet_rels}'
+         f'<Relationship Id="rId{count}" Target="styles.xml" Type="{REL_NS}/styles"/>'
+         f'<Relationship Id="rId{count + 1}" Target="sharedStrings.xml" '
+         f'Type="{REL_NS}/sharedStrings"/></Relationships>'),
+    ]
+
+
+def shared_strings_xml(strings: Sequence[str]) -> str:
+    """Shared strings part (empty when every string is inline)."""
+    items = ''.join(f'<si><t xml:space="preserve">{clean_text(s)}</t></si>' for s in strings)
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<sst xmlns="{MAIN_NS}" count="{len(strings)}" uniqueCount="{len(strings)}">'
+        f'{items}</sst>'
+    )
+
+
+def write_package(
+    file_path: Path,
+    sheets: Iterable[Tuple],
+    number_format: str,
+    shared_strings: Sequence[str] = ()
+) -> Path:
+    """
+    Assemble an xlsx file from rendered worksheet XML.
+
+    Worksheet bodies are streamed into the zip as they are produced, so
+    a sheet never has to be held as one string.
+
+    Args:
+        file_path: Output file path
+        sheets: (title, chunks) or (title, chunks, SheetLayout)
+            tuples; chunks are the sheet's <row> elements, in order
+        number_format: Report number format string
+        shared_strings: Strings referenced by index from the sheets;
+            read after the sheets are written, so it may be filled
+            while they render
+
+    Returns:
+        Path: Path to generated file
+
+    Raises:
+        PipelineError: If writing fails
+    """
+    file_path = Path(file_path)
+    titles = []
+    try:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for index, (title, chunks, *layout) in enumerate(sheets, start=1):
+                layout = layout[0] if layout else SheetLayout()
+                titles.append(title)
+                with zf.open(f'xl/worksheets/sheet{index}.xml', 'w') as part:
+                    part.write(layout.head())
+                    for chunk in chunks:
+                        part.write(chunk)
+                    part.write(layout.tail())
+
+            for name, content in _workbook_parts(titles):
+                zf.writestr(name, content)
+            zf.writestr('xl/styles.xml', styles_xml(number_format))
+            zf.writestr('xl/sharedStrings.xml', shared_strings_xml(shared_strings))
+    except Exception as e:
+        raise PipelineError(f"Failed to save Excel file: {e}") from e
+
+    return file_path
+
+
+class SheetWriter:
+    """
+    Worksheet whose rows are rendered as they arrive.
+
+    Rows are rendered a block at a time into a temporary file, in worker
+    processes when a pool is given (text inline) or here otherwise, and
+    the body is copied into the package when the workbook is saved.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        layout: Optional[SheetLayout] = None,
+        strings: Optional[SharedStrings] = None,
+        pool=None,
+        block_rows: int = STREAM_BLOCK_ROWS
+    ):
+        """
+        Initialize sheet.
+
+        Args:
+            title: Worksheet title
+            layout: Column widths, frozen header and autofilter; the
+                autofilter may be set until the workbook is saved
+            strings: Shared strings table; inline strings when None
+            pool: Optional executor rendering blocks in worker processes
+            block_rows: Rows per rendered block
+        """
+        self.title = title
+        self.layout = layout or SheetLayout()
+        self.strings = strings
+        self.pool = pool
+        self.block_rows = block_rows
+        self.rows = 0
+        self._block: List[Sequence[Any]] = []
+        self._pending: deque = deque()
+        self._body = tempfile.TemporaryFile()
+
+    def header(self, headers: Sequence[Any]) -> None:
+        """Write the bold header row; must precede every other row."""
+        self._body.write(render_rows([headers], 1, STYLE_HEADER, self.strings))
+        self.rows = 1
+
+    def append(self, row: Sequence[Any]) -> None:
+        """Add one row."""
+        self._block.append(row)
+        if len(self._block) >= self.block_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Render the buffered rows, keeping pooled blocks in row order."""
+        block, self._block = self._block, []
+        if block:
+            first_row = self.rows + 1
+            self.rows += len(block)
+            if self.pool is None:
+                self._body.write(render_rows(block, first_row, strings=self.strings))
+            else:
+                self._pending.append(self.pool.submit(render_rows, block, first_row))
+
+        while self._pending and (len(self._pending) > MAX_PENDING_BLOCKS or self._pending[0].done()):
+            self._body.write(self._pending.popleft().result())
+
+    def chunks(self) -> Iterator[bytes]:
+        """Rendered <row> elements of the whole sheet, in order."""
+        self._flush()
+        while self._pending:
+            self._body.write(self._pending.popleft().result())
+        self._body.seek(0)
+        while True:
+            chunk = self._body.read(COPY_CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self) -> None:
+        """Drop the temporary body."""
+        self._body.close()
+
+
+class WorkbookWriter:
+    """
+    Streamed worksheets saved as one xlsx package.
+
+    Several sheets can take rows at the same time; each keeps its body
+    in its own temporary file until save().
+    """
+
+    def __init__(self, number_format: str, pool=None, block_rows: int = STREAM_BLOCK_ROWS):
+        """
+        Initialize workbook.
+
+        Args:
+            number_format: Report number format string
+            pool: Optional executor rendering blocks in worker processes
+            block_rows: Rows per rendered block
+        """
+        self.number_format = number_format
+        self.pool = pool
+        self.block_rows = block_rows
+        # Worker processes cannot fill a shared table, so pooled text is inline
+        self.strings = SharedStrings() if pool is None else None
+        self.sheets: List[SheetWriter] = []
+
+    def add_sheet(self, title: str, layout: Optional[SheetLayout] = None) -> SheetWriter:
+        """Start a worksheet after the existing ones."""
+        sheet = SheetWriter(title, layout, self.strings, self.pool, self.block_rows)
+        self.sheets.append(sheet)
+        return sheet
+
+    def save(self, file_path: Path) -> Path:
+        """
+        Write the package and release the sheet bodies.
+
+        Raises:
+            PipelineError: If rendering or writing fails
+        """
+        try:
+            return write_package(
+                file_path,
+                ((sheet.title, sheet.chunks(), sheet.layout) for sheet in self.sheets),
+                self.number_format,
+                self.strings.strings if self.strings else ()
+            )
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Release the sheet bodies without saving."""
+        for sheet in self.sheets:
+            sheet.close()
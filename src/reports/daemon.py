@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+daemon.py
+=========
+Resident report service.
+
+Keeps database, FTP and SMTP connections open between reports, runs
+reports on cron-style schedules from [PROGRAMACION] and accepts ad-hoc
+commands (run, backfill, status, shutdown) as JSON lines on a local
+TCP socket.
+"""
+
+import json
+import socket
+import argparse
+import threading
+import socketserver
+from pathlib import Path
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any
+
+from loguru import logger
+
+from .processor import ReportProcessor, ProcessResult
+from .watcher import ArrivalWatcher
+from ..core.config import ConfigManager
+from ..core.exceptions import PipelineError
+from ..utils.reprocessor import ProcessResult as RangeResult
+from ..utils.scheduler import CronExpression
+
+
+DEFAULT_SOCKET = '127.0.0.1:8765'
+DATE_FORMAT = '%Y-%m-%d'
+
+
+@dataclass
+class ScheduledJob:
+    """A report run scheduled by a cron expression."""
+    name: str
+    cron: CronExpression
+    next_run: datetime
+
+
+def parse_address(address: str) -> tuple:
+    """Split 'host:port' into (host, port)."""
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def send_command(address: str, command: Dict[str, Any], timeout: float = 3600) -> Dict[str, Any]:
+    """
+    Send one command to a running daemon and wait for its reply.
+
+    Args:
+        address: Daemon socket as 'host:port'
+        command: Command, e.g. {'command': 'run', 'date': '2025-01-15'}
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        Reply of the daemon
+    """
+    with socket.create_connection(parse_address(address), timeout=timeout) as conn:
+        conn.sendall(json.dumps(command).encode('utf-8') + b'\n')
+        reply = conn.makefile('rb').readline()
+    return json.loads(reply)
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON command per line and writes one JSON reply."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                reply = self.server.daemon.handle_command(json.loads(line))
+            except Exception as e:
+                reply = {'ok': False, 'error': str(e)}
+            self.wfile.write(json.dumps(reply, default=str).encode('utf-8') + b'\n')
+
+
+class _CommandServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ReportDaemon:
+    """
+    Long-running report service with warm connections.
+
+    Reports run one at a time on a single worker thread, whether they
+    come from the schedule or the socket, so the shared connections are
+    never used concurrently.
+
+    Settings in [DAEMON]: ``socket`` (host:port, local only by default),
+    ``directorio_salida``, ``archivo`` (file name pattern with {fecha})
+    and ``desfase_dias`` (scheduled runs report on today minus this many
+    days, 1 by default). Each key of [PROGRAMACION] is a job name whose
+    value is a cron expression. With [VIGILANCIA] habilitado, scheduled
+    runs wait for the day's data to land (see ArrivalWatcher) instead of
+    reporting no data.
+    """
+
+    def __init__(self, config: ConfigManager, processor: ReportProcessor):
+        """
+        Initialize daemon.
+
+        Args:
+            config: Configuration manager instance
+            processor: Report processor whose managers stay connected
+
+        Raises:
+            ConfigurationError: If a schedule expression is invalid
+        """
+        self.config = config
+        self.processor = processor
+        self.address = config.get('DAEMON', 'socket', default=DEFAULT_SOCKET)
+        self.output_dir = Path(config.get('DAEMON', 'directorio_salida', default='output'))
+        self.filename = config.get('DAEMON', 'archivo', default='reporte_{fecha}.{formato}')
+        self.offset_days = config.getint('DAEMON', 'desfase_dias', default=1)
+
+        now = datetime.now()
+        self.jobs: List[ScheduledJob] = []
+        for name, expression in config.items('PROGRAMACION').items():
+            cron = CronExpression(expression)
+            self.jobs.append(ScheduledJob(name, cron, cron.next_after(now)))
+
+        self.watcher: Optional[ArrivalWatcher] = None
+        if config.getboolean('VIGILANCIA', 'habilitado', default=False):
+            self.watcher = ArrivalWatcher(config, processor)
+
+        self.started_at: Optional[datetime] = None
+        self.reports_run = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='report')
+        self._stop = threading.Event()
+        self._server: Optional[_CommandServer] = None
+
+    def warm_up(self) -> None:
+        """Open the connections kept for the daemon's lifetime."""
+        self.processor.db.ensure_connected()
+        if self.processor.ftp is not None:
+            self.processor.ftp.keep_alive = True
+        if self.processor.email is not None:
+            self.processor.email.keep_alive = True
+
+    def output_path(self, date: datetime) -> Path:
+        """Output file of a report date."""
+        return self.output_dir / self.filename.format(
+            fecha=date.strftime('%Y%m%d'), formato=self.processor.output_formats[0]
+        )
+
+    def _run(self, date: datetime, wait: bool = False, **options) -> ProcessResult:
+        """Run one report on the worker thread, optionally waiting for its data."""
+        self.processor.db.ensure_connected()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if wait and self.watcher is not None:
+            result = self.watcher.watch(date, self.output_path(date), **options)
+        else:
+            result = self.processor.process(date, self.output_path(date), **options)
+        self.reports_run += 1
+        logger.info(
+            f"Report {date:%Y-%m-%d}: success={result.success} "
+            f"records={result.records_processed} {result.reason or result.error or ''}"
+        )
+        return result
+
+    def _backfill(self, start: datetime, end: datetime, **options) -> RangeResult:
+        """Run a date range on the worker thread."""
+        if start > end:
+            raise PipelineError("Start date must be <= end date")
+
+        dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        self.processor.db.ensure_connected()
+        try:
+            self.processor.prefetch_availability(dates)
+        except PipelineError:
+            pass
+
+        successful = failed = 0
+        for date in dates:
+            if self._run(date, **options).success:
+                successful += 1
+            else:
+                failed += 1
+        return RangeResult(total=len(dates), successful=successful, failed=failed, skipped=0)
+
+    def run_report(self, date: datetime, **options) -> ProcessResult:
+        """
+        Run one report and wait for it.
+
+        Args:
+            date: Report date
+            **options: upload_ftp / send_email flags for process()
+
+        Returns:
+            ProcessResult
+        """
+        return self._executor.submit(self._run, date, **options).result()
+
+    def backfill(self, start: datetime, end: datetime, **options) -> RangeResult:
+        """
+        Run a date range and wait for it.
+
+        Args:
+            start: First date (inclusive)
+            end: Last date (inclusive)
+            **options: upload_ftp / send_email flags for process()
+
+        Returns:
+            Range statistics
+        """
+        return self._executor.submit(self._backfill, start, end, **options).result()
+
+    def handle_command(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute a socket command.
+
+        Commands: {"command": "run", "date": "YYYY-MM-DD"},
+        {"command": "backfill", "start": ..., "end": ...},
+        {"command": "status"} and {"command": "shutdown"}. run and
+        backfill accept "upload_ftp" and "send_email" booleans.
+
+        Returns:
+            Reply with "ok" and command-specific fields
+        """
+        name = command.get('command')
+        options = {k: bool(command[k]) for k in ('upload_ftp', 'send_email') if k in command}
+
+        if name == 'run':
+            result = self.run_report(datetime.strptime(command['date'], DATE_FORMAT), **options)
+            return {
+                'ok': result.success,
+                'records': result.records_processed,
+                'file': str(result.file_generated) if result.file_generated else None,
+                'skipped': result.skipped,
+                'error': result.error or result.reason,
+            }
+
+        if name == 'backfill':
+            result = self.backfill(
+                datetime.strptime(command['start'], DATE_FORMAT),
+                datetime.strptime(command['end'], DATE_FORMAT),
+                **options
+            )
+            return {'ok': result.failed == 0, 'total': result.total,
+                    'successful': result.successful, 'failed': result.failed}
+
+        if name == 'status':
+            return {
+                'ok': True,
+                'started_at': self.started_at,
+                'reports_run': self.reports_run,
+                'jobs': {job.name: job.next_run for job in self.jobs},
+            }
+
+        if name == 'shutdown':
+            self.stop()
+            return {'ok': True}
+
+        return {'ok': False, 'error': f"Unknown command: {name}"}
+
+    def run_due_jobs(self, now: datetime) -> int:
+        """
+        Submit scheduled jobs whose time has come.
+
+        Args:
+            now: Current time
+
+        Returns:
+            int: Number of jobs submitted
+        """
+        submitted = 0
+        for job in self.jobs:
+            if job.next_run <= now:
+                date = datetime(now.year, now.month, now.day) - timedelta(days=self.offset_days)
+                logger.info(f"Scheduled job {job.name} for {date:%Y-%m-%d}")
+                self._executor.submit(self._run, date, wait=True)
+                job.next_run = job.cron.next_after(now)
+                submitted += 1
+        return submitted
+
+    def start(self) -> None:
+        """Warm up connections and start listening on the socket."""
+        self.warm_up()
+        self._server = _CommandServer(parse_address(self.address), _CommandHandler)
+        self._server.daemon = self
+        host, port = self._server.server_address[:2]
+        self.address = f"{host}:{port}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.started_at = datetime.now()
+        logger.info(f"Daemon listening on {self.address} with {len(self.jobs)} scheduled job(s)")
+
+    def serve_forever(self, tick_seconds: float = 1.0) -> None:
+        """
+        Run until a shutdown command arrives or stop() is called.
+
+        Args:
+            tick_seconds: How often to check the schedule
+        """
+        if self._server is None:
+            self.start()
+        try:
+            while not self._stop.wait(tick_seconds):
+                self.run_due_jobs(datetime.now())
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        """Ask serve_forever() to return."""
+        self._stop.set()
+        if self.watcher is not None:
+            self.watcher.stop()
+
+    def close(self) -> None:
+        """Stop the socket, wait for running reports and close connections."""
+        if self.watcher is not None:
+            self.watcher.stop()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self._executor.shutdown(wait=True)
+
+        if self.processor.ftp is not None:
+            self.processor.ftp.disconnect()
+        if self.processor.email is not None:
+            self.processor.email.close()
+        self.processor.db.disconnect()
+
+
+def main(argv=None) -> int:
+    """Start the daemon from a configuration file."""
+    parser = argparse.ArgumentParser(description="Resident report service")
+    parser.add_argument('--config', default='config.ini', help="Configuration file")
+    args = parser.parse_args(argv)
+
+    config = ConfigManager(args.config)
+    ReportDaemon(config, ReportProcessor.from_config(config)).serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -17,19 +17,34 @@ Version: 1.0
 Python: 3.8+
 """
 
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Any
-from dataclasses import dataclass
+from typing import Optional, List, Any, Tuple, Dict, Iterable, Iterator, Callable
+from dataclasses import dataclass, field
 
 from ..core.config import ConfigManager
 from ..core.database import DatabaseManager
 from ..core.email import EmailManager
-from ..core.excel import ExcelGenerator
+from ..core.excel import ExcelGenerator, SplitPolicy
+from ..core.text import TextGenerator
+from ..core.parquet import ParquetGenerator
+from ..core.tee import RowTee
 from ..core.ftp import FTPManager
+from ..core.dedup import DeliveryLedger, ContentHasher
+from ..core.snapshot import SnapshotCache, FINGERPRINT_KEY
+from ..core.summary import SummaryStage, ReportSummary
+from ..core.diff import DiffStage, DiffResult
+from ..core.spill import MemoryBudget, SpillBuffer
+from ..core.partition import PartitionedExtractor
+from ..core.instrumentation import StageTimer
 from ..core.exceptions import PipelineError
 
 
+REPORT_QUERY = "SELECT * FROM reports WHERE report_date = :date"
+SUMMARY_BATCH_SIZE = 10000
+OUTPUT_FORMATS = ('xlsx', 'csv', 'parquet')
+
 @dataclass
 class ProcessResult:
     """Result of report processing."""
@@ -37,6 +52,13 @@ class ProcessResult:
     records_processed: int
     file_generated: Optional[Path] = None
     error: Optional[str] = None
+    skipped: bool = False
+    reason: Optional[str] = None
+    source_fingerprint: Optional[str] = None
+    content_hash: Optional[str] = None
+    summary: Optional[ReportSummary] = None
+    files: List[Path] = field(default_factory=list)
+    diff: Optional[DiffResult] = None
 
 
 class ReportProcessor:
@@ -48,7 +70,15 @@ class ReportProcessor:
         db_manager: DatabaseManager,
         email_manager: EmailManager,
         excel_generator: ExcelGenerator,
-        ftp_manager: Optional[FTPManager] = None
+        ftp_manager: Optional[FTPManager] = None,
+        ledger: Optional[DeliveryLedger] = None,
+        snapshots: Optional[SnapshotCache] = None,
+        summary: Optional[SummaryStage] = None,
+        partitioner: Optional[PartitionedExtractor] = None,
+        text_generator: Optional[TextGenerator] = None,
+        parquet_generator: Optional[ParquetGenerator] = None,
+        diff: Optional[DiffStage] = None,
+        memory: Optional[MemoryBudget] = None
     ):
         """
         Initialize report processor.
@@ -59,13 +89,93 @@ class ReportProcessor:
             email_manager: Email manager
             excel_generator: Excel generator
             ftp_manager: Optional FTP manager
+            ledger: Optional delivery ledger to skip unchanged reports
+            snapshots: Optional snapshot cache of extracted data
+            summary: Optional summary stage computing report totals
+            partitioner: Optional extractor fetching the day in parallel chunks
+            text_generator: Optional CSV writer, used when [REPORTE] formato
+                includes csv
+            parquet_generator: Optional Parquet writer, used when [REPORTE]
+                formato includes parquet
+            diff: Optional stage comparing the day with the previous cached
+                snapshot
+            memory: Optional memory budget; prepared rows past it spill to
+                disk
         """
         self.config = config
         self.db = db_manager
         self.email = email_manager
         self.excel = excel_generator
         self.ftp = ftp_manager
+        self.ledger = ledger
+        self.snapshots = snapshots
+        self.summary = summary
+        self.partitioner = partitioner
+        self.diff = diff
+        self.memory = memory
+        self.last_diff: Optional[DiffResult] = None
+        self.text = text_generator or TextGenerator()
+        self.parquet = parquet_generator or ParquetGenerator()
+        self.timer = StageTimer()
+        self.last_columns: List[str] = []
+        self._availability: Dict[Any, int] = {}
+        self._source_counts: Dict[Any, int] = {}
         self.dry_run = config.getboolean('MODO', 'dry_run', default=False)
+        self.report_name = config.get('REPORTE', 'nombre', default='reporte')
+        # Comma-separated formats are written together from one extraction
+        self.output_format = config.get('REPORTE', 'formato', default='xlsx')
+        self.tee_buffer_batches = config.getint('REPORTE', 'lotes_en_cola', default=4)
+        self.tee_batch_size = config.getint('REPORTE', 'filas_por_lote', default=1000)
+        self.split_policy: Optional[SplitPolicy] = None
+        if config.getboolean('DIVISION', 'habilitado', default=False):
+            self.split_policy = SplitPolicy.from_config(config)
+        self.last_files: List[Path] = []
+        # Incremental refreshes merge into the cached snapshot, so they need one
+        self.incremental = bool(snapshots) and config.getboolean(
+            'INCREMENTAL', 'habilitado', default=False
+        )
+        if self.incremental:
+            self.watermark_column = config.get('INCREMENTAL', 'columna_marca', default='LAST_MODIFIED')
+            self.key_columns = [
+                c.strip() for c in config.get('INCREMENTAL', 'columna_clave', default='ID').split(',')
+            ]
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> 'ReportProcessor':
+        """
+        Build a processor with every component configured in config.
+
+        Optional stages (ledger, snapshot cache, summary, partitioned
+        extraction) are always created and stay inactive unless enabled
+        in their configuration section.
+
+        Args:
+            config: Configuration manager
+
+        Returns:
+            ReportProcessor: Processor with unconnected managers
+        """
+        return cls(
+            config,
+            DatabaseManager(config),
+            EmailManager(config),
+            ExcelGenerator(config),
+            FTPManager(config),
+            ledger=DeliveryLedger(config),
+            snapshots=SnapshotCache(config),
+            summary=SummaryStage(config),
+            partitioner=PartitionedExtractor(config),
+            text_generator=TextGenerator(config),
+            parquet_generator=ParquetGenerator(config),
+            diff=DiffStage(config),
+            memory=MemoryBudget(config)
+        )
+
+    @property
+    def output_formats(self) -> List[str]:
+        """Output formats of output_format, in order."""
+        formats = str(self.output_format).split(',')
+        return list(dict.fromkeys(f.strip().lower() for f in formats if f.strip())) or ['xlsx']
 
     def check_data_exists(self, date: datetime) -> bool:
         """
@@ -80,25 +190,202 @@ class ReportProcessor:
         Raises:
             PipelineError: If check fails
         """
+        prefetched = self._availability.pop(date.date(), None)
+        if prefetched is not None:
+            self._source_counts[date.date()] = prefetched
+            return prefetched > 0
+
         try:
             exists, count = self.db.check_data_exists(date)
+            self._source_counts[date.date()] = count
             return exists
         except Exception as e:
             raise PipelineError(f"Failed to check data: {e}") from e
 
+    def prefetch_availability(self, dates: Iterable[datetime]) -> None:
+        """
+        Probe data availability of several dates with one query.
+
+        Each prefetched count answers the next check_data_exists call
+        for its date once; later calls query the database again.
+
+        Args:
+            dates: Dates about to be processed
+
+        Raises:
+            PipelineError: If the probe fails
+        """
+        try:
+            self._availability.update(self.db.check_data_exists_many(dates))
+        except Exception as e:
+            raise PipelineError(f"Failed to check data: {e}") from e
+
+    def extract(self, date: datetime, fingerprint: Optional[str] = None) -> List[Tuple]:
+        """
+        Extract report rows, from the snapshot cache when possible.
+
+        Args:
+            date: Report date
+            fingerprint: Optional source fingerprint; a cached snapshot
+                stored with a different fingerprint is discarded
+
+        Returns:
+            List of row tuples
+        """
+        use_cache = bool(self.snapshots and self.snapshots.enabled)
+
+        if use_cache and self.incremental:
+            table = self.snapshots.get(self.report_name, date)
+            if table is not None:
+                rows = self._refresh_snapshot(date, table, fingerprint)
+                if rows is not None:
+                    return rows
+        elif use_cache:
+            table = self.snapshots.get(self.report_name, date, fingerprint)
+            if table is not None:
+                self.last_columns = table.column_names
+                return SnapshotCache.table_rows(table)
+
+        if self.partitioner and self.partitioner.enabled:
+            results = self.partitioner.fetch(REPORT_QUERY, {'date': date}, date)
+            self.last_columns = self.partitioner.column_names
+        else:
+            results = self.db.execute_query(REPORT_QUERY, {'date': date})
+            self.last_columns = self.db.get_column_names()
+
+        if results and use_cache:
+            table = SnapshotCache.table_from_rows(results, self.last_columns)
+            metadata = None
+            if self.incremental:
+                metadata = {'watermark': SnapshotCache.max_watermark(table, self.watermark_column)}
+            self.snapshots.put_table(self.report_name, date, table, fingerprint, metadata)
+
+        return results
+
+    def extract_batches(
+        self,
+        date: datetime,
+        fingerprint: Optional[str] = None
+    ) -> Iterator[List[Tuple]]:
+        """
+        Extract report rows batch by batch.
+
+        Without a snapshot cache or partitioner the rows are streamed from
+        the cursor, so the full result is never held in memory. Otherwise
+        they come from extract(), which needs every row to store the
+        snapshot or merge the partitions.
+
+        Args:
+            date: Report date
+            fingerprint: Optional source fingerprint (see extract)
+
+        Yields:
+            Lists of row tuples
+        """
+        if ((self.snapshots and self.snapshots.enabled)
+                or (self.partitioner and self.partitioner.enabled)):
+            results = self.extract(date, fingerprint)
+            for start in range(0, len(results), SUMMARY_BATCH_SIZE):
+                yield results[start:start + SUMMARY_BATCH_SIZE]
+            return
+
+        self.last_columns = []
+        for batch in self.db.iter_query(REPORT_QUERY, {'date': date}):
+            if not self.last_columns:
+                self.last_columns = self.db.get_column_names()
+            yield batch
+
+    def _timed(self, stage: str, iterator: Iterable[Any]) -> Iterator[Any]:
+        """Yield from an iterator, adding the time spent in it to a stage."""
+        iterator = iter(iterator)
+        seconds = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    seconds += time.perf_counter() - start
+                yield item
+        finally:
+            self.timer.add(stage, seconds)
+
+    def _refresh_snapshot(
+        self,
+        date: datetime,
+        table,
+        fingerprint: Optional[str]
+    ) -> Optional[List[Tuple]]:
+        """
+        Fetch rows at or past the snapshot watermark and merge them in.
+
+        Rows at the watermark come back every time and are deduplicated by
+        key, so only rows not already in the snapshot count as updates.
+        Deleted rows never show up past the watermark, so a changed
+        fingerprint without updates, or a merged snapshot whose size
+        differs from the source row count, invalidates the snapshot.
+
+        Args:
+            date: Report date
+            table: Cached snapshot for the date
+            fingerprint: Current source fingerprint
+
+        Returns:
+            List of row tuples of the merged snapshot, or None if the
+            snapshot was invalidated and a full extraction is needed
+        """
+        watermark = SnapshotCache.read_watermark(table)
+        delta = self.db.fetch_since(
+            REPORT_QUERY, {'date': date}, self.watermark_column, watermark
+        )
+
+        updated = False
+        if delta:
+            delta_table = SnapshotCache.table_from_rows(delta, self.db.get_column_names())
+            if watermark is None:
+                table = delta_table
+                updated = True
+            else:
+                known = set(SnapshotCache.table_rows(table))
+                updated = any(row not in known for row in SnapshotCache.table_rows(delta_table))
+                table = SnapshotCache.merge(table, delta_table, self.key_columns)
+
+        stored = (table.schema.metadata or {}).get(FINGERPRINT_KEY)
+        changed = bool(fingerprint) and (stored or b'').decode('utf-8') != fingerprint
+        source_count = self._source_counts.pop(date.date(), None)
+        if (changed and not updated) or (source_count is not None and source_count != table.num_rows):
+            self.snapshots.invalidate(self.report_name, date)
+            return None
+
+        if updated or changed:
+            self.snapshots.put_table(
+                self.report_name,
+                date,
+                table,
+                fingerprint,
+                {'watermark': SnapshotCache.max_watermark(table, self.watermark_column)}
+            )
+
+        self.last_columns = table.column_names
+        return SnapshotCache.table_rows(table)
+
     def generate_report(
         self,
         date: datetime,
         output_path: Path,
-        headers: Optional[List[str]] = None
+        headers: Optional[List[str]] = None,
+        fingerprint: Optional[str] = None
     ) -> int:
         """
-        Generate report file from database.
+        Generate report file from database or cached snapshot.
         
         Args:
             date: Report date
             output_path: Where to save the file
             headers: Optional column headers
+            fingerprint: Optional source fingerprint to validate snapshot
             
         Returns:
             int: Number of records processed
@@ -106,23 +393,299 @@ class ReportProcessor:
         Raises:
             PipelineError: If generation fails
         """
+        count, _, _ = self._generate(date, output_path, headers, fingerprint)
+        return count
+
+    def _generate(
+        self,
+        date: datetime,
+        output_path: Path,
+        headers: Optional[List[str]] = None,
+        fingerprint: Optional[str] = None,
+        with_hash: bool = False
+    ) -> Tuple[int, Optional[str], Optional[ReportSummary]]:
+        """
+        Generate report file, optionally hashing and summarizing its rows.
+
+        Rows are hashed and folded into the summary in batches while they
+        are copied for the writer, so neither needs a second pass. With a
+        memory budget the rows are streamed from extract_batches straight
+        into a buffer that spills to disk past the budget, and streamed
+        to the writers from there; the ``prepare`` stage then includes
+        the fetch time also reported as ``extract``.
+
+        Returns:
+            Tuple of (records, content_hash, summary)
+        """
+        self.last_files = [Path(output_path)]
+        self.last_diff = None
         if self.dry_run:
-            return 0
+            return 0, None, None
         
+        store = None
         try:
-            query = "SELECT * FROM reports WHERE report_date = :date"
-            results = self.db.execute_query(query, {'date': date})
-            
-            if not results:
-                return 0
-            
-            data = [list(row) for row in results]
-            self.excel.generate_excel(data, output_path, headers)
+            if self.memory and self.memory.enabled:
+                store = self.memory.buffer()
+                batches = self._timed('extract', self.extract_batches(date, fingerprint))
+            else:
+                with self.timer.stage('extract'):
+                    results = self.extract(date, fingerprint)
+                if not results:
+                    return 0, None, None
+                batches = (
+                    results[start:start + SUMMARY_BATCH_SIZE]
+                    for start in range(0, len(results), SUMMARY_BATCH_SIZE)
+                )
+
+            hasher = ContentHasher() if with_hash else None
+            summarize = bool(self.summary and self.summary.enabled)
+
+            data = store if store is not None else []
+            with self.timer.stage('prepare'):
+                for index, batch in enumerate(batches):
+                    if summarize and index == 0:
+                        self.summary.begin(self.last_columns)
+                    if hasher:
+                        hasher.update_many(batch)
+                    if summarize:
+                        self.summary.update(batch)
+                    data.extend(list(row) for row in batch)
+
+                count = len(data)
+                if not count:
+                    return 0, None, None
+                summary = self.summary.finish() if summarize else None
+                if hasher:
+                    hasher.update(self._output_settings(headers))
+
+            if store is not None:
+                with self.timer.stage('sort'):
+                    data = self._ordered_rows(store)
+
+            if self.diff and self.diff.enabled:
+                with self.timer.stage('diff'):
+                    self.last_diff = self.compare_previous(date)
+
+            formats = self.output_formats
+            with self.timer.stage('write'):
+                if self.last_diff and self.diff.only_changes:
+                    self.last_files = []
+                elif len(formats) > 1:
+                    self.last_files = self._write_formats(formats, data, output_path, headers, summary)
+                elif formats[0] == 'csv':
+                    self.text.generate_csv(data, output_path, headers)
+                elif formats[0] == 'parquet':
+                    self.parquet.generate_parquet(data, output_path, headers or self.last_columns)
+                elif self.split_policy:
+                    self.last_files = self.excel.generate_excel_stream(
+                        data, output_path, headers,
+                        policy=self.split_policy, column_names=self.last_columns,
+                        extra_sheets=self._summary_sheets(summary)
+                    )
+                elif not isinstance(data, list):
+                    self.excel.generate_excel_stream(
+                        data, output_path, headers, extra_sheets=self._summary_sheets(summary)
+                    )
+                elif summary and self.summary.summary_sheet:
+                    summary_headers, summary_rows = summary.to_sheet()
+                    self.excel.generate_excel_sheets(
+                        [("Reporte", data, headers), ("Resumen", summary_rows, summary_headers)],
+                        output_path
+                    )
+                else:
+                    self.excel.generate_excel(data, output_path, headers)
+
+                if self.last_diff:
+                    self.last_files.append(self._write_diff(self.last_diff, output_path))
             
-            return len(data)
+            return count, hasher.hexdigest() if hasher else None, summary
             
         except Exception as e:
             raise PipelineError(f"Report generation failed: {e}") from e
+        finally:
+            if store is not None:
+                store.close()
+
+    def _output_settings(self, headers: Optional[List[str]]) -> Tuple:
+        """Settings that change the output files even when the rows do not."""
+        settings = (list(headers or []), self.last_columns, self.output_formats, self.split_policy)
+        if isinstance(self.excel, ExcelGenerator):
+            settings += (self.excel.layout, self.excel.number_format, self.excel.decimals)
+        return settings
+
+    def _summary_sheets(
+        self,
+        summary: Optional[ReportSummary]
+    ) -> List[Tuple[str, List[List[Any]], List[str]]]:
+        """The [RESUMEN] summary sheet to add to a workbook, if enabled."""
+        if not (summary and self.summary.summary_sheet):
+            return []
+        summary_headers, summary_rows = summary.to_sheet()
+        return [("Resumen", summary_rows, summary_headers)]
+
+    def _ordered_rows(self, store: SpillBuffer) -> Iterable[List[Any]]:
+        """
+        Rows of a buffer in report order.
+
+        A list while the rows fit the budget, otherwise an iterator over
+        the spill file (externally sorted when [REPORTE] ordenar_por is set).
+        """
+        if self.memory.sort_by:
+            key = self.memory.sort_key(self.last_columns)
+            if not store.spilled:
+                store.rows.sort(key=key, reverse=self.memory.descending)
+                return store.rows
+            return store.sorted(key, reverse=self.memory.descending)
+        return store.rows if not store.spilled else iter(store)
+
+    def compare_previous(self, date: datetime) -> Optional[DiffResult]:
+        """
+        Compare the day's cached snapshot with the latest earlier one.
+
+        Args:
+            date: Report date
+
+        Returns:
+            DiffResult or None if either snapshot is not cached
+        """
+        if not (self.snapshots and self.snapshots.enabled):
+            return None
+        previous_date = self.snapshots.previous_date(self.report_name, date)
+        if previous_date is None:
+            return None
+        previous = self.snapshots.get(self.report_name, previous_date)
+        current = self.snapshots.get(self.report_name, date)
+        if previous is None or current is None:
+            return None
+        return self.diff.compare(previous, current, previous_date)
+
+    def _write_diff(self, diff: DiffResult, output_path: Path) -> Path:
+        """
+        Write the difference report in the first output format.
+
+        It replaces the full report when [DIFERENCIAL] modo is solo and
+        is written next to it, with a ``_cambios`` suffix, otherwise.
+        """
+        output_path = Path(output_path)
+        formats = self.output_formats
+        output_format = formats[0]
+        if len(formats) > 1:
+            output_path = output_path.with_suffix(f'.{output_format}')
+        if not self.diff.only_changes:
+            output_path = output_path.with_name(f"{output_path.stem}_cambios{output_path.suffix}")
+
+        if output_format == 'csv':
+            return self.text.generate_csv(diff.rows, output_path, diff.headers)
+        if output_format == 'parquet':
+            return self.parquet.generate_parquet(diff.rows, output_path, diff.headers)
+        return self.excel.generate_excel(diff.rows, output_path, diff.headers, "Cambios")
+
+    def _format_writer(
+        self,
+        output_format: str,
+        path: Path,
+        headers: Optional[List[str]],
+        summary: Optional[ReportSummary]
+    ) -> Callable[[Iterable[List[Any]]], Any]:
+        """
+        Writer consuming a row stream into one output format.
+
+        Workbooks are streamed with the configured Excel engine and get
+        the summary sheet after the rows, so no writer holds the rows.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise PipelineError(f"Unknown output format: {output_format}")
+        if output_format == 'csv':
+            return lambda rows: self.text.generate_csv(rows, path, headers)
+        if output_format == 'parquet':
+            return lambda rows: self.parquet.generate_parquet(rows, path, headers or self.last_columns)
+        return lambda rows: self.excel.generate_excel_stream(
+            rows, path, headers, policy=self.split_policy, column_names=self.last_columns,
+            extra_sheets=self._summary_sheets(summary)
+        )
+
+    def _write_formats(
+        self,
+        formats: List[str],
+        data: Iterable[List[Any]],
+        output_path: Path,
+        headers: Optional[List[str]] = None,
+        summary: Optional[ReportSummary] = None
+    ) -> List[Path]:
+        """
+        Write every format from one pass over the rows.
+
+        Each format is written by its own thread through a RowTee; files
+        are named after output_path with the format's extension, and the
+        time of each writer is recorded as a ``write.<format>`` stage.
+
+        Returns:
+            List of generated file paths, in format order
+        """
+        output_path = Path(output_path)
+        writers = {
+            output_format: self._format_writer(
+                output_format, output_path.with_suffix(f'.{output_format}'), headers, summary
+            )
+            for output_format in formats
+        }
+        tee = RowTee(self.tee_buffer_batches, self.tee_batch_size)
+        for output_format, writer in writers.items():
+            tee.add(output_format, writer)
+
+        results = tee.run(data)
+        for output_format, seconds in tee.timings.items():
+            self.timer.add(f'write.{output_format}', seconds)
+
+        files = []
+        for output_format in formats:
+            result = results[output_format]
+            files.extend(result if isinstance(result, list) else [Path(result)])
+        return files
+
+    def generate_parts(
+        self,
+        date: datetime,
+        output_path: Path,
+        headers: Optional[List[str]] = None
+    ) -> List[Path]:
+        """
+        Generate one file per extraction partition.
+
+        Files are named after output_path with a ``_parteN`` suffix;
+        partitions without rows produce no file.
+
+        Args:
+            date: Report date
+            output_path: Base path of the files
+            headers: Optional column headers
+
+        Returns:
+            List of generated file paths
+
+        Raises:
+            PipelineError: If no partitioner is enabled or generation fails
+        """
+        if not (self.partitioner and self.partitioner.enabled):
+            raise PipelineError("Partitioned output requires an enabled partitioner")
+
+        output_path = Path(output_path)
+        generated = []
+
+        try:
+            parts = self.partitioner.fetch_parts(REPORT_QUERY, {'date': date}, date)
+            for index, rows in enumerate(parts, start=1):
+                if not rows:
+                    continue
+                part_path = output_path.with_name(
+                    f"{output_path.stem}_parte{index}{output_path.suffix}"
+                )
+                self.excel.generate_excel([list(row) for row in rows], part_path, headers)
+                generated.append(part_path)
+        except Exception as e:
+            raise PipelineError(f"Partitioned generation failed: {e}") from e
+
+        return generated
 
     def process(
         self,
@@ -147,17 +710,49 @@ class ReportProcessor:
         """
         try:
             # Check data exists
-            if not self.check_data_exists(date):
+            with self.timer.stage('check'):
+                exists = self.check_data_exists(date)
+            if not exists:
                 if send_email and not self.dry_run:
-                    self.email.notify_no_data(date)
+                    with self.timer.stage('email'):
+                        self.email.notify_no_data(date)
                 return ProcessResult(
                     success=False,
                     records_processed=0,
                     error="No data available"
                 )
             
+            # Skip regeneration when source data did not change
+            dedup = bool(self.ledger and self.ledger.enabled and not self.dry_run)
+            channels = [name for name, wanted in (
+                ('ftp', upload_ftp and self.ftp), ('email', send_email)
+            ) if wanted]
+            cached = bool(self.snapshots and self.snapshots.enabled and not self.dry_run)
+            fingerprint = None
+            previous = None
+            if dedup or cached:
+                with self.timer.stage('fingerprint'):
+                    fingerprint = self.db.get_source_fingerprint(date)
+            if dedup:
+                previous = self.ledger.get(date, output_path)
+                if (previous and previous.source_fingerprint == fingerprint
+                        and previous.covers(channels) and previous.files_exist(output_path)):
+                    self.last_files = [Path(f) for f in previous.files or [output_path]]
+                    return ProcessResult(
+                        success=True,
+                        records_processed=previous.records,
+                        file_generated=self.last_files[0],
+                        skipped=True,
+                        reason="Source data unchanged",
+                        source_fingerprint=fingerprint,
+                        content_hash=previous.content_hash,
+                        files=list(self.last_files)
+                    )
+
             # Generate report
-            count = self.generate_report(date, output_path, headers)
+            count, content_hash, summary = self._generate(
+                date, output_path, headers, fingerprint, with_hash=dedup
+            )
             
             if count == 0:
                 return ProcessResult(
@@ -165,33 +760,74 @@ class ReportProcessor:
                     records_processed=0,
                     error="No records generated"
                 )
+
+            # Skip delivery when regenerated content is identical
+            if (dedup and previous and previous.content_hash == content_hash
+                    and previous.covers(channels)):
+                self.ledger.record(
+                    date, output_path, fingerprint, content_hash, count,
+                    channels=previous.channels, files=self.last_files
+                )
+                return ProcessResult(
+                    success=True,
+                    records_processed=count,
+                    file_generated=self.last_files[0],
+                    skipped=True,
+                    reason="Output unchanged",
+                    source_fingerprint=fingerprint,
+                    content_hash=content_hash,
+                    summary=summary,
+                    files=list(self.last_files)
+                )
             
             # Upload to FTP
+            delivered = []
             if upload_ftp and self.ftp and not self.dry_run:
                 try:
-                    with self.ftp as ftp_conn:
-                        ftp_conn.upload_file(output_path)
+                    with self.timer.stage('ftp'), self.ftp as ftp_conn:
+                        for path in self.last_files:
+                            ftp_conn.upload_file(path)
+                    delivered.append('ftp')
                 except Exception as e:
                     # Continue even if FTP fails
                     pass
             
             # Send success email
             if send_email and not self.dry_run:
-                self.email.notify_success(date, output_path)
+                with self.timer.stage('email'):
+                    self.email.notify_success(
+                        date,
+                        self.last_files[0],
+                        total_amount=summary.total_amount if summary else None
+                    )
+                delivered.append('email')
+
+            # Only a delivery that actually went out may suppress the next one
+            if dedup and delivered:
+                self.ledger.record(
+                    date, output_path, fingerprint, content_hash, count,
+                    channels=delivered, files=self.last_files
+                )
             
             return ProcessResult(
                 success=True,
                 records_processed=count,
-                file_generated=output_path
+                file_generated=self.last_files[0],
+                source_fingerprint=fingerprint,
+                content_hash=content_hash,
+                summary=summary,
+                files=list(self.last_files),
+                diff=self.last_diff
             )
             
         except Exception as e:
             # Send error email
             if send_email and not self.dry_run:
-                self.email.notify_error(e, date)
+                with self.timer.stage('email'):
+                    self.email.notify_error(e, date)
             
             return ProcessResult(
                 success=False,
                 records_processed=0,
                 error=str(e)
-            )
\ No newline at end of file
+            )
\ No newline at end of file
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+rollup.py
+=========
+Weekly and monthly reports assembled from cached daily snapshots.
+
+Days already extracted are read from the snapshot cache; only missing
+days are queried from the database (and cached for the next run).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple
+from dataclasses import dataclass, field
+
+from .processor import ReportProcessor
+from ..core.lazy import lazy_import
+from ..core.snapshot import SnapshotCache
+from ..core.exceptions import PipelineError
+
+pa = lazy_import('pyarrow')
+
+
+DATE_COLUMN = 'FECHA'
+PERIODS = ('weekly', 'monthly')
+
+
+def period_bounds(date: datetime, period: str) -> Tuple[datetime, datetime]:
+    """
+    Get first and last day of the period containing a date.
+
+    Args:
+        date: Any date inside the period
+        period: 'weekly' (Monday to Sunday) or 'monthly'
+
+    Returns:
+        Tuple of (start, end) dates, both inclusive
+
+    Raises:
+        PipelineError: If period is unknown
+    """
+    day = datetime(date.year, date.month, date.day)
+
+    if period == 'weekly':
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+
+    if period == 'monthly':
+        start = day.replace(day=1)
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        return start, next_month - timedelta(days=1)
+
+    raise PipelineError(f"Unknown period: {period} (expected one of {PERIODS})")
+
+
+@dataclass
+class RollupResult:
+    """Result of a period rollup."""
+    start: datetime
+    end: datetime
+    records: int
+    days_cached: int
+    days_fetched: int
+    days_without_data: List[datetime] = field(default_factory=list)
+    file_generated: Optional[Path] = None
+
+
+class PeriodRollup:
+    """Builds period reports from daily partitions."""
+
+    def __init__(self, processor: ReportProcessor):
+        """
+        Initialize rollup builder.
+
+        Args:
+            processor: Report processor with an enabled snapshot cache
+
+        Raises:
+            PipelineError: If the processor has no snapshot cache
+        """
+        if not (processor.snapshots and processor.snapshots.enabled):
+            raise PipelineError("Rollups require an enabled snapshot cache")
+
+        self.processor = processor
+        self.snapshots = processor.snapshots
+
+    def collect(self, start: datetime, end: datetime) -> Tuple[pa.Table, RollupResult]:
+        """
+        Concatenate daily partitions for a date range.
+
+        A cached day is reused only if its source fingerprint still
+        matches; otherwise the day is extracted again.
+
+        Args:
+            start: First day (inclusive)
+            end: Last day (inclusive)
+
+        Returns:
+            Tuple of (detail table with a leading FECHA column, RollupResult)
+
+        Raises:
+            PipelineError: If the report already has a FECHA column
+        """
+        result = RollupResult(start=start, end=end, records=0, days_cached=0, days_fetched=0)
+        tables = []
+        current = start
+
+        while current <= end:
+            fingerprint = self.processor.db.get_source_fingerprint(current)
+            table = self.snapshots.get(self.processor.report_name, current, fingerprint)
+
+            if table is not None:
+                result.days_cached += 1
+            else:
+                rows = self.processor.extract(current, fingerprint)
+                result.days_fetched += 1
+                if not rows:
+                    result.days_without_data.append(current)
+                    current += timedelta(days=1)
+                    continue
+                table = self.snapshots.get(self.processor.report_name, current, fingerprint)
+                if table is None:
+                    table = SnapshotCache.table_from_rows(rows)
+
+            if any(name.upper() == DATE_COLUMN for name in table.column_names):
+                raise PipelineError(
+                    f"Report already has a {DATE_COLUMN} column; rollups add their own"
+                )
+            day_column = pa.array([current.date()] * table.num_rows, type=pa.date32())
+            tables.append(table.add_column(0, DATE_COLUMN, day_column))
+            current += timedelta(days=1)
+
+        if not tables:
+            return pa.table({DATE_COLUMN: pa.array([], type=pa.date32())}), result
+
+        detail = pa.concat_tables(
+            [t.replace_schema_metadata(None) for t in tables],
+            promote_options='permissive'
+        )
+        result.records = detail.num_rows
+        return detail, result
+
+    @staticmethod
+    def summarize(
+        detail: pa.Table,
+        group_by: Optional[List[str]] = None
+    ) -> Tuple[List[str], List[List]]:
+        """
+        Aggregate detail rows: row count and sums of numeric columns.
+
+        Rows are counted whatever their values, including NULL group keys.
+
+        Args:
+            detail: Detail table from collect()
+            group_by: Columns to group by (defaults to FECHA)
+
+        Returns:
+            Tuple of (headers, rows) for the summary sheet
+        """
+        keys = group_by or [DATE_COLUMN]
+        numeric = [
+            f.name for f in detail.schema
+            if f.name not in keys and (pa.types.is_integer(f.type) or pa.types.is_floating(f.type))
+        ]
+
+        aggregations = [([], 'count_all')] + [(name, 'sum') for name in numeric]
+        grouped = detail.group_by(keys).aggregate(aggregations).sort_by(
+            [(key, 'ascending') for key in keys]
+        )
+
+        headers = keys + ['REGISTROS'] + numeric
+        columns = [grouped.column(key).to_pylist() for key in keys]
+        columns.append(grouped.column('count_all').to_pylist())
+        columns.extend(grouped.column(f"{name}_sum").to_pylist() for name in numeric)
+
+        return headers, [list(row) for row in zip(*columns)]
+
+    def build(
+        self,
+        date: datetime,
+        output_path: Path,
+        period: str = 'monthly',
+        headers: Optional[List[str]] = None,
+        group_by: Optional[List[str]] = None
+    ) -> RollupResult:
+        """
+        Generate a period report with detail and summary sheets.
+
+        Args:
+            date: Any date inside the period
+            output_path: Where to save the report
+            period: 'weekly' or 'monthly'
+            headers: Optional detail headers (without the FECHA column)
+            group_by: Optional summary grouping columns
+
+        Returns:
+            RollupResult: Rollup statistics
+
+        Raises:
+            PipelineError: If the period has no data or generation fails
+        """
+        start, end = period_bounds(date, period)
+        detail, result = self.collect(start, end)
+
+        if result.records == 0:
+            raise PipelineError(f"No data between {start:%Y-%m-%d} and {end:%Y-%m-%d}")
+
+        detail_headers = [DATE_COLUMN] + (headers or detail.column_names[1:])
+        summary_headers, summary_rows = self.summarize(detail, group_by)
+
+        self.processor.excel.generate_excel_sheets(
+            [
+                ("Detalle", [list(row) for row in SnapshotCache.table_rows(detail)], detail_headers),
+                ("Resumen", summary_rows, summary_headers),
+            ],
+            output_path
+        )
+
+        result.file_generated = Path(output_path)
+        return result
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+watcher.py
+==========
+Waits for a day's source data to land, then processes the report.
+
+Instead of running at a fixed time and giving up when data is missing,
+the watcher polls the source with exponential backoff and runs
+ReportProcessor.process() as soon as the data is complete.
+"""
+
+import time
+import threading
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Optional, List, Callable
+
+from loguru import logger
+
+from .processor import ReportProcessor, ProcessResult
+from ..core.config import ConfigManager
+from ..core.exceptions import ConfigurationError
+
+
+MODES = ('disponible', 'estable', 'marca')
+
+
+@dataclass
+class WatchResult:
+    """Outcome of waiting for data."""
+    ready: bool
+    polls: int
+    waited_seconds: float
+    records: int = 0
+    reason: Optional[str] = None
+
+
+class ArrivalWatcher:
+    """
+    Polls for a day's data with exponential backoff.
+
+    Completion is decided by ``[VIGILANCIA] modo``:
+
+    - ``disponible``: the availability check finds rows
+    - ``estable``: the row count is non-zero and unchanged for
+      ``lecturas_estables`` consecutive polls (loads still running keep
+      changing it)
+    - ``marca``: a row for the date exists in the marker table
+      ``tabla_marca`` (column ``columna_fecha``), written by the loader
+      when it finishes
+
+    The wait starts at ``intervalo_inicial_segundos``, is multiplied by
+    ``factor`` after every poll up to ``intervalo_maximo_segundos``, and
+    gives up after ``limite_minutos``.
+    """
+
+    def __init__(
+        self,
+        config: ConfigManager,
+        processor: ReportProcessor,
+        sleep: Callable[[float], None] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize watcher.
+
+        Args:
+            config: Configuration manager instance
+            processor: Report processor to run once data is complete
+            sleep: Optional sleep function (interruptible by stop() by default)
+            clock: Monotonic clock in seconds
+
+        Raises:
+            ConfigurationError: If the settings are invalid
+        """
+        self.config = config
+        self.processor = processor
+        self.enabled = config.getboolean('VIGILANCIA', 'habilitado', default=False)
+        self.mode = config.get('VIGILANCIA', 'modo', default='disponible').lower()
+        self.initial_interval = float(config.get('VIGILANCIA', 'intervalo_inicial_segundos', default='30'))
+        self.max_interval = float(config.get('VIGILANCIA', 'intervalo_maximo_segundos', default='900'))
+        self.factor = float(config.get('VIGILANCIA', 'factor', default='2'))
+        self.timeout = float(config.get('VIGILANCIA', 'limite_minutos', default='360')) * 60
+        self.stable_reads = config.getint('VIGILANCIA', 'lecturas_estables', default=2)
+
+        if self.mode not in MODES:
+            raise ConfigurationError(f"Unknown watch mode: {self.mode} (expected one of {MODES})")
+        if self.initial_interval <= 0 or self.factor < 1:
+            raise ConfigurationError("VIGILANCIA intervals must be positive and factor >= 1")
+
+        self.marker_query = None
+        if self.mode == 'marca':
+            table = config.get('VIGILANCIA', 'tabla_marca')
+            column = config.get('VIGILANCIA', 'columna_fecha', default='report_date')
+            for name in (table, column):
+                if not name.replace('_', '').replace('.', '').isalnum():
+                    raise ConfigurationError(f"Invalid marker table or column: {name}")
+            self.marker_query = (
+                f"SELECT COUNT(*) FROM {table} WHERE TRUNC({column}) = TRUNC(:check_date)"
+            )
+
+        self._stop = threading.Event()
+        self.sleep = sleep or self._stop.wait
+        self.clock = clock
+
+    def stop(self) -> None:
+        """Interrupt a running wait."""
+        self._stop.set()
+
+    def _poll(self, date: datetime, history: List[int]) -> bool:
+        """Run one completeness check, appending the row count to history."""
+        exists, count = self.processor.db.check_data_exists(date)
+        history.append(count)
+
+        if self.mode == 'disponible':
+            return exists
+        if self.mode == 'estable':
+            recent = history[-self.stable_reads:]
+            return count > 0 and len(recent) == self.stable_reads and len(set(recent)) == 1
+
+        rows = self.processor.db.execute_prepared(self.marker_query, {'check_date': date})
+        return bool(rows and rows[0][0])
+
+    def wait_for_data(self, date: datetime) -> WatchResult:
+        """
+        Poll until the day's data is complete or the time limit passes.
+
+        Args:
+            date: Report date
+
+        Returns:
+            WatchResult: Whether data is ready and how long it took
+        """
+        start = self.clock()
+        interval = self.initial_interval
+        history: List[int] = []
+
+        while True:
+            if self._poll(date, history):
+                return WatchResult(True, len(history), self.clock() - start, history[-1])
+
+            elapsed = self.clock() - start
+            if elapsed >= self.timeout or self._stop.is_set():
+                reason = "Stopped" if self._stop.is_set() else "Timed out"
+                return WatchResult(False, len(history), elapsed, history[-1], reason)
+
+            delay = min(interval, self.max_interval, self.timeout - elapsed)
+            logger.debug(
+                f"Data for {date:%Y-%m-%d} not complete ({history[-1]} rows), "
+                f"next check in {delay:.0f}s"
+            )
+            self.sleep(delay)
+            interval *= self.factor
+
+    def watch(
+        self,
+        date: datetime,
+        output_path: Path,
+        headers: Optional[List[str]] = None,
+        upload_ftp: bool = True,
+        send_email: bool = True
+    ) -> ProcessResult:
+        """
+        Wait for the day's data, then run the full pipeline.
+
+        If the data never completes, the no-data notification is sent
+        once, at the end of the wait.
+
+        Args:
+            date: Report date
+            output_path: Where to save report
+            headers: Optional Excel headers
+            upload_ftp: If True, upload to FTP
+            send_email: If True, send email notifications
+
+        Returns:
+            ProcessResult: Processing result
+        """
+        waited = self.wait_for_data(date)
+
+        if not waited.ready:
+            logger.warning(
+                f"Data for {date:%Y-%m-%d} not complete after {waited.polls} checks "
+                f"({waited.waited_seconds / 60:.1f} min)"
+            )
+            if send_email and not self.processor.dry_run:
+                self.processor.email.notify_no_data(date)
+            return ProcessResult(
+                success=False,
+                records_processed=0,
+                error=f"No data available ({waited.reason.lower()} after {waited.polls} checks)"
+            )
+
+        logger.info(
+            f"Data for {date:%Y-%m-%d} complete after {waited.polls} checks, processing"
+        )
+        return self.processor.process(
+            date, output_path, headers, upload_ftp=upload_ftp, send_email=send_email
+        )
@@ -4,7 +4,7 @@
 
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Callable
 from dataclasses import dataclass
 
 from ..core.config import ConfigManager
@@ -101,6 +101,80 @@ class DateRangeReprocessor:
         
         return dates
 
+    def processor_callback(
+        self,
+        processor,
+        output_dir: Path,
+        filename: str = "reporte_{fecha}.{formato}",
+        headers: Optional[List[str]] = None,
+        upload_ftp: bool = True,
+        send_email: bool = True
+    ) -> Callable[[datetime], None]:
+        """
+        Build a reprocess_range callback that runs a ReportProcessor.
+        
+        Args:
+            processor: ReportProcessor used for every date
+            output_dir: Directory for generated files
+            filename: File name pattern, relative to output_dir; {fecha} is
+                replaced by YYYYMMDD and {formato} by the processor's (first)
+                output format, in directories as well
+            headers: Optional column headers
+            upload_ftp: If True, upload each file to FTP
+            send_email: If True, send email notifications
+            
+        Returns:
+            Callable processing one date, raising PipelineError on failure
+        """
+        output_dir = Path(output_dir)
+        
+        def callback(date: datetime) -> None:
+            output_path = output_dir / filename.format(
+                fecha=date.strftime('%Y%m%d'), formato=processor.output_formats[0]
+            )
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            result = processor.process(
+                date,
+                output_path,
+                headers,
+                upload_ftp=upload_ftp,
+                send_email=send_email
+            )
+            if not result.success:
+                raise PipelineError(f"{date:%Y-%m-%d}: {result.error}")
+        
+        # Lets reprocess_range probe every date's availability at once
+        callback.prefetch = processor.prefetch_availability
+        return callback
+
+    def enqueue_range(
+        self,
+        queue,
+        report: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> int:
+        """
+        Add a date range to a shared work queue instead of running it here.
+
+        Any number of QueueWorker processes, on this or other hosts, can
+        then claim the dates.
+        
+        Args:
+            queue: WorkQueue shared by the workers
+            report: Report name the workers map to a callback
+            start_date: Start date
+            end_date: End date
+            
+        Returns:
+            int: Number of dates newly queued
+            
+        Raises:
+            PipelineError: If start_date > end_date
+        """
+        self._calculate_date_range(start_date, end_date)
+        return queue.enqueue(report, self._generate_date_list(start_date, end_date))
+
     def reprocess_range(
         self, 
         start_date: datetime, 
@@ -127,6 +201,14 @@ class DateRangeReprocessor:
         failed = 0
         skipped = 0
         
+        prefetch = getattr(processor_callback, 'prefetch', None)
+        if prefetch and not dry_run:
+            try:
+                prefetch(dates)
+            except Exception:
+                # Dates are checked one by one instead
+                pass
+        
         for date in dates:
             if dry_run:
                 skipped += 1
@@ -143,4 +225,4 @@ class DateRangeReprocessor:
             successful=successful,
             failed=failed,
             skipped=skipped
-        )
\ No newline at end of file
+        )
\ No newline at end of file
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Cron-style schedule expressions."""
+
+from datetime import datetime, timedelta
+from typing import Set, Tuple
+
+from ..core.exceptions import ConfigurationError
+
+
+# (name, minimum, maximum) of the five cron fields
+FIELDS: Tuple[Tuple[str, int, int], ...] = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 6),
+)
+SEARCH_LIMIT_DAYS = 366 * 5
+
+
+def _parse_field(text: str, minimum: int, maximum: int) -> Set[int]:
+    """Parse one cron field: *, n, a-b, lists and /step."""
+    values: Set[int] = set()
+
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"invalid step {step}")
+
+        if part == '*':
+            start, end = minimum, maximum
+        elif '-' in part:
+            start, end = (int(v) for v in part.split('-', 1))
+        else:
+            start = int(part)
+            end = maximum if step > 1 else start
+
+        values.update(range(start, end + 1, step))
+
+    if maximum == 6:
+        # Sunday may be written as 7
+        values = {0 if v == 7 else v for v in values}
+    if not values or min(values) < minimum or max(values) > maximum:
+        raise ValueError(f"values out of range {minimum}-{maximum}")
+    return values
+
+
+class CronExpression:
+    """
+    Five-field cron expression: minute hour day month weekday.
+
+    Weekdays are 0-6 from Sunday (7 is also Sunday). As in cron, when
+    both day and weekday are restricted a time matches either of them.
+    """
+
+    def __init__(self, expression: str):
+        """
+        Parse an expression.
+
+        Args:
+            expression: e.g. "30 7 * * 1-5"
+
+        Raises:
+            ConfigurationError: If the expression is invalid
+        """
+        self.expression = expression
+        parts = expression.split()
+        if len(parts) != len(FIELDS):
+            raise ConfigurationError(f"Cron expression needs 5 fields: {expression!r}")
+
+        try:
+            parsed = [
+                _parse_field(text, minimum, maximum)
+                for text, (_, minimum, maximum) in zip(parts, FIELDS)
+            ]
+        except ValueError as e:
+            raise ConfigurationError(f"Invalid cron expression {expression!r}: {e}") from e
+
+        self.minutes, self.hours, self.days, self.months, self.weekdays = parsed
+        self._any_day = parts[2] == '*'
+        self._any_weekday = parts[4] == '*'
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def matches(self, moment: datetime) -> bool:
+        """Check whether a minute is scheduled."""
+        return (
+            moment.minute in self.minutes
+            and moment.hour in self.hours
+            and moment.month in self.months
+            and self._day_matches(moment)
+        )
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Get the first scheduled minute strictly after a moment.
+
+        Args:
+            moment: Reference time
+
+        Returns:
+            datetime: Next scheduled minute
+
+        Raises:
+            ConfigurationError: If nothing matches within five years
+        """
+        current = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=SEARCH_LIMIT_DAYS)
+
+        while current <= limit:
+            if current.month not in self.months:
+                current = (current.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(current):
+                current = current.replace(hour=0, minute=0) + timedelta(days=1)
+            elif current.hour not in self.hours:
+                current = current.replace(minute=0) + timedelta(hours=1)
+            elif current.minute not in self.minutes:
+                current += timedelta(minutes=1)
+            else:
+                return current
+
+        raise ConfigurationError(f"Cron expression never matches: {self.expression!r}")
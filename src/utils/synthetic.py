@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Deterministic synthetic report data for benchmarks and load tests."""
+
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Iterator, Optional
+
+import numpy as np
+
+from ..core.exceptions import PipelineError
+
+
+COLUMN_TYPES = ('int', 'float', 'text', 'datetime')
+CHUNK_ROWS = 10000
+SQLITE_TYPES = {'int': 'INTEGER', 'float': 'REAL', 'text': 'TEXT', 'datetime': 'TEXT'}
+
+
+@dataclass
+class SyntheticSpec:
+    """Shape of the generated data."""
+    rows: int = 100000
+    columns: int = 6
+    type_mix: Dict[str, float] = field(
+        default_factory=lambda: {'int': 0.25, 'float': 0.35, 'text': 0.25, 'datetime': 0.15}
+    )
+    start_date: datetime = datetime(2025, 1, 1)
+    days: int = 1
+    null_ratio: float = 0.0
+    cardinality: int = 1000
+    seed: int = 42
+
+
+class SyntheticDataGenerator:
+    """
+    Generates rows shaped like a report table.
+
+    Every row has an ``id`` and a ``report_date`` followed by ``columns``
+    data columns whose types follow ``type_mix``. Rows are produced in
+    fixed chunks, each seeded from (seed, chunk index), so the output only
+    depends on the spec and never on how callers batch it.
+    """
+
+    def __init__(self, spec: SyntheticSpec):
+        """
+        Initialize generator.
+
+        Args:
+            spec: Data shape
+
+        Raises:
+            PipelineError: If the spec is invalid
+        """
+        unknown = set(spec.type_mix) - set(COLUMN_TYPES)
+        if unknown:
+            raise PipelineError(f"Unknown column types: {', '.join(sorted(unknown))}")
+        if not 0 <= spec.null_ratio < 1:
+            raise PipelineError("null_ratio must be in [0, 1)")
+        if spec.rows < 0 or spec.columns < 1 or spec.days < 1 or spec.cardinality < 1:
+            raise PipelineError("rows, columns, days and cardinality must be positive")
+
+        self.spec = spec
+        self.types = self._allocate_types()
+        self.column_names = ['id', 'report_date'] + [
+            f"{kind}_{idx}" for idx, kind in enumerate(self.types, start=1)
+        ]
+        self._vocabulary = np.array(
+            [f"item_{i:0{len(str(spec.cardinality))}d}" for i in range(spec.cardinality)],
+            dtype=object
+        )
+
+    def _allocate_types(self) -> List[str]:
+        """Assign a type to each data column following type_mix proportions."""
+        total = sum(self.spec.type_mix.values())
+        if total <= 0:
+            raise PipelineError("type_mix weights must add up to more than zero")
+
+        counts = {k: int(self.spec.columns * w / total) for k, w in self.spec.type_mix.items()}
+        remainders = sorted(
+            self.spec.type_mix,
+            key=lambda k: self.spec.columns * self.spec.type_mix[k] / total - counts[k],
+            reverse=True
+        )
+        for kind in remainders[:self.spec.columns - sum(counts.values())]:
+            counts[kind] += 1
+
+        types = []
+        while len(types) < self.spec.columns:
+            for kind in COLUMN_TYPES:
+                if counts.get(kind, 0) > 0:
+                    types.append(kind)
+                    counts[kind] -= 1
+        return types
+
+    def _chunk(self, index: int, size: int, native_dates: bool) -> List[Tuple]:
+        """Generate one chunk of rows."""
+        spec = self.spec
+        rng = np.random.default_rng([spec.seed, index])
+        first_id = index * CHUNK_ROWS + 1
+
+        ids = np.arange(first_id, first_id + size)
+        day_offsets = rng.integers(0, spec.days, size)
+        base = spec.start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        as_value = (lambda dt: dt) if native_dates else str
+        dates = [as_value(base + timedelta(days=int(d))) for d in day_offsets]
+        columns = [ids.tolist(), dates]
+
+        for kind in self.types:
+            if kind == 'int':
+                values = rng.integers(0, 1000000, size).tolist()
+            elif kind == 'float':
+                values = np.round(rng.random(size) * 10000, 2).tolist()
+            elif kind == 'text':
+                values = self._vocabulary[rng.integers(0, spec.cardinality, size)].tolist()
+            else:
+                seconds = rng.integers(0, 86400, size)
+                values = [
+                    as_value(base + timedelta(days=int(d), seconds=int(s)))
+                    for d, s in zip(day_offsets, seconds)
+                ]
+
+            if spec.null_ratio:
+                for idx in np.flatnonzero(rng.random(size) < spec.null_ratio):
+                    values[idx] = None
+            columns.append(values)
+
+        return list(zip(*columns))
+
+    def iter_batches(self, native_dates: bool = False) -> Iterator[List[Tuple]]:
+        """
+        Yield rows in chunks of CHUNK_ROWS.
+
+        Args:
+            native_dates: If True, dates are datetime objects instead of
+                'YYYY-MM-DD HH:MM:SS' text
+
+        Yields:
+            List of row tuples
+        """
+        for index, start in enumerate(range(0, self.spec.rows, CHUNK_ROWS)):
+            yield self._chunk(index, min(CHUNK_ROWS, self.spec.rows - start), native_dates)
+
+    def rows(self, native_dates: bool = False) -> List[Tuple]:
+        """Generate all rows in memory (see iter_batches)."""
+        rows = []
+        for batch in self.iter_batches(native_dates):
+            rows.extend(batch)
+        return rows
+
+    def create_table_sql(self, table: str = 'reports') -> str:
+        """DDL of a SQLite table matching the generated rows."""
+        columns = ['id INTEGER PRIMARY KEY', 'report_date TEXT'] + [
+            f"{name} {SQLITE_TYPES[kind]}"
+            for name, kind in zip(self.column_names[2:], self.types)
+        ]
+        return f"CREATE TABLE {table} ({', '.join(columns)})"
+
+    def load_sqlite(
+        self,
+        path: Path,
+        table: str = 'reports',
+        connection: Optional[sqlite3.Connection] = None
+    ) -> int:
+        """
+        Bulk-load the rows into a SQLite file.
+
+        Uses executemany per chunk inside one transaction, with journaling
+        and fsync disabled since the file is disposable.
+
+        Args:
+            path: SQLite file (replaced if it exists)
+            table: Table name
+            connection: Optional open connection to load into instead
+
+        Returns:
+            int: Number of rows inserted
+        """
+        own_connection = connection is None
+        if own_connection:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists():
+                path.unlink()
+            connection = sqlite3.connect(path)
+
+        try:
+            connection.execute("PRAGMA journal_mode = OFF")
+            connection.execute("PRAGMA synchronous = OFF")
+            connection.execute(self.create_table_sql(table))
+
+            placeholders = ', '.join('?' * len(self.column_names))
+            insert = f"INSERT INTO {table} VALUES ({placeholders})"
+            inserted = 0
+            for batch in self.iter_batches():
+                connection.executemany(insert, batch)
+                inserted += len(batch)
+
+            connection.execute(
+                f"CREATE INDEX idx_{table}_report_date ON {table} (report_date)"
+            )
+            connection.commit()
+            return inserted
+
+        finally:
+            if own_connection:
+                connection.close()
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Shared work queue for backfills spread over several workers."""
+
+import os
+import time
+import socket
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Callable, Iterable
+
+from loguru import logger
+
+from .reprocessor import ProcessResult
+from ..core.config import ConfigManager
+
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+DATE_FORMAT = '%Y-%m-%d'
+
+
+@dataclass
+class Task:
+    """A (report, date) unit of work claimed by a worker."""
+    report: str
+    date: datetime
+    worker: str
+    attempts: int
+
+
+class WorkQueue:
+    """
+    (report, date) tasks in a SQLite file that every worker can reach.
+
+    Workers claim a task with a lease and renew it with heartbeats while
+    they process it. A task whose lease expires (worker crashed or lost
+    the share) goes back to pending, until it has been attempted
+    ``max_intentos`` times; then it is marked failed.
+    """
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize work queue from [COLA] settings.
+
+        Args:
+            config: Configuration manager instance
+        """
+        self.path = Path(config.get('COLA', 'archivo', default='state/cola.db'))
+        self.lease_seconds = config.getint('COLA', 'lease_segundos', default=300)
+        self.max_attempts = config.getint('COLA', 'max_intentos', default=3)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    report TEXT NOT NULL,
+                    task_date TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    worker TEXT,
+                    lease_until REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    updated_at REAL,
+                    PRIMARY KEY (report, task_date)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, task_date)")
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit; transactions are opened explicitly where needed
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def enqueue(self, report: str, dates: Iterable[datetime]) -> int:
+        """
+        Add tasks, ignoring (report, date) pairs already queued.
+
+        Args:
+            report: Report name
+            dates: Dates to process
+
+        Returns:
+            int: Number of new tasks
+        """
+        now = time.time()
+        rows = [(report, d.strftime(DATE_FORMAT), PENDING, now) for d in dates]
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (report, task_date, status, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            conn.execute("COMMIT")
+            return conn.total_changes - before
+        finally:
+            conn.close()
+
+    def requeue(self, report: str, dates: Iterable[datetime], include_done: bool = False) -> int:
+        """
+        Reset queued dates to pending with a fresh attempt count.
+
+        Running tasks are reset too, so use this only when the caller
+        owns the range (e.g. a new backfill run after a crash).
+
+        Args:
+            report: Report name
+            dates: Dates to reset
+            include_done: If True, also reset completed dates
+
+        Returns:
+            int: Number of tasks reset
+        """
+        statuses = [PENDING, RUNNING, FAILED] + ([DONE] if include_done else [])
+        now = time.time()
+        rows = [(PENDING, now, report, d.strftime(DATE_FORMAT)) for d in dates]
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE tasks SET status = ?, worker = NULL, lease_until = NULL, attempts = 0, "
+                "error = NULL, updated_at = ? WHERE report = ? AND task_date = ? "
+                f"AND status IN ({', '.join('?' * len(statuses))})",
+                [row + tuple(statuses) for row in rows]
+            )
+            conn.execute("COMMIT")
+            return conn.total_changes - before
+        finally:
+            conn.close()
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        """Release tasks whose lease ran out (transaction held by caller)."""
+        conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "worker = NULL, lease_until = NULL, error = 'Lease expired', updated_at = ? "
+            "WHERE status = ? AND lease_until < ?",
+            (self.max_attempts, FAILED, PENDING, now, RUNNING, now)
+        )
+
+    def claim(self, worker: str, reports: Optional[List[str]] = None) -> Optional[Task]:
+        """
+        Lease the oldest pending task.
+
+        Args:
+            worker: Worker identifier
+            reports: Only claim tasks of these reports (all if None)
+
+        Returns:
+            Task, or None if nothing is pending
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._requeue_expired(conn, now)
+
+            query = "SELECT report, task_date, attempts FROM tasks WHERE status = ?"
+            params: list = [PENDING]
+            if reports:
+                query += f" AND report IN ({', '.join('?' * len(reports))})"
+                params.extend(reports)
+            row = conn.execute(query + " ORDER BY task_date, report LIMIT 1", params).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            report, task_date, attempts = row
+            conn.execute(
+                "UPDATE tasks SET status = ?, worker = ?, lease_until = ?, attempts = ?, "
+                "updated_at = ? WHERE report = ? AND task_date = ?",
+                (RUNNING, worker, now + self.lease_seconds, attempts + 1, now, report, task_date)
+            )
+            conn.execute("COMMIT")
+            return Task(report, datetime.strptime(task_date, DATE_FORMAT), worker, attempts + 1)
+
+        finally:
+            conn.close()
+
+    def _update_owned(self, task: Task, sets: str, params: tuple) -> bool:
+        """Update a task only while `task.worker` still holds its lease."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"UPDATE tasks SET {sets}, updated_at = ? "
+                "WHERE report = ? AND task_date = ? AND status = ? AND worker = ?",
+                params + (time.time(), task.report, task.date.strftime(DATE_FORMAT),
+                          RUNNING, task.worker)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def heartbeat(self, task: Task) -> bool:
+        """
+        Extend the lease of a running task.
+
+        Returns:
+            bool: False if the lease was lost (expired and requeued)
+        """
+        return self._update_owned(task, "lease_until = ?", (time.time() + self.lease_seconds,))
+
+    def complete(self, task: Task) -> bool:
+        """
+        Mark a task done.
+
+        Returns:
+            bool: False if the lease was lost before completion
+        """
+        return self._update_owned(
+            task, "status = ?, lease_until = NULL, error = NULL", (DONE,)
+        )
+
+    def fail(self, task: Task, error: str) -> bool:
+        """
+        Record a failed attempt, requeueing the task while attempts remain.
+
+        Returns:
+            bool: False if the lease was lost before the failure was recorded
+        """
+        status = FAILED if task.attempts >= self.max_attempts else PENDING
+        return self._update_owned(
+            task, "status = ?, worker = NULL, lease_until = NULL, error = ?", (status, error)
+        )
+
+    def counts(self, report: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count tasks per status.
+
+        Args:
+            report: Only count tasks of this report
+
+        Returns:
+            Dict of status to number of tasks
+        """
+        query = "SELECT status, COUNT(*) FROM tasks"
+        params: tuple = ()
+        if report:
+            query += " WHERE report = ?"
+            params = (report,)
+
+        conn = self._connect()
+        try:
+            counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            counts.update(dict(conn.execute(query + " GROUP BY status", params).fetchall()))
+            return counts
+        finally:
+            conn.close()
+
+
+class QueueWorker:
+    """Claims and processes queued tasks, heartbeating while each one runs."""
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        callbacks: Dict[str, Callable[[datetime], None]],
+        worker_id: Optional[str] = None,
+        poll_seconds: float = 5.0
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            queue: Shared work queue
+            callbacks: Report name to a callable processing one date
+                (see DateRangeReprocessor.processor_callback); raising
+                marks the attempt failed
+            worker_id: Identifier stored on claimed tasks (host:pid by default)
+            poll_seconds: Wait between claims when the queue is empty
+        """
+        self.queue = queue
+        self.callbacks = callbacks
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_seconds = poll_seconds
+        self.heartbeat_seconds = max(queue.lease_seconds / 3, 0.05)
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        """Ask run() to return after the current task."""
+        self._stop.set()
+
+    def _heartbeat(self, task: Task, done: threading.Event) -> None:
+        """Renew the lease until the task finishes."""
+        while not done.wait(self.heartbeat_seconds):
+            if not self.queue.heartbeat(task):
+                logger.warning(f"Lease lost for {task.report} {task.date:%Y-%m-%d}")
+                return
+
+    def run_task(self, task: Task) -> bool:
+        """
+        Process one claimed task.
+
+        Returns:
+            bool: True if the callback succeeded
+        """
+        done = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(task, done), daemon=True)
+        beat.start()
+
+        try:
+            self.callbacks[task.report](task.date)
+            succeeded = True
+        except Exception as e:
+            self.queue.fail(task, str(e))
+            succeeded = False
+        finally:
+            done.set()
+            beat.join()
+
+        if succeeded:
+            self.queue.complete(task)
+        return succeeded
+
+    def run(self, until_empty: bool = True) -> ProcessResult:
+        """
+        Process tasks until the queue is empty or stop() is called.
+
+        Args:
+            until_empty: If False, keep polling for new tasks until stopped
+
+        Returns:
+            ProcessResult: Tasks handled by this worker
+        """
+        successful = failed = 0
+
+        while not self._stop.is_set():
+            task = self.queue.claim(self.worker_id, list(self.callbacks))
+            if task is None:
+                if until_empty:
+                    break
+                self._stop.wait(self.poll_seconds)
+                continue
+
+            if self.run_task(task):
+                successful += 1
+            else:
+                failed += 1
+
+        return ProcessResult(
+            total=successful + failed,
+            successful=successful,
+            failed=failed,
+            skipped=0
+        )
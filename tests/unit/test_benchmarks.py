@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the benchmark harness and protocol stand-ins."""
+
+import sys
+sys.path.append('.')
+import os
+from datetime import datetime
+from unittest.mock import Mock
+
+from benchmarks.harness import BenchmarkResult, run_case, save_results, compare, format_table
+from benchmarks.standins import ftp_standin, smtp_standin
+from src.core.ftp import FTPManager
+from src.core.email import EmailManager
+
+
+def crashing_case(size, workdir):
+    os._exit(3)
+
+
+class TestHarness:
+
+    def test_rows_per_sec(self):
+        assert BenchmarkResult('case', 1000, 0.5).rows_per_sec == 2000.0
+        assert BenchmarkResult('case', 1000, 0.0).rows_per_sec == 0.0
+
+    def test_compare_flags_regressions(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        save_results([BenchmarkResult('excel', 1000, 1.0, peak_rss_mb=100.0)], baseline)
+
+        assert compare([BenchmarkResult('excel', 1000, 1.1, peak_rss_mb=110.0)], baseline) == []
+
+        regressions = compare([BenchmarkResult('excel', 1000, 2.0, peak_rss_mb=200.0)], baseline)
+        assert len(regressions) == 2
+        assert 'rows/s' in regressions[0]
+        assert 'peak RSS' in regressions[1]
+
+    def test_compare_ignores_unknown_cases(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        save_results([BenchmarkResult('excel', 1000, 1.0)], baseline)
+        assert compare([BenchmarkResult('excel', 5000, 9.0)], baseline) == []
+
+    def test_compare_fails_errored_cases(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        save_results([BenchmarkResult('excel', 1000, 1.0)], baseline)
+
+        regressions = compare([
+            BenchmarkResult('excel', 1000, 0.0, error='MemoryError: '),
+            BenchmarkResult('db', 1000, 0.0, error='boom'),
+        ], baseline)
+
+        assert regressions == [
+            'excel[1000]: failed: MemoryError: ',
+            'db[1000]: failed: boom',
+        ]
+
+    def test_run_case_reports_crashed_child(self):
+        result = run_case('crash', crashing_case, 1000, timeout=30)
+
+        assert result.error == 'Process exited with code 3'
+        assert result.rows == 1000
+
+    def test_format_table_shows_errors(self):
+        table = format_table([BenchmarkResult('db', 0, 0.0, error='boom')])
+        assert 'ERROR boom' in table
+
+
+class TestStandins:
+
+    def test_ftp_upload(self, tmp_path):
+        local = tmp_path / "report.xlsx"
+        local.write_bytes(b'x' * 5000)
+
+        with ftp_standin() as server:
+            config = Mock()
+            config.getboolean.side_effect = lambda section, key, default=False: True
+            config.get.side_effect = lambda section, key, default=None: {
+                ('FTP', 'servidor'): '127.0.0.1',
+                ('FTP', 'usuario'): 'bench',
+                ('FTP', 'directorio_remoto'): '/in',
+            }.get((section, key), default)
+            config.getint.return_value = server.port
+
+            with FTPManager(config) as ftp:
+                assert ftp.upload_file(local) is True
+
+        assert server.messages == 1
+        assert server.bytes_received == 5000
+
+    def test_smtp_send(self):
+        with smtp_standin() as server:
+            config = Mock()
+            config.getboolean.side_effect = lambda section, key, default=False: key == 'habilitado'
+            config.get.side_effect = lambda section, key, default=None: {
+                ('EMAIL', 'servidor_smtp'): '127.0.0.1',
+                ('EMAIL', 'remitente_email'): 'bench@localhost',
+                ('EMAIL', 'destinatarios_principales'): 'ops@localhost',
+            }.get((section, key), default)
+            config.getint.side_effect = lambda section, key, default=0: (
+                server.port if key == 'puerto_smtp' else default
+            )
+
+            assert EmailManager(config).notify_success(datetime(2025, 1, 15)) is True
+
+        assert server.messages == 1
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the daily-report command."""
+
+import sys
+sys.path.append('.')
+import sqlite3
+import pytest
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from src.cli import main, parse_date, parse_formats, output_path
+from src.reports.processor import ProcessResult
+from src.utils.synthetic import SyntheticDataGenerator, SyntheticSpec
+
+
+def write_setup(tmp_path, days=3):
+    """SQLite database with `days` days of rows and a config pointing at it."""
+    db_path = tmp_path / 'reports.db'
+    SyntheticDataGenerator(
+        SyntheticSpec(rows=30 * days, columns=4, start_date=datetime(2025, 1, 1), days=days, seed=3)
+    ).load_sqlite(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE VIEW transactions AS SELECT report_date AS transaction_date FROM reports")
+    conn.commit()
+    conn.close()
+
+    config_path = tmp_path / 'config.ini'
+    config_path.write_text(
+        f"[DATABASE]\nmotor = sqlite\nruta = {db_path}\n\n"
+        f"[COLA]\narchivo = {tmp_path / 'cola.db'}\n\n"
+        "[REPORTE]\nnombre = ventas\n",
+        encoding='utf-8'
+    )
+    return str(config_path)
+
+
+class TestCli:
+
+    @pytest.fixture
+    def processor(self):
+        processor = Mock()
+        processor.output_format = 'xlsx'
+        processor.timer.snapshot.return_value = {'extract': {'calls': 1, 'seconds': 0.5}}
+        processor.process.side_effect = lambda date, path, **options: ProcessResult(
+            success=True, records_processed=3, file_generated=path
+        )
+        with patch('src.core.config.ConfigManager'), \
+                patch('src.reports.processor.ReportProcessor.from_config', return_value=processor):
+            yield processor
+
+    def test_runs_single_date(self, processor, tmp_path, capsys):
+        pattern = str(tmp_path / 'out_{fecha}.{formato}')
+
+        assert main(['2025-01-15', '--output', pattern, '--no-ftp', '--format', 'csv']) == 0
+
+        (date, path), options = processor.process.call_args
+        assert date == datetime(2025, 1, 15)
+        assert path == tmp_path / 'out_20250115.csv'
+        assert options == {'upload_ftp': False, 'send_email': True}
+        assert processor.output_format == 'csv'
+        out = capsys.readouterr().out
+        assert '3 records' in out
+        assert 'extract' in out
+        processor.db.disconnect.assert_called_once()
+
+    def test_failure_exit_status(self, processor, tmp_path):
+        processor.process.side_effect = lambda date, path, **options: ProcessResult(
+            success=False, records_processed=0, error="No data available"
+        )
+
+        assert main(['2025-01-15', '--output', str(tmp_path / 'x.xlsx')]) == 1
+
+    @pytest.mark.parametrize('argv', [
+        ['15/01/2025'],
+        ['2025-01-15', '--start', '2025-01-01'],
+        ['--end', '2025-01-03'],
+        ['--start', '2025-01-05', '--end', '2025-01-01'],
+        ['--start', '2025-01-01', '--workers', '0'],
+    ])
+    def test_invalid_arguments(self, argv):
+        with pytest.raises(SystemExit):
+            main(argv)
+
+    def test_output_path(self):
+        date = parse_date('2025-01-05')
+        assert str(output_path('r_{fecha}.{formato}', date, 'csv')) == 'r_20250105.csv'
+
+    def test_parse_formats(self):
+        import argparse
+
+        assert parse_formats('XLSX, parquet') == 'xlsx,parquet'
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_formats('xlsx,pdf')
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_formats(',')
+
+
+class TestCliBackfill:
+
+    def test_backfill_with_workers_and_resume(self, tmp_path, capsys):
+        config = write_setup(tmp_path)
+        pattern = str(tmp_path / 'out' / 'r_{fecha}.{formato}')
+        argv = ['--config', config, '--start', '2025-01-01', '--end', '2025-01-03',
+                '--output', pattern, '--format', 'csv', '--no-ftp', '--no-email']
+
+        assert main(argv + ['--workers', '2']) == 0
+
+        files = sorted(p.name for p in (tmp_path / 'out').iterdir())
+        assert files == ['r_20250101.csv', 'r_20250102.csv', 'r_20250103.csv']
+        out = capsys.readouterr().out
+        assert '3 done, 0 failed' in out
+        assert 'write' in out
+
+        assert main(argv + ['--resume']) == 0
+        out = capsys.readouterr().out
+        assert '3 done' in out
+        assert 'write' not in out
+
+    def test_backfill_formats_directories_per_date(self, tmp_path, capsys):
+        config = write_setup(tmp_path)
+        pattern = str(tmp_path / 'out' / '{fecha}' / 'r.{formato}')
+        argv = ['--config', config, '--start', '2025-01-01', '--end', '2025-01-02',
+                '--output', pattern, '--format', 'csv', '--no-ftp', '--no-email']
+
+        assert main(argv) == 0
+
+        files = sorted(str(p.relative_to(tmp_path / 'out')) for p in (tmp_path / 'out').rglob('*.csv'))
+        assert files == ['20250101/r.csv', '20250102/r.csv']
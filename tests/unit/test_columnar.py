@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for ColumnBatch."""
+
+import sys
+sys.path.append('.')
+from decimal import Decimal
+from datetime import datetime
+
+import numpy as np
+import pyarrow as pa
+
+from src.core.columnar import ColumnBatch
+
+
+class TestColumnBatch:
+
+    def test_typed_columns_and_masks(self):
+        rows = [
+            (1, 'A', 10.5, datetime(2025, 1, 15, 8)),
+            (2, None, None, datetime(2025, 1, 15, 9)),
+            (3, 'C', 7, None),
+        ]
+        batch = ColumnBatch.from_rows(rows, ['ID', 'PRODUCT', 'AMOUNT', 'CREATED'])
+
+        assert batch.num_rows == 3
+        assert batch.columns[0].dtype == np.int64
+        assert batch.columns[1].dtype == object
+        assert batch.columns[2].dtype == np.float64
+        assert batch.columns[3].dtype == np.dtype('datetime64[us]')
+        assert batch.masks[0] is None
+        assert batch.masks[2].tolist() == [False, True, False]
+        assert batch.to_rows() == rows
+
+    def test_decimal_and_int_nulls(self):
+        batch = ColumnBatch.from_rows([(Decimal('1.25'), 5), (Decimal('2.50'), None)])
+
+        assert batch.names == ['col_1', 'col_2']
+        assert batch.columns[0].tolist() == [1.25, 2.5]
+        values, mask = batch.column('COL_2')
+        assert values.dtype == np.int64
+        assert mask.tolist() == [False, True]
+
+    def test_to_arrow_keeps_nulls(self):
+        batch = ColumnBatch.from_rows([(1, 'x'), (None, None)], ['n', 's'])
+        record_batch = batch.to_arrow()
+
+        assert record_batch.schema.field('n').type == pa.int64()
+        assert record_batch.column(0).to_pylist() == [1, None]
+        assert record_batch.column(1).to_pylist() == ['x', None]
+
+    def test_empty_batch(self):
+        batch = ColumnBatch.from_rows([], ['a', 'b'])
+        assert batch.num_rows == 0
+        assert batch.to_rows() == []
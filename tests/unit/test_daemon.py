@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for ReportDaemon."""
+
+import sys
+sys.path.append('.')
+import threading
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+from src.reports.daemon import ReportDaemon, send_command
+from src.reports.processor import ProcessResult
+
+
+class TestReportDaemon:
+
+    @pytest.fixture
+    def daemon(self, tmp_path):
+        config = Mock()
+        config.get.side_effect = lambda section, key, default=None: {
+            ('DAEMON', 'socket'): '127.0.0.1:0',
+            ('DAEMON', 'directorio_salida'): str(tmp_path),
+        }.get((section, key), default)
+        config.getint.side_effect = lambda section, key, default=None: default
+        config.getboolean.side_effect = lambda section, key, default=None: default
+        config.items.return_value = {'diario': '30 7 * * *'}
+
+        processor = Mock()
+        processor.output_formats = ['xlsx']
+        processor.process.side_effect = lambda date, path, **options: ProcessResult(
+            success=date.day != 2, records_processed=10, file_generated=path
+        )
+        daemon = ReportDaemon(config, processor)
+        yield daemon
+        daemon.close()
+
+    def test_run_command(self, daemon, tmp_path):
+        reply = daemon.handle_command({'command': 'run', 'date': '2025-01-15', 'send_email': False})
+
+        assert reply['ok'] is True
+        assert reply['file'] == str(tmp_path / 'reporte_20250115.xlsx')
+        _, kwargs = daemon.processor.process.call_args
+        assert kwargs == {'send_email': False}
+        daemon.processor.db.ensure_connected.assert_called()
+
+    def test_output_extension_follows_format(self, daemon, tmp_path):
+        daemon.processor.output_formats = ['csv']
+        assert daemon.output_path(datetime(2025, 1, 15)) == tmp_path / 'reporte_20250115.csv'
+
+    def test_backfill_command(self, daemon):
+        reply = daemon.handle_command({'command': 'backfill', 'start': '2025-01-01', 'end': '2025-01-03'})
+
+        assert reply == {'ok': False, 'total': 3, 'successful': 2, 'failed': 1}
+        daemon.processor.prefetch_availability.assert_called_once()
+
+    def test_scheduled_job_runs_previous_day(self, daemon):
+        job = daemon.jobs[0]
+        job.next_run = datetime(2025, 1, 16, 7, 30)
+
+        assert daemon.run_due_jobs(datetime(2025, 1, 16, 7, 29)) == 0
+        assert daemon.run_due_jobs(datetime(2025, 1, 16, 7, 30)) == 1
+        daemon._executor.submit(lambda: None).result()
+
+        date = daemon.processor.process.call_args[0][0]
+        assert date == datetime(2025, 1, 15)
+        assert job.next_run == datetime(2025, 1, 17, 7, 30)
+
+    def test_socket_commands(self, daemon):
+        daemon.start()
+        assert daemon.processor.email.keep_alive is True
+
+        status = send_command(daemon.address, {'command': 'status'}, timeout=5)
+        assert status['ok'] is True
+        assert 'diario' in status['jobs']
+        assert send_command(daemon.address, {'command': 'nope'}, timeout=5)['ok'] is False
+
+        worker = threading.Thread(target=daemon.serve_forever, kwargs={'tick_seconds': 0.01})
+        worker.start()
+        assert send_command(daemon.address, {'command': 'shutdown'}, timeout=5) == {'ok': True}
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+
+    def test_scheduled_job_waits_for_data(self, daemon):
+        daemon.watcher = Mock()
+        daemon.watcher.watch.return_value = ProcessResult(success=True, records_processed=3)
+        daemon.jobs[0].next_run = datetime(2025, 1, 16, 7, 30)
+
+        daemon.run_due_jobs(datetime(2025, 1, 16, 7, 30))
+        daemon._executor.submit(lambda: None).result()
+
+        daemon.watcher.watch.assert_called_once()
+        daemon.processor.process.assert_not_called()
@@ -11,12 +11,12 @@ class TestDatabaseManager:
     @pytest.fixture
     def mock_config(self):
         config = Mock()
-        config.get.side_effect = lambda section, key: {
+        config.get.side_effect = lambda section, key, default=None: {
             ('DATABASE', 'host'): 'localhost',
             ('DATABASE', 'service_name'): 'ORCL',
             ('DATABASE', 'user'): 'test',
             ('DATABASE', 'password'): 'pass'
-        }.get((section, key))
+        }.get((section, key), default)
         config.getint.return_value = 1521
         return config
     
@@ -40,4 +40,184 @@ class TestDatabaseManager:
         db = DatabaseManager(mock_config)
         
         with pytest.raises(DatabaseError, match="Not connected"):
-            db.execute_query("SELECT 1")
\ No newline at end of file
+            db.execute_query("SELECT 1")
+
+    def test_source_fingerprint_changes_with_data(self, mock_config):
+        from datetime import datetime
+
+        db = DatabaseManager(mock_config)
+        db.connection = Mock()
+        db.cursor = Mock()
+        date = datetime(2025, 1, 15)
+
+        cursor = db.connection.cursor.return_value
+        cursor.fetchall.return_value = [(10, datetime(2025, 1, 15, 18, 0))]
+        first = db.get_source_fingerprint(date)
+        cursor.fetchall.return_value = [(11, datetime(2025, 1, 15, 18, 5))]
+        second = db.get_source_fingerprint(date)
+
+        assert first != second
+        assert len(first) == 64
+
+    def test_fetch_since_wraps_query(self, mock_config):
+        db = DatabaseManager(mock_config)
+        db.connection = Mock()
+        db.cursor = Mock()
+        db.cursor.fetchall.return_value = [(3,)]
+
+        rows = db.fetch_since("SELECT * FROM reports", {'date': 1}, 'last_modified', 100)
+
+        assert rows == [(3,)]
+        query, params = db.cursor.execute.call_args[0]
+        assert query == "SELECT * FROM (SELECT * FROM reports) WHERE last_modified >= :watermark"
+        assert params == {'date': 1, 'watermark': 100}
+
+    def test_fetch_since_rejects_invalid_column(self, mock_config):
+        db = DatabaseManager(mock_config)
+        db.connection = Mock()
+        db.cursor = Mock()
+
+        with pytest.raises(DatabaseError, match="Invalid watermark column"):
+            db.fetch_since("SELECT 1", None, "x; DROP TABLE y", 1)
+
+    def test_unknown_backend(self, mock_config):
+        from src.core.exceptions import ConfigurationError
+
+        mock_config.get.side_effect = lambda section, key, default=None: (
+            'db2' if key == 'motor' else default
+        )
+        with pytest.raises(ConfigurationError, match="Unknown database backend"):
+            DatabaseManager(mock_config)
+
+    def test_missing_oracle_driver(self, mock_config):
+        from src.core.exceptions import ConfigurationError
+
+        with patch('importlib.util.find_spec', return_value=None) as find_spec:
+            with pytest.raises(ConfigurationError, match="not available: oracle"):
+                DatabaseManager(mock_config)
+        find_spec.assert_called_once_with('oracledb')
+
+
+class TestSQLiteBackend:
+
+    @pytest.fixture
+    def sqlite_config(self):
+        config = Mock()
+        config.get.side_effect = lambda section, key, default=None: {
+            ('DATABASE', 'motor'): 'sqlite',
+            ('DATABASE', 'ruta'): ':memory:',
+        }.get((section, key), default)
+        config.getint.side_effect = lambda section, key, default=None: default
+        return config
+
+    @pytest.fixture
+    def db(self, sqlite_config):
+        manager = DatabaseManager(sqlite_config)
+        manager.connect()
+        manager.connection.execute("CREATE TABLE transactions (id INTEGER, transaction_date TEXT)")
+        manager.connection.executemany(
+            "INSERT INTO transactions VALUES (?, ?)",
+            [(i, f"2025-01-15 0{i}:00:00") for i in range(5)]
+        )
+        yield manager
+        manager.disconnect()
+
+    def test_check_data_exists_uses_trunc(self, db):
+        from datetime import datetime
+
+        assert db.check_data_exists(datetime(2025, 1, 15)) == (True, 5)
+        assert db.check_data_exists(datetime(2025, 1, 16)) == (False, 0)
+
+    def test_datetime_binds(self, db):
+        from datetime import datetime
+
+        rows = db.execute_query(
+            "SELECT id FROM transactions WHERE transaction_date = :ts",
+            {'ts': datetime(2025, 1, 15, 3)}
+        )
+        assert rows == [(3,)]
+
+    def test_iter_query_streams_batches(self, db):
+        batches = list(db.iter_query("SELECT id FROM transactions ORDER BY id", batch_size=2))
+        assert [len(b) for b in batches] == [2, 2, 1]
+
+    def test_query_error_wrapped(self, db):
+        with pytest.raises(DatabaseError, match="Query failed"):
+            db.execute_query("SELECT * FROM missing_table")
+
+    def test_iter_columnar(self, db):
+        batches = list(db.iter_columnar(
+            "SELECT id, transaction_date FROM transactions ORDER BY id", batch_size=3
+        ))
+        assert [b.num_rows for b in batches] == [3, 2]
+        assert batches[0].names == ['id', 'transaction_date']
+        assert batches[1].columns[0].tolist() == [3, 4]
+
+    def test_run_stats_count_round_trips(self, db):
+        from datetime import datetime
+
+        list(db.iter_query("SELECT id FROM transactions", batch_size=2))
+        db.check_data_exists(datetime(2025, 1, 15))
+
+        run = db.get_run_stats()
+        assert run.statements == 2
+        assert run.rows == 6
+        assert run.round_trips == 5
+
+    def test_streaming_fetch_time_excludes_consumer(self, db):
+        import time
+
+        for _ in db.iter_query("SELECT id FROM transactions", batch_size=2):
+            time.sleep(0.05)
+
+        assert db.get_run_stats().fetch_seconds < 0.05
+
+    def test_streaming_slot_latency_excludes_consumer(self, db):
+        import time
+        from unittest.mock import MagicMock
+        from src.core.throttle import SlotLease
+
+        lease = SlotLease()
+        db.throttle = MagicMock()
+        db.throttle.slot.return_value.__enter__.return_value = lease
+
+        for _ in db.iter_query("SELECT id FROM transactions", batch_size=2):
+            time.sleep(0.05)
+
+        assert lease.latency is not None
+        assert lease.latency < 0.05
+
+    def test_check_data_exists_many(self, db):
+        from datetime import datetime, date
+
+        counts = db.check_data_exists_many([datetime(2025, 1, 16), datetime(2025, 1, 15)])
+
+        assert counts == {date(2025, 1, 15): 5, date(2025, 1, 16): 0}
+        assert db.get_run_stats().statements == 1
+
+    def test_prepared_cursors_are_reused_and_bounded(self, db):
+        from datetime import datetime
+
+        db.check_data_exists(datetime(2025, 1, 15))
+        cursor = db._statements[next(iter(db._statements))][0]
+        db.check_data_exists(datetime(2025, 1, 16))
+        assert len(db._statements) == 1
+        assert db._statements[next(iter(db._statements))][0] is cursor
+
+        db.statement_cache_size = 2
+        for i in range(3):
+            db.execute_prepared(f"SELECT {i}")
+        assert list(db._statements) == ["SELECT 1", "SELECT 2"]
+
+    def test_ensure_connected_reconnects(self, sqlite_config):
+        db = DatabaseManager(sqlite_config)
+        assert db.ensure_connected() is True
+        connection = db.connection
+        assert db.ensure_connected() is True
+        assert db.connection is connection
+
+        db.connection = Mock()
+        db.connection.ping.side_effect = Exception("ORA-03113")
+        assert db.ensure_connected() is True
+        assert db.connection is not connection
+        db.disconnect()
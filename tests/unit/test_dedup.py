@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for DeliveryLedger and ContentHasher."""
+
+import sys
+sys.path.append('.')
+import pytest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+from src.core.dedup import DeliveryLedger, ContentHasher
+from src.core.exceptions import PipelineError
+
+
+class TestContentHasher:
+
+    def test_same_rows_same_hash(self):
+        first = ContentHasher()
+        second = ContentHasher()
+        first.update_many([(1, 'A', 10.5), (2, 'B', None)])
+        second.update_many([[1, 'A', 10.5], [2, 'B', None]])
+        assert first.hexdigest() == second.hexdigest()
+
+    def test_different_rows_different_hash(self):
+        first = ContentHasher()
+        second = ContentHasher()
+        first.update((1, 'A'))
+        second.update((1, 'B'))
+        assert first.hexdigest() != second.hexdigest()
+
+
+class TestDeliveryLedger:
+
+    @pytest.fixture
+    def mock_config(self, tmp_path):
+        config = Mock()
+        config.getboolean.return_value = True
+        config.get.return_value = str(tmp_path / "state" / "ledger.json")
+        return config
+
+    def test_get_missing_entry(self, mock_config):
+        ledger = DeliveryLedger(mock_config)
+        assert ledger.get(datetime(2025, 1, 15), Path("report.xlsx")) is None
+
+    def test_record_persists(self, mock_config):
+        ledger = DeliveryLedger(mock_config)
+        date = datetime(2025, 1, 15)
+        ledger.record(date, Path("out/report.xlsx"), 'fp', 'hash', 10)
+
+        reloaded = DeliveryLedger(mock_config)
+        entry = reloaded.get(date, Path("report.xlsx"))
+        assert entry.source_fingerprint == 'fp'
+        assert entry.content_hash == 'hash'
+        assert entry.records == 10
+
+    def test_corrupt_file_raises(self, mock_config, tmp_path):
+        ledger = DeliveryLedger(mock_config)
+        ledger.path.parent.mkdir(parents=True)
+        ledger.path.write_text("not json")
+
+        with pytest.raises(PipelineError, match="Failed to read ledger"):
+            ledger.get(datetime(2025, 1, 15), Path("report.xlsx"))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for DiffStage."""
+
+import sys
+sys.path.append('.')
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+from src.core.diff import DiffStage, ADDED, REMOVED, CHANGED
+from src.core.snapshot import SnapshotCache
+from src.core.exceptions import PipelineError
+
+
+class TestDiffStage:
+
+    @pytest.fixture
+    def previous(self):
+        return SnapshotCache.table_from_rows(
+            [(1, 'Laptop', 10.0), (2, 'Mouse', 5.0), (3, 'Cable', 1.0)],
+            ['ID', 'PRODUCTO', 'MONTO']
+        )
+
+    @pytest.fixture
+    def settings(self):
+        return {}
+
+    @pytest.fixture
+    def config(self, settings):
+        config = Mock()
+        config.getboolean.side_effect = lambda section, key, default=None: section == 'DIFERENCIAL'
+        config.get.side_effect = lambda section, key, default=None: settings.get(key, default)
+        return config
+
+    def test_disabled_by_default(self):
+        config = Mock()
+        config.getboolean.return_value = False
+        stage = DiffStage(config)
+        assert stage.enabled is False
+        assert stage.key_columns == []
+
+    def test_config(self, config, settings):
+        settings.update(columna_clave='ID, FECHA', modo='solo')
+        stage = DiffStage(config)
+        assert stage.key_columns == ['ID', 'FECHA']
+        assert stage.only_changes is True
+        assert stage.ignore_columns == ['REPORT_DATE']
+
+    def test_added_removed_changed(self, previous, config):
+        current = SnapshotCache.table_from_rows(
+            [(1, 'Laptop', 10.0), (2, 'Mouse', 7.5), (4, 'Monitor', 200.0)],
+            ['id', 'PRODUCTO', 'MONTO']
+        )
+
+        result = DiffStage(config).compare(previous, current, datetime(2025, 1, 14))
+
+        assert (result.added, result.removed, result.changed, result.unchanged) == (1, 1, 1, 1)
+        assert result.headers == ['CAMBIO', 'COLUMNAS_MODIFICADAS', 'id', 'PRODUCTO', 'MONTO']
+        assert sorted(result.rows) == sorted([
+            [ADDED, '', 4, 'Monitor', 200.0],
+            [REMOVED, '', 3, 'Cable', 1.0],
+            [CHANGED, 'MONTO', 2, 'Mouse', 7.5],
+        ])
+
+    def test_composite_key_and_new_column(self, previous, config, settings):
+        current = SnapshotCache.table_from_rows(
+            [(1, 'Laptop', 10.0, 'A'), (2, 'Mouse', 5.0, None)],
+            ['ID', 'PRODUCTO', 'MONTO', 'ESTADO']
+        )
+        settings['columna_clave'] = 'ID,PRODUCTO'
+        stage = DiffStage(config)
+
+        result = stage.compare(previous, current, datetime(2025, 1, 14))
+
+        assert (result.added, result.removed, result.changed, result.unchanged) == (0, 1, 1, 1)
+        assert [CHANGED, 'ESTADO', 1, 'Laptop', 10.0, 'A'] in result.rows
+
+    def test_date_and_ignored_columns_do_not_change_rows(self, config, settings):
+        previous = SnapshotCache.table_from_rows(
+            [(1, datetime(2025, 1, 14), 'a', 10.0), (2, datetime(2025, 1, 14), 'b', 5.0)],
+            ['ID', 'REPORT_DATE', 'LOTE', 'MONTO']
+        )
+        current = SnapshotCache.table_from_rows(
+            [(1, datetime(2025, 1, 15), 'c', 10.0), (2, datetime(2025, 1, 15), 'd', 6.0)],
+            ['ID', 'REPORT_DATE', 'LOTE', 'MONTO']
+        )
+        settings['ignorar_columnas'] = 'report_date, LOTE'
+        stage = DiffStage(config)
+
+        result = stage.compare(previous, current, datetime(2025, 1, 14))
+
+        assert (result.added, result.removed, result.changed, result.unchanged) == (0, 0, 1, 1)
+        assert result.rows == [[CHANGED, 'MONTO', 2, datetime(2025, 1, 15), 'd', 6.0]]
+
+    def test_unknown_key(self, previous, config, settings):
+        settings['columna_clave'] = 'NOPE'
+        with pytest.raises(PipelineError, match='NOPE'):
+            DiffStage(config).compare(
+                previous, previous, datetime(2025, 1, 14)
+            )
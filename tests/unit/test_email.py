@@ -155,4 +155,18 @@ class TestEmailManager:
         result = email.notify_error(error, date)
         
         assert result is True
-        mock_server.send_message.assert_called_once()
\ No newline at end of file
+        mock_server.send_message.assert_called_once()
+
+    @patch('src.core.email.smtplib.SMTP')
+    def test_keep_alive_reuses_session(self, mock_smtp, mock_config_enabled):
+        email = EmailManager(mock_config_enabled)
+        email.keep_alive = True
+        mock_smtp.return_value.noop.return_value = (250, b'OK')
+
+        email._send_email("One", "<p>1</p>", ["a@test.com"])
+        email._send_email("Two", "<p>2</p>", ["a@test.com"])
+
+        mock_smtp.assert_called_once_with('smtp.test.com', 587)
+        assert mock_smtp.return_value.send_message.call_count == 2
+        email.close()
+        mock_smtp.return_value.quit.assert_called_once()
@@ -4,10 +4,15 @@
 
 import sys
 sys.path.append('.')
+import zipfile
 import pytest
 from unittest.mock import Mock
+from datetime import datetime
 
-from src.core.excel import ExcelGenerator
+from openpyxl import load_workbook
+
+from src.core.excel import ExcelGenerator, SplitPolicy, LayoutOptions, sheet_title
+from src.core.exceptions import ConfigurationError, PipelineError
 
 
 class TestExcelGenerator:
@@ -78,7 +83,6 @@ class TestExcelGenerator:
         assert ws.cell(2, 1).value == 1
     
     def test_create_workbook_with_datetime(self):
-        from datetime import datetime
         generator = ExcelGenerator()
         
         date_val = datetime(2025, 1, 15, 10, 30, 0)
@@ -113,4 +117,273 @@ class TestExcelGenerator:
         result_path = generator.generate_excel(data, file_path, headers)
         
         assert result_path.exists()
-        assert result_path == file_path
\ No newline at end of file
+        assert result_path == file_path
+
+    def test_generate_excel_sheets(self, tmp_path):
+        from openpyxl import load_workbook
+
+        generator = ExcelGenerator()
+        file_path = tmp_path / "multi.xlsx"
+
+        generator.generate_excel_sheets(
+            [
+                ("Detalle", [[1, 'First'], [2, 'Second']], ['ID', 'Name']),
+                ("Resumen", [[2]], None),
+            ],
+            file_path
+        )
+
+        wb = load_workbook(file_path)
+        assert wb.sheetnames == ['Detalle', 'Resumen']
+        assert wb['Detalle']['A1'].font.bold is True
+        assert wb['Resumen']['A1'].value == 2
+
+
+class TestSplitting:
+
+    @pytest.fixture
+    def generator(self):
+        generator = ExcelGenerator()
+        generator.max_sheet_rows = 3
+        return generator
+
+    def sheets(self, path):
+        wb = load_workbook(path)
+        return {ws.title: [list(r) for r in ws.iter_rows(values_only=True)] for ws in wb}
+
+    def test_create_workbook_continues_past_row_limit(self, generator):
+        wb = generator.create_workbook([[i] for i in range(5)], ['N'])
+
+        assert wb.sheetnames == ['Reporte', 'Reporte (2)', 'Reporte (3)']
+        assert [c.value for c in wb['Reporte (3)']['A']] == ['N', 4]
+
+    def test_stream_splits_sheets_with_headers(self, generator, tmp_path):
+        files = generator.generate_excel_stream(
+            iter([[i, 'x'] for i in range(5)]), tmp_path / 'r.xlsx', ['N', 'TEXT']
+        )
+
+        assert files == [tmp_path / 'r.xlsx']
+        sheets = self.sheets(files[0])
+        assert list(sheets) == ['Reporte', 'Reporte (2)', 'Reporte (3)']
+        assert sheets['Reporte'] == [['N', 'TEXT'], [0, 'x'], [1, 'x']]
+        assert sheets['Reporte (3)'] == [['N', 'TEXT'], [4, 'x']]
+
+    def test_stream_splits_files(self, tmp_path):
+        files = ExcelGenerator().generate_excel_stream(
+            [[i] for i in range(5)], tmp_path / 'r.xlsx', ['N'], policy=SplitPolicy(max_file_rows=2)
+        )
+
+        assert [f.name for f in files] == ['r_parte1.xlsx', 'r_parte2.xlsx', 'r_parte3.xlsx']
+        assert self.sheets(files[2]) == {'Reporte': [['N'], [4]]}
+
+    def test_stream_splits_files_by_bytes(self, tmp_path):
+        files = ExcelGenerator().generate_excel_stream(
+            [['a' * 10] for _ in range(4)], tmp_path / 'r.xlsx',
+            policy=SplitPolicy(max_file_bytes=20)
+        )
+
+        assert len(files) == 2
+
+    def test_stream_splits_by_key_column(self, generator, tmp_path):
+        rows = [['Norte', 1], ['Sur', 2], ['Norte', 3], ['Norte', 4], [None, 5], ['Norte', 6]]
+
+        files = generator.generate_excel_stream(
+            rows, tmp_path / 'r.xlsx', policy=SplitPolicy(key_column='region'),
+            column_names=['REGION', 'N']
+        )
+
+        sheets = self.sheets(files[0])
+        assert list(sheets) == ['Norte', 'Sur', '(vacio)', 'Norte (2)']
+        assert sheets['Norte'] == [['Norte', 1], ['Norte', 3], ['Norte', 4]]
+
+    def test_stream_unknown_key_column(self, tmp_path):
+        with pytest.raises(PipelineError):
+            ExcelGenerator().generate_excel_stream(
+                [], tmp_path / 'r.xlsx', ['A'], policy=SplitPolicy(key_column='B')
+            )
+
+    def test_stream_empty_writes_headers(self, tmp_path):
+        files = ExcelGenerator().generate_excel_stream([], tmp_path / 'r.xlsx', ['A'])
+
+        assert self.sheets(files[0]) == {'Reporte': [['A']]}
+
+    def test_sheet_title_sanitized_and_unique(self):
+        taken = set()
+        assert sheet_title('a/b', taken) == 'a_b'
+        assert sheet_title('A/B', taken) == 'A_B~2'
+        assert len(sheet_title('x' * 40, taken)) == 31
+
+    def test_policy_from_config(self):
+        config = Mock()
+        config.getint.side_effect = lambda section, key, default=None: {
+            'filas_por_hoja': 1000, 'filas_por_archivo': 0
+        }[key]
+        config.get.side_effect = lambda section, key, default=None: {
+            'megabytes_por_archivo': '1.5', 'columna': 'REGION'
+        }[key]
+
+        policy = SplitPolicy.from_config(config)
+
+        assert policy == SplitPolicy(1000, 0, 1572864, 'REGION')
+        config.getint.side_effect = lambda section, key, default=None: 2000000
+        with pytest.raises(ConfigurationError):
+            SplitPolicy.from_config(config)
+
+
+class TestParallel:
+    """Test rendering worksheets in a process pool."""
+
+    @pytest.fixture
+    def generator(self):
+        generator = ExcelGenerator()
+        generator.processes = 2
+        generator.block_rows = 3
+        return generator
+
+    def test_parallel_matches_openpyxl(self, generator, tmp_path):
+        data = [[i, f"item {i}", datetime(2025, 1, 1, i % 24), i * 1.5] for i in range(10)]
+        headers = ['ID', 'Nombre', 'Fecha', 'Monto']
+
+        path = generator.generate_excel(data, tmp_path / 'par.xlsx', headers, 'Datos')
+        ExcelGenerator().generate_excel(data, tmp_path / 'ref.xlsx', headers, 'Datos')
+
+        par, ref = load_workbook(path)['Datos'], load_workbook(tmp_path / 'ref.xlsx')['Datos']
+        assert [[c.value for c in r] for r in par.iter_rows()] == \
+            [[c.value for c in r] for r in ref.iter_rows()]
+        assert par['D2'].number_format == ref['D2'].number_format
+        assert par['A1'].font.bold
+
+    def test_parallel_sheets_and_row_limit(self, generator, tmp_path):
+        generator.max_sheet_rows = 4
+        path = generator.generate_excel_sheets(
+            [('Uno', [[i] for i in range(5)], ['N']), ('Dos', [], None)],
+            tmp_path / 'multi.xlsx'
+        )
+
+        wb = load_workbook(path)
+        assert wb.sheetnames == ['Uno', 'Uno (2)', 'Dos']
+        assert [r[0] for r in wb['Uno (2)'].iter_rows(values_only=True)] == ['N', 3, 4]
+
+
+class TestNativeEngine:
+    """Test the native xlsx writer engine."""
+
+    def test_engine_from_config(self):
+        config = Mock()
+        config.get.side_effect = lambda section, key, default=None: \
+            'nativo' if key == 'motor_excel' else default
+        config.getint.side_effect = lambda section, key, default=None: default
+        assert ExcelGenerator(config).engine == 'nativo'
+        assert ExcelGenerator().engine == 'openpyxl'
+
+    def test_native_matches_openpyxl(self, tmp_path):
+        data = [[i, f"item {i % 3}", datetime(2025, 1, 1, i % 24), i * 1.5, None]
+                for i in range(10)]
+        headers = ['ID', 'Nombre', 'Fecha', 'Monto', 'Nota']
+        native = ExcelGenerator()
+        native.engine = 'nativo'
+        native.block_rows = 4
+
+        native.generate_excel_sheets(
+            [('Datos', data, headers), ('Otra', [['x', 1]], None)], tmp_path / 'nat.xlsx'
+        )
+        ExcelGenerator().generate_excel_sheets(
+            [('Datos', data, headers), ('Otra', [['x', 1]], None)], tmp_path / 'ref.xlsx'
+        )
+
+        nat, ref = load_workbook(tmp_path / 'nat.xlsx'), load_workbook(tmp_path / 'ref.xlsx')
+        assert nat.sheetnames == ref.sheetnames
+        for name in ref.sheetnames:
+            assert [[(c.value, c.number_format, c.font.b) for c in r] for r in nat[name].iter_rows()] == \
+                [[(c.value, c.number_format, c.font.b) for c in r] for r in ref[name].iter_rows()]
+
+
+    @pytest.mark.parametrize('engine,processes', [('nativo', 1), ('openpyxl', 2)])
+    def test_stream_matches_openpyxl(self, engine, processes, tmp_path):
+        rows = [[['Norte', 'Sur'][i % 2], i, f"item {i % 3}", datetime(2025, 1, 1, i % 24), i * 1.5]
+                for i in range(11)]
+        headers = ['Region', 'ID', 'Nombre', 'Fecha', 'Monto']
+        policy = SplitPolicy(max_sheet_rows=4, max_file_rows=8, key_column='Region')
+        native = ExcelGenerator()
+        native.engine, native.processes = engine, processes
+        reference = ExcelGenerator()
+        for generator in (native, reference):
+            generator.layout = LayoutOptions(auto_width=True, sample_rows=3, autofilter=True)
+
+        files = native.generate_excel_stream(iter(rows), tmp_path / 'nat.xlsx', headers, policy=policy)
+        expected = reference.generate_excel_stream(iter(rows), tmp_path / 'ref.xlsx', headers,
+                                                   policy=policy)
+
+        assert [f.name for f in files] == ['nat_parte1.xlsx', 'nat_parte2.xlsx']
+        for path, ref_path in zip(files, expected):
+            assert 'docProps/app.xml' not in zipfile.ZipFile(path).namelist()
+            nat, ref = load_workbook(path), load_workbook(ref_path)
+            assert nat.sheetnames == ref.sheetnames
+            for name in ref.sheetnames:
+                assert [[(c.value, c.number_format, c.font.b) for c in r] for r in nat[name].iter_rows()] == \
+                    [[(c.value, c.number_format, c.font.b) for c in r] for r in ref[name].iter_rows()]
+                assert nat[name].auto_filter.ref == ref[name].auto_filter.ref
+                assert nat[name].column_dimensions['C'].width == ref[name].column_dimensions['C'].width
+
+
+class TestLayout:
+    """Test column widths, frozen header and autofilter."""
+
+    @pytest.fixture
+    def generator(self):
+        generator = ExcelGenerator()
+        generator.layout = LayoutOptions(auto_width=True, sample_rows=2, max_width=30,
+                                         freeze_header=True, autofilter=True)
+        return generator
+
+    def test_options_from_config(self):
+        config = Mock()
+        config.getboolean.side_effect = lambda section, key, default=None: key != 'autofiltro'
+        config.getint.side_effect = lambda section, key, default=None: \
+            {'filas_muestra': 50, 'ancho_maximo': 0}.get(key, default)
+        options = LayoutOptions.from_config(config)
+        assert options.auto_width and options.freeze_header and not options.autofilter
+        assert options.sample_rows == 50 and options.max_width == 1
+
+    def test_default_leaves_layout_alone(self, tmp_path):
+        path = ExcelGenerator().generate_excel([[1, 'a']], tmp_path / 'out.xlsx', ['ID', 'N'])
+        ws = load_workbook(path).active
+        assert ws.freeze_panes is None and ws.auto_filter.ref is None
+        assert 'B' not in ws.column_dimensions
+
+    def test_workbook_uses_running_max(self, generator, tmp_path):
+        data = [[1, 'a'], [2, 'b'], [3, 'x' * 20], [1234567.5, 'y' * 100]]
+        path = generator.generate_excel(data, tmp_path / 'out.xlsx', ['ID', 'Nombre'])
+
+        ws = load_workbook(path).active
+        assert ws.column_dimensions['A'].width == len('1,234,567.50') + 2
+        assert ws.column_dimensions['B'].width == 30
+        assert ws.freeze_panes == 'A2'
+        assert ws.auto_filter.ref == 'A1:B5'
+
+    def test_stream_sizes_on_sample(self, generator, tmp_path):
+        rows = [[1, 'abc'], [2, 'abcdefghij'], [3, 'x' * 25]]
+        policy = SplitPolicy(max_sheet_rows=3)
+        paths = generator.generate_excel_stream(iter(rows), tmp_path / 'out.xlsx',
+                                                ['ID', 'Nombre'], policy=policy)
+
+        wb = load_workbook(paths[0])
+        assert wb.sheetnames == ['Reporte', 'Reporte (2)']
+        for ws in wb.worksheets:
+            assert ws.column_dimensions['A'].width == 8
+            assert ws.column_dimensions['B'].width == 12
+            assert ws.freeze_panes == 'A2'
+        assert wb['Reporte'].auto_filter.ref == 'A1:B3'
+        assert wb['Reporte (2)'].auto_filter.ref == 'A1:B2'
+
+    @pytest.mark.parametrize('engine', ['nativo', 'openpyxl'])
+    def test_native_layout_matches(self, generator, engine, tmp_path):
+        generator.engine = engine
+        generator.layout.sample_rows = 1000
+        data = [[i, 'z' * i, datetime(2025, 1, 1)] for i in range(12)]
+        path = generator.generate_excel(data, tmp_path / f'{engine}.xlsx', ['ID', 'Texto', 'Fecha'])
+
+        ws = load_workbook(path).active
+        assert [ws.column_dimensions[c].width for c in 'ABC'] == [8, 13, 21]
+        assert ws.freeze_panes == 'A2'
+        assert ws.auto_filter.ref == 'A1:C13'
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for QueryInstrumentation."""
+
+import sys
+sys.path.append('.')
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+from src.core.instrumentation import QueryInstrumentation, StageTimer, estimate_row_bytes
+
+
+class TestQueryInstrumentation:
+
+    @pytest.fixture
+    def settings(self):
+        return {'umbral_lento_ms': '1000', 'archivo_lentas': ''}
+
+    @pytest.fixture
+    def config(self, settings):
+        config = Mock()
+        config.get.side_effect = lambda section, key, default=None: settings.get(key, default)
+        return config
+
+    def test_measure_records_totals(self, config):
+        instrumentation = QueryInstrumentation(config)
+
+        with instrumentation.measure("SELECT *\n  FROM reports", {'date': 1}) as stats:
+            stats.executed()
+            stats.fetched([(1, 'abc'), (2, 'def')])
+            stats.fetched([])
+
+        run = instrumentation.summary()
+        assert run.statements == 1
+        assert run.rows == 2
+        assert run.round_trips == 2
+        assert run.bytes == 22
+        assert run.rows_per_round_trip == 1.0
+        assert run.by_statement["SELECT * FROM reports"]['calls'] == 1
+        assert run.slow_statements == 0
+
+    def test_failed_statement_is_counted(self, config):
+        instrumentation = QueryInstrumentation(config)
+
+        with pytest.raises(ValueError):
+            with instrumentation.measure("SELECT 1"):
+                raise ValueError("boom")
+
+        assert instrumentation.summary().failed == 1
+
+    def test_slow_query_log_and_hooks(self, config, settings, tmp_path):
+        slow_log = tmp_path / 'lentas.jsonl'
+        settings.update(umbral_lento_ms='0', archivo_lentas=str(slow_log))
+        instrumentation = QueryInstrumentation(config)
+        seen = []
+        instrumentation.add_hook(seen.append)
+
+        with instrumentation.measure("SELECT 1", {'d': datetime(2025, 1, 15)}) as stats:
+            stats.executed()
+
+        entry = json.loads(slow_log.read_text().splitlines()[0])
+        assert entry['statement'] == "SELECT 1"
+        assert entry['params'] == {'d': '2025-01-15T00:00:00'}
+        assert instrumentation.summary().slow_statements == 1
+        assert len(seen) == 1
+
+    def test_estimate_row_bytes(self):
+        assert estimate_row_bytes((1, None, 'abcd', b'xy')) == 14
+
+
+class TestStageTimer:
+
+    def test_stages_accumulate_and_merge(self):
+        timer = StageTimer()
+        with timer.stage('extract'):
+            pass
+        with timer.stage('extract'):
+            pass
+        timer.add('write', 0.5)
+
+        other = StageTimer()
+        other.merge(timer.snapshot())
+        other.add('write', 0.25)
+
+        snapshot = other.snapshot()
+        assert snapshot['extract']['calls'] == 2
+        assert snapshot['write'] == {'calls': 2, 'seconds': 0.75}
+        table = other.format_table()
+        assert list(snapshot) == ['extract', 'write']
+        assert 'write' in table and '0.750' in table
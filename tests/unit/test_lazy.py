@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for deferred imports."""
+
+import sys
+sys.path.append('.')
+import subprocess
+from unittest.mock import patch
+
+from src.core.lazy import lazy_import
+
+
+class TestLazyModule:
+
+    def test_imports_on_first_use(self):
+        module = lazy_import('json')
+
+        assert module.loaded is False
+        assert module.dumps([1]) == '[1]'
+        assert module.loaded is True
+
+    def test_patch_does_not_modify_real_module(self):
+        import json
+        module = lazy_import('json')
+
+        with patch.object(module, 'dumps', return_value='patched'):
+            assert module.dumps([1]) == 'patched'
+            assert json.dumps([1]) == '[1]'
+        assert module.dumps([1]) == '[1]'
+
+    def test_processor_import_skips_heavy_dependencies(self):
+        code = (
+            "import sys; import src.reports.processor; "
+            "print(','.join(m for m in ('oracledb', 'openpyxl', 'pandas', 'pyarrow', "
+            "'smtplib', 'ftplib') if m in sys.modules))"
+        )
+        completed = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True
+        )
+
+        assert completed.stdout.strip() == ''
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for ParquetGenerator."""
+
+import sys
+sys.path.append('.')
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+import pyarrow.parquet as pq
+
+from src.core.parquet import ParquetGenerator
+from src.core.exceptions import PipelineError
+
+
+class TestParquetGenerator:
+
+    def test_init_from_config(self):
+        config = Mock()
+        config.get.return_value = 'zstd'
+        config.getint.return_value = 500
+        generator = ParquetGenerator(config)
+        assert generator.compression == 'zstd'
+        assert generator.batch_rows == 500
+
+    def test_writes_batches_as_row_groups(self, tmp_path):
+        generator = ParquetGenerator()
+        generator.batch_rows = 2
+        rows = [[1, 'a', datetime(2025, 1, 15)], [2, None, None], [3, 'c', datetime(2025, 1, 16)]]
+
+        path = generator.generate_parquet(iter(rows), tmp_path / 'r.parquet', ['ID', 'N', 'F'])
+
+        table = pq.read_table(path)
+        assert table.column_names == ['ID', 'N', 'F']
+        assert [list(r.values()) for r in table.to_pylist()] == rows
+        assert pq.ParquetFile(path).num_row_groups == 2
+
+    def test_empty_keeps_columns(self, tmp_path):
+        path = ParquetGenerator().generate_parquet([], tmp_path / 'r.parquet', ['ID', 'N'])
+        table = pq.read_table(path)
+        assert table.num_rows == 0
+        assert table.column_names == ['ID', 'N']
+
+    def test_integers_then_decimals_promote_column(self, tmp_path):
+        generator = ParquetGenerator()
+        generator.batch_rows = 2
+        rows = [[1, 'a'], [2, 'b'], [2.5, 'c'], [4, 'd']]
+
+        path = generator.generate_parquet(rows, tmp_path / 'r.parquet', ['MONTO', 'N'])
+
+        table = pq.read_table(path)
+        assert str(table.schema.field('MONTO').type) == 'double'
+        assert table.column('MONTO').to_pylist() == [1.0, 2.0, 2.5, 4.0]
+        assert table.column('N').to_pylist() == ['a', 'b', 'c', 'd']
+        assert pq.ParquetFile(path).num_row_groups == 2
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_all_null_first_batch_takes_later_type(self, tmp_path):
+        generator = ParquetGenerator()
+        generator.batch_rows = 2
+        rows = [[1, None], [2, None], [3, 1.5], [4, None], [5, 2.0]]
+
+        path = generator.generate_parquet(rows, tmp_path / 'r.parquet', ['ID', 'MONTO'])
+
+        table = pq.read_table(path)
+        assert str(table.schema.field('MONTO').type) == 'double'
+        assert table.column('MONTO').to_pylist() == [None, None, 1.5, None, 2.0]
+        assert pq.ParquetFile(path).num_row_groups == 3
+
+    def test_incompatible_batch_raises(self, tmp_path):
+        generator = ParquetGenerator()
+        generator.batch_rows = 1
+
+        with pytest.raises(PipelineError):
+            generator.generate_parquet([[1], ['x']], tmp_path / 'r.parquet', ['ID'])
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for PartitionedExtractor."""
+
+import sys
+sys.path.append('.')
+import sqlite3
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+from src.core.partition import PartitionedExtractor, partition_query
+from src.core.exceptions import DatabaseError, ConfigurationError
+
+
+QUERY = "SELECT * FROM reports WHERE report_date = :date"
+DATE = datetime(2025, 1, 15)
+
+
+class TestPartitionedExtractor:
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        path = tmp_path / 'reports.db'
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE reports (id INTEGER, report_date TEXT, created_at TEXT)")
+        conn.executemany(
+            "INSERT INTO reports VALUES (?, ?, ?)",
+            [(i, '2025-01-15 00:00:00', f"2025-01-15 {i % 24:02d}:30:00") for i in range(1, 101)]
+            + [(999, '2025-01-16 00:00:00', '2025-01-16 10:00:00')]
+        )
+        conn.commit()
+        conn.close()
+        return path
+
+    @pytest.fixture
+    def settings(self, db_path):
+        return {
+            'motor': 'sqlite', 'ruta': str(db_path),
+            'particiones': 4, 'estrategia': 'hash', 'columna': 'id',
+        }
+
+    @pytest.fixture
+    def config(self, settings):
+        config = Mock()
+        config.getboolean.return_value = True
+        config.getint.side_effect = lambda section, key, default=None: settings.get(key, default)
+        config.get.side_effect = lambda section, key, default=None: settings.get(key, default)
+        return config
+
+    @pytest.mark.parametrize('strategy,column', [
+        ('hash', 'id'), ('rowid', 'id'), ('time', 'created_at')
+    ])
+    def test_parts_are_disjoint_and_complete(self, config, settings, strategy, column):
+        settings.update(estrategia=strategy, columna=column)
+        with PartitionedExtractor(config) as extractor:
+            parts = extractor.fetch_parts(QUERY, {'date': DATE}, DATE)
+
+        ids = [row[0] for part in parts for row in part]
+        assert len(parts) == 4
+        assert sorted(ids) == list(range(1, 101))
+        assert all(part for part in parts)
+        assert extractor.column_names == ['id', 'report_date', 'created_at']
+
+    @pytest.mark.parametrize('strategy,column', [('hash', 'id'), ('time', 'created_at')])
+    def test_null_keys_land_in_first_part(self, db_path, config, settings, strategy, column):
+        conn = sqlite3.connect(db_path)
+        conn.executemany(
+            "INSERT INTO reports VALUES (?, ?, ?)",
+            [(None, '2025-01-15 00:00:00', None), (None, '2025-01-15 00:00:00', None)]
+        )
+        conn.commit()
+        conn.close()
+
+        settings.update(estrategia=strategy, columna=column)
+        with PartitionedExtractor(config) as extractor:
+            parts = extractor.fetch_parts(QUERY, {'date': DATE}, DATE)
+
+        assert sum(len(part) for part in parts) == 102
+        assert [row for row in parts[0] if row[0] is None] == [
+            (None, '2025-01-15 00:00:00', None)
+        ] * 2
+
+    def test_or_condition_is_not_duplicated(self, config):
+        query = "SELECT * FROM reports WHERE report_date = :date OR id = 999"
+        with PartitionedExtractor(config) as extractor:
+            parts = extractor.fetch_parts(query, {'date': DATE}, DATE)
+
+        ids = [row[0] for part in parts for row in part]
+        assert sorted(ids) == list(range(1, 101)) + [999]
+
+    def test_out_of_day_timestamps_land_in_edge_slices(self, db_path, config, settings):
+        conn = sqlite3.connect(db_path)
+        conn.executemany(
+            "INSERT INTO reports VALUES (?, ?, ?)",
+            [(201, '2025-01-15 00:00:00', '2025-01-14 23:10:00'),
+             (202, '2025-01-15 00:00:00', '2025-01-16 02:00:00')]
+        )
+        conn.commit()
+        conn.close()
+        settings.update(estrategia='time', columna='created_at')
+
+        with PartitionedExtractor(config) as extractor:
+            parts = extractor.fetch_parts(QUERY, {'date': DATE}, DATE)
+
+        assert sum(len(part) for part in parts) == 102
+        assert 201 in [row[0] for row in parts[0]]
+        assert 202 in [row[0] for row in parts[-1]]
+
+    def test_time_slices_follow_each_other(self, config, settings):
+        settings.update(estrategia='time', columna='created_at')
+        extractor = PartitionedExtractor(config)
+        parts = extractor.fetch_parts(QUERY, {'date': DATE}, DATE)
+        merged = extractor.fetch(QUERY, {'date': DATE}, DATE)
+        extractor.close()
+
+        for earlier, later in zip(parts, parts[1:]):
+            assert max(row[2] for row in earlier) < min(row[2] for row in later)
+        assert merged == [row for part in parts for row in part]
+
+    def test_connections_are_pooled(self, config, settings):
+        settings['particiones'] = 2
+        extractor = PartitionedExtractor(config)
+        extractor.fetch(QUERY, {'date': DATE}, DATE)
+        extractor.fetch(QUERY, {'date': DATE}, DATE)
+
+        assert len(extractor._connections) <= 2
+        extractor.close()
+        assert extractor._connections == []
+
+    def test_invalid_strategy(self, config, settings):
+        settings['estrategia'] = 'range'
+        with pytest.raises(ConfigurationError, match="Unknown partition strategy"):
+            PartitionedExtractor(config)
+
+    def test_partition_query(self):
+        assert partition_query("SELECT * FROM t", "x = 1") == "SELECT * FROM t WHERE (x = 1)"
+        assert partition_query(QUERY, "x = 1").endswith("WHERE (report_date = :date) AND (x = 1)")
+        assert partition_query("SELECT * FROM t WHERE a = 1 OR b = 2;", "x = 1") == (
+            "SELECT * FROM t WHERE (a = 1 OR b = 2) AND (x = 1)"
+        )
+        assert partition_query("SELECT * FROM (SELECT * FROM t WHERE a = 1) v", "x = 1") == (
+            "SELECT * FROM (SELECT * FROM t WHERE a = 1) v WHERE (x = 1)"
+        )
+        with pytest.raises(DatabaseError):
+            partition_query("SELECT * FROM t ORDER BY id", "x = 1")
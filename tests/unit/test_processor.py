@@ -111,7 +111,7 @@ class TestReportProcessor:
         from datetime import datetime
         
         config, db, email, excel, ftp = mock_components
-        config.getboolean.return_value = True  # dry_run = True
+        config.getboolean.side_effect = lambda section, key, default=None: section == 'MODO'  # dry_run = True
         
         processor = ReportProcessor(config, db, email, excel, ftp)
         output = tmp_path / "report.xlsx"
@@ -171,4 +171,573 @@ class TestReportProcessor:
         result = processor.process(date, output, upload_ftp=False, send_email=False)
         
         assert result.success is True
-        email.notify_success.assert_not_called()
\ No newline at end of file
+        email.notify_success.assert_not_called()
+
+    @pytest.fixture
+    def ledger(self, tmp_path):
+        from src.core.dedup import DeliveryLedger
+
+        ledger_config = Mock()
+        ledger_config.getboolean.return_value = True
+        ledger_config.get.return_value = str(tmp_path / "ledger.json")
+        return DeliveryLedger(ledger_config)
+
+    @pytest.fixture
+    def delivering_ftp(self, mock_components):
+        ftp = mock_components[4]
+        ftp.__enter__ = Mock(return_value=ftp)
+        ftp.__exit__ = Mock(return_value=False)
+        return ftp
+
+    def test_process_skips_unchanged_source(self, mock_components, ledger, delivering_ftp, tmp_path):
+        from datetime import datetime
+
+        config, db, email, excel, ftp = mock_components
+        db.check_data_exists.return_value = (True, 1)
+        db.get_source_fingerprint.return_value = 'fp-1'
+        db.execute_query.return_value = [(1, 'Test', 100.50)]
+        excel.generate_excel.side_effect = lambda data, path, headers: path.write_bytes(b'x')
+
+        processor = ReportProcessor(config, db, email, excel, ftp, ledger=ledger)
+        output = tmp_path / "report.xlsx"
+        date = datetime(2025, 1, 15)
+
+        first = processor.process(date, output)
+        second = processor.process(date, output)
+
+        assert first.skipped is False
+        assert second.skipped is True
+        assert second.reason == "Source data unchanged"
+        assert second.records_processed == 1
+        assert excel.generate_excel.call_count == 1
+        assert email.notify_success.call_count == 1
+        assert ledger.get(date, output).channels == ['ftp', 'email']
+
+    def test_process_skips_delivery_when_output_unchanged(
+        self, mock_components, ledger, delivering_ftp, tmp_path
+    ):
+        from datetime import datetime
+
+        config, db, email, excel, ftp = mock_components
+        db.check_data_exists.return_value = (True, 1)
+        db.get_source_fingerprint.side_effect = ['fp-1', 'fp-2']
+        db.execute_query.return_value = [(1, 'Test', 100.50)]
+
+        processor = ReportProcessor(config, db, email, excel, ftp, ledger=ledger)
+        output = tmp_path / "report.xlsx"
+        date = datetime(2025, 1, 15)
+
+        processor.process(date, output)
+        second = processor.process(date, output)
+
+        assert second.skipped is True
+        assert second.reason == "Output unchanged"
+        assert second.source_fingerprint == 'fp-2'
+        assert excel.generate_excel.call_count == 2
+        assert email.notify_success.call_count == 1
+
+    def test_process_delivers_when_headers_change(
+        self, mock_components, ledger, delivering_ftp, tmp_path
+    ):
+        from datetime import datetime
+
+        config, db, email, excel, ftp = mock_components
+        db.check_data_exists.return_value = (True, 1)
+        db.get_source_fingerprint.side_effect = ['fp-1', 'fp-2']
+        db.execute_query.return_value = [(1, 'Test', 100.50)]
+
+        processor = ReportProcessor(config, db, email, excel, ftp, ledger=ledger)
+        output = tmp_path / "report.xlsx"
+        date = datetime(2025, 1, 15)
+
+        first = processor.process(date, output, ['Id', 'Name', 'Value'])
+        second = processor.process(date, output, ['ID', 'NOMBRE', 'MONTO'])
+
+        assert first.content_hash != second.content_hash
+        assert second.skipped is False
+        assert email.notify_success.call_count == 2
+
+    def test_process_without_delivery_is_not_recorded(self, mock_components, ledger, tmp_path):
+        from datetime import datetime
+
+        config, db, email, excel, ftp = mock_components
+        db.check_data_exists.return_value = (True, 1)
+        db.get_source_fingerprint.return_value = 'fp-1'
+        db.execute_query.return_value = [(1, 'Test', 100.50)]
+        excel.generate_excel.side_effect = lambda data, path, headers: path.write_bytes(b'x')
+
+        processor = ReportProcessor(config, db, email, excel, ftp, ledger=ledger)
+        output = tmp_path / "report.xlsx"
+        date = datetime(2025, 1, 15)
+
+        processor.process(date, output, upload_ftp=False, send_email=False)
+        assert ledger.get(date, output) is None
+
+        second = processor.process(date, output, upload_ftp=False)
+        assert second.skipped is False
+        assert email.notify_success.call_count == 1
+        assert ledger.get(date, output).channels == ['email']
+
+    def test_process_regenerates_when_a_file_is_missing(self, mock_components, ledger, tmp_path):
+        from datetime import datetime
+
+        config, db, email, excel, ftp = mock_components
+        config.get.side_effect = lambda section, key, default=None: (
+            'csv,parquet' if (section, key) == ('REPORTE', 'formato') else default
+        )
+        config.getint.side_effect = lambda section, key, default=None: default
+        db.check_data_exists.return_value = (True, 1)
+        db.get_source_fingerprint.return_value = 'fp-1'
+        db.execute_query.return_value = [(1, 'Test', 100.50)]
+        db.get_column_names.return_value = ['ID', 'NAME', 'VALUE']
+
+        processor = ReportProcessor(config, db, email, excel, ftp, ledger=ledger)
+        output = tmp_path / "report.csv"
+        date = datetime(2025, 1, 15)
+
+        processor.process(date, output, upload_ftp=False)
+        assert ledger.get(date, output).files == [str(output), str(tmp_path / "report.parquet")]
+
+        (tmp_path / "report.parquet").unlink()
+        second = processor.process(date, output, upload_ftp=False)
+
+        assert second.reason == "Output unchanged"
+        assert second.files == [output, tmp_path / "report.parquet"]
+        assert second.file_generated == output
+        assert (tmp_path / "report.parquet").exists()
+
+    def test_generate_report_renders_from_snapshot(self, mock_components, tmp_path):
+        from datetime import datetime
+        from src.core.snapshot import SnapshotCache
+
+        config, db, email, excel, ftp = mock_components
+        config.get.return_value = 'ventas'
+        db.execute_query.return_value = [(1, 'Test', 100.50)]
+        db.get_column_names.return_value = ['ID', 'NAME', 'VALUE']
+
+        cache_config = Mock()
+        cache_config.getboolean.return_value = True
+        cache_config.get.return_value = str(tmp_path / "cache")
+        cache_config.getint.return_value = 10
+        snapshots = SnapshotCache(cache_config)
+
+        processor = ReportProcessor(config, db, email, excel, ftp, snapshots=snapshots)
+        date = datetime(2025, 1, 15)
+
+        processor.generate_report(date, tmp_path / "a.xlsx", fingerprint='fp-1')
+        count = processor.generate_report(date, tmp_path / "b.csv", ['Id', 'Name', 'Value'], 'fp-1')
+
+        assert count == 1
+        assert db.execute_query.call_count == 1
+        excel.generate_excel.assert_called_with(
+            [[1, 'Test', 100.50]], tmp_path / "b.csv", ['Id', 'Name', 'Value']
+        )
+
+        processor.generate_report(date, tmp_path / "c.xlsx", fingerprint='fp-2')
+        assert db.execute_query.call_count == 2
+
+    def test_extract_incremental_merges_new_rows(self, mock_components, tmp_path):
+        from datetime import datetime
+        from src.core.snapshot import SnapshotCache
+
+        config, db, email, excel, ftp = mock_components
+        config.getboolean.side_effect = lambda section, key, default=False: (
+            section == 'INCREMENTAL'
+        )
+        config.get.side_effect = lambda section, key, default=None: {
+            ('INCREMENTAL', 'columna_marca'): 'SEQ',
+            ('INCREMENTAL', 'columna_clave'): 'ID',
+        }.get((section, key), 'ventas')
+        db.get_column_names.return_value = ['ID', 'VALUE', 'SEQ']
+        db.execute_query.return_value = [(1, 10.0, 5), (2, 20.0, 6)]
+        db.fetch_since.return_value = [(2, 25.0, 7), (3, 30.0, 8)]
+
+        cache_config = Mock()
+        cache_config.getboolean.return_value = True
+        cache_config.get.return_value = str(tmp_path / "cache")
+        cache_config.getint.return_value = 10
+        snapshots = SnapshotCache(cache_config)
+
+        processor = ReportProcessor(config, db, email, excel, ftp, snapshots=snapshots)
+        date = datetime(2025, 1, 15)
+
+        assert processor.extract(date) == [(1, 10.0, 5), (2, 20.0, 6)]
+        merged = processor.extract(date)
+
+        assert merged == [(1, 10.0, 5), (2, 25.0, 7), (3, 30.0, 8)]
+        db.fetch_since.assert_called_once_with(
+            "SELECT * FROM reports WHERE report_date = :date", {'date': date}, 'SEQ', 6
+        )
+        stored = snapshots.get('ventas', date)
+        assert SnapshotCache.read_watermark(stored) == 8
+
+    @pytest.fixture
+    def incremental_processor(self, mock_components, tmp_path):
+        from src.core.snapshot import SnapshotCache
+
+        config, db, email, excel, ftp = mock_components
+        config.getboolean.side_effect = lambda section, key, default=False: (
+            section == 'INCREMENTAL'
+        )
+        config.get.side_effect = lambda section, key, default=None: {
+            ('INCREMENTAL', 'columna_marca'): 'SEQ',
+            ('INCREMENTAL', 'columna_clave'): 'ID',
+        }.get((section, key), 'ventas')
+        db.get_column_names.return_value = ['ID', 'VALUE', 'SEQ']
+        db.fetch_since.return_value = []
+
+        cache_config = Mock()
+        cache_config.getboolean.return_value = True
+        cache_config.get.return_value = str(tmp_path / "cache")
+        cache_config.getint.return_value = 10
+
+        return ReportProcessor(
+            config, db, email, excel, ftp, snapshots=SnapshotCache(cache_config)
+        )
+
+    def test_extract_incremental_reextracts_after_delete(self, incremental_processor):
+        from datetime import datetime
+
+        processor = incremental_processor
+        db = processor.db
+        date = datetime(2025, 1, 15)
+        db.execute_query.return_value = [(1, 10.0, 5), (2, 20.0, 6)]
+        processor.extract(date, 'fp-1')
+
+        db.execute_query.return_value = [(2, 20.0, 6)]
+        db.fetch_since.return_value = [(2, 20.0, 6)]
+        rows = processor.extract(date, 'fp-2')
+
+        assert rows == [(2, 20.0, 6)]
+        assert db.execute_query.call_count == 2
+        assert processor.snapshots.get('ventas', date).num_rows == 1
+
+    def test_extract_incremental_picks_up_update_at_watermark(self, incremental_processor):
+        from datetime import datetime
+
+        processor = incremental_processor
+        db = processor.db
+        date = datetime(2025, 1, 15)
+        db.execute_query.return_value = [(1, 10.0, 5), (2, 20.0, 6)]
+        processor.extract(date, 'fp-1')
+
+        db.fetch_since.return_value = [(2, 22.0, 6)]
+        rows = processor.extract(date, 'fp-2')
+
+        assert rows == [(1, 10.0, 5), (2, 22.0, 6)]
+        assert db.execute_query.call_count == 1
+        assert db.fetch_since.call_args[0][3] == 6
+        assert processor.snapshots.get('ventas', date).num_rows == 2
+
+    def test_extract_incremental_reextracts_on_count_mismatch(self, incremental_processor):
+        from datetime import datetime
+
+        processor = incremental_processor
+        db = processor.db
+        date = datetime(2025, 1, 15)
+        db.execute_query.return_value = [(1, 10.0, 5), (2, 20.0, 6)]
+        processor.extract(date)
+
+        db.check_data_exists.return_value = (True, 1)
+        db.execute_query.return_value = [(2, 20.0, 6)]
+        assert processor.check_data_exists(date) is True
+        rows = processor.extract(date)
+
+        assert rows == [(2, 20.0, 6)]
+        assert db.execute_query.call_count == 2
+
+    def test_process_passes_summary_total_to_email(self, mock_components, tmp_path):
+        from datetime import datetime
+        from src.core.summary import SummaryStage
+
+        config, db, email, excel, ftp = mock_components
+        db.check_data_exists.return_value = (True, 2)
+        db.execute_query.return_value = [(1, 'Test', 100.50), (2, 'Other', 50.25)]
+        db.get_column_names.return_value = ['ID', 'NAME', 'VALUE']
+
+        summary_config = Mock()
+        summary_config.getboolean.return_value = True
+        summary_config.get.side_effect = lambda section, key, default=None: {
+            ('RESUMEN', 'columnas'): 'VALUE',
+        }.get((section, key), default)
+
+        processor = ReportProcessor(
+            config, db, email, excel, ftp, summary=SummaryStage(summary_config)
+        )
+        output = tmp_path / "report.xlsx"
+        date = datetime(2025, 1, 15)
+
+        result = processor.process(date, output)
+
+        assert result.summary.total_amount == 150.75
+        email.notify_success.assert_called_once_with(date, output, total_amount=150.75)
+        sheets = excel.generate_excel_sheets.call_args[0][0]
+        assert [name for name, _, _ in sheets] == ['Reporte', 'Resumen']
+
+    def test_generate_parts_writes_one_file_per_partition(self, mock_components, tmp_path):
+        from datetime import datetime
+
+        config, db, email, excel, ftp = mock_components
+        partitioner = Mock()
+        partitioner.enabled = True
+        partitioner.fetch_parts.return_value = [[(1, 'A')], [], [(2, 'B'), (3, 'C')]]
+
+        processor = ReportProcessor(config, db, email, excel, ftp, partitioner=partitioner)
+        paths = processor.generate_parts(datetime(2025, 1, 15), tmp_path / "report.xlsx")
+
+        assert paths == [tmp_path / "report_parte1.xlsx", tmp_path / "report_parte3.xlsx"]
+        assert excel.generate_excel.call_count == 2
+        db.execute_query.assert_not_called()
+
+    def test_prefetched_availability_answers_once(self, mock_components):
+        from datetime import datetime, date
+
+        config, db, email, excel, ftp = mock_components
+        db.check_data_exists_many.return_value = {date(2025, 1, 1): 3, date(2025, 1, 2): 0}
+        db.check_data_exists.return_value = (True, 3)
+
+        processor = ReportProcessor(config, db, email, excel, ftp)
+        processor.prefetch_availability([datetime(2025, 1, 1), datetime(2025, 1, 2)])
+
+        assert processor.check_data_exists(datetime(2025, 1, 1)) is True
+        assert processor.check_data_exists(datetime(2025, 1, 2)) is False
+        db.check_data_exists.assert_not_called()
+        assert processor.check_data_exists(datetime(2025, 1, 1)) is True
+        db.check_data_exists.assert_called_once()
+
+    def test_csv_format_uses_text_writer_and_times_stages(self, mock_components, tmp_path):
+        from datetime import datetime
+
+        config, db, email, excel, ftp = mock_components
+        db.execute_query.return_value = [(1, 'Test', 100.5)]
+        text = Mock()
+
+        processor = ReportProcessor(config, db, email, excel, ftp, text_generator=text)
+        processor.output_format = 'csv'
+        processor.generate_report(datetime(2025, 1, 15), tmp_path / "report.csv")
+
+        text.generate_csv.assert_called_once()
+        excel.generate_excel.assert_not_called()
+        assert set(processor.timer.snapshot()) == {'extract', 'prepare', 'write'}
+
+    def test_split_policy_streams_parts_and_uploads_each(self, mock_components, tmp_path):
+        from datetime import datetime
+
+        config, db, email, excel, ftp = mock_components
+        config.getboolean.side_effect = lambda section, key, default=None: section == 'DIVISION'
+        config.getint.side_effect = lambda section, key, default=None: 2 if key == 'filas_por_archivo' else default
+        config.get.side_effect = lambda section, key, default=None: default
+        db.check_data_exists.return_value = (True, 3)
+        db.execute_query.return_value = [(1,), (2,), (3,)]
+        parts = [tmp_path / 'r_parte1.xlsx', tmp_path / 'r_parte2.xlsx']
+        excel.generate_excel_stream.return_value = parts
+        ftp.__enter__ = Mock(return_value=ftp)
+        ftp.__exit__ = Mock(return_value=False)
+
+        processor = ReportProcessor(config, db, email, excel, ftp)
+        result = processor.process(datetime(2025, 1, 15), tmp_path / 'r.xlsx')
+
+        assert result.success is True
+        assert result.files == parts
+        assert result.file_generated == parts[0]
+        assert excel.generate_excel_stream.call_args[1]['policy'].max_file_rows == 2
+        assert [c[0][0] for c in ftp.upload_file.call_args_list] == parts
+
+    def test_split_policy_keeps_summary_sheet(self, mock_components, tmp_path):
+        from datetime import datetime
+        from openpyxl import load_workbook
+        from src.core.excel import ExcelGenerator, SplitPolicy
+        from src.core.summary import SummaryStage
+
+        config, db, email, excel, ftp = mock_components
+        db.execute_query.return_value = [(1, 10.0), (2, 5.0), (3, 2.5)]
+        db.get_column_names.return_value = ['ID', 'VALUE']
+        summary_config = Mock()
+        summary_config.getboolean.return_value = True
+        summary_config.get.side_effect = lambda section, key, default=None: {
+            ('RESUMEN', 'columnas'): 'VALUE',
+        }.get((section, key), default)
+
+        processor = ReportProcessor(config, db, email, ExcelGenerator(), ftp,
+                                    summary=SummaryStage(summary_config))
+        processor.split_policy = SplitPolicy(max_file_rows=2)
+        processor.generate_report(datetime(2025, 1, 15), tmp_path / 'r.xlsx', ['ID', 'VALUE'])
+
+        first, last = (load_workbook(path) for path in processor.last_files)
+        assert first.sheetnames == ['Reporte']
+        assert last.sheetnames == ['Reporte', 'Resumen']
+        assert last['Resumen']['C2'].value == 17.5
+
+    def test_several_formats_from_one_extraction(self, mock_components, tmp_path):
+        from datetime import datetime
+        import pyarrow.parquet as pq
+        from src.core.excel import ExcelGenerator
+        from src.core.text import TextGenerator
+
+        config, db, email, excel, ftp = mock_components
+        db.execute_query.return_value = [(i, f"item {i}", i * 1.5) for i in range(25)]
+
+        processor = ReportProcessor(config, db, email, ExcelGenerator(), ftp,
+                                    text_generator=TextGenerator())
+        processor.output_format = 'xlsx, csv,parquet'
+        processor.tee_buffer_batches, processor.tee_batch_size = 2, 4
+        count = processor.generate_report(datetime(2025, 1, 15), tmp_path / "r.xlsx", ['ID', 'N', 'M'])
+
+        assert count == 25
+        assert processor.last_files == [tmp_path / "r.xlsx", tmp_path / "r.csv", tmp_path / "r.parquet"]
+        assert all(path.exists() for path in processor.last_files)
+        assert len((tmp_path / "r.csv").read_text(encoding='utf-8-sig').splitlines()) == 26
+        assert pq.read_table(tmp_path / "r.parquet").num_rows == 25
+        assert {'write.xlsx', 'write.csv', 'write.parquet'} <= set(processor.timer.snapshot())
+
+    def test_several_formats_use_excel_engine_and_summary(self, mock_components, tmp_path):
+        from datetime import datetime
+        import zipfile
+        from openpyxl import load_workbook
+        from src.core.excel import ExcelGenerator
+        from src.core.text import TextGenerator
+        from src.core.summary import SummaryStage
+
+        config, db, email, excel, ftp = mock_components
+        db.execute_query.return_value = [(i, i * 1.5) for i in range(10)]
+        db.get_column_names.return_value = ['ID', 'VALUE']
+        summary_config = Mock()
+        summary_config.getboolean.return_value = True
+        summary_config.get.side_effect = lambda section, key, default=None: {
+            ('RESUMEN', 'columnas'): 'VALUE',
+        }.get((section, key), default)
+        excel = ExcelGenerator()
+        excel.engine = 'nativo'
+
+        processor = ReportProcessor(config, db, email, excel, ftp, text_generator=TextGenerator(),
+                                    summary=SummaryStage(summary_config))
+        processor.output_format = 'xlsx,csv'
+        processor.tee_buffer_batches, processor.tee_batch_size = 2, 3
+        processor.generate_report(datetime(2025, 1, 15), tmp_path / "r.xlsx", ['ID', 'VALUE'])
+
+        assert 'docProps/app.xml' not in zipfile.ZipFile(tmp_path / "r.xlsx").namelist()
+        wb = load_workbook(tmp_path / "r.xlsx")
+        assert wb.sheetnames == ['Reporte', 'Resumen']
+        assert wb['Reporte'].max_row == 11
+        assert wb['Resumen']['C2'].value == 67.5
+
+    def test_unknown_format_fails(self, mock_components, tmp_path):
+        from datetime import datetime
+        from src.core.exceptions import PipelineError
+
+        config, db, email, excel, ftp = mock_components
+        db.execute_query.return_value = [(1,)]
+
+        processor = ReportProcessor(config, db, email, excel, ftp)
+        processor.output_format = 'xlsx,pdf'
+        with pytest.raises(PipelineError, match='pdf'):
+            processor.generate_report(datetime(2025, 1, 15), tmp_path / "r.xlsx")
+
+    @pytest.mark.parametrize('mode', ['adjunto', 'solo'])
+    def test_diff_against_previous_snapshot(self, mock_components, tmp_path, mode):
+        from datetime import datetime
+        from openpyxl import load_workbook
+        from src.core.excel import ExcelGenerator
+        from src.core.diff import DiffStage
+        from src.core.snapshot import SnapshotCache
+
+        config, db, email, excel, ftp = mock_components
+        config.getboolean.side_effect = lambda section, key, default=None: \
+            section in ('CACHE', 'DIFERENCIAL')
+        config.get.side_effect = lambda section, key, default=None: {
+            ('CACHE', 'directorio'): str(tmp_path / 'cache'),
+            ('DIFERENCIAL', 'modo'): mode,
+        }.get((section, key), default)
+        config.getint.side_effect = lambda section, key, default=None: default
+        db.get_column_names.return_value = ['ID', 'MONTO']
+        excel = ExcelGenerator()
+
+        processor = ReportProcessor(config, db, email, excel, ftp,
+                                    snapshots=SnapshotCache(config), diff=DiffStage(config))
+        db.execute_query.return_value = [(1, 10.0), (2, 5.0)]
+        processor.generate_report(datetime(2025, 1, 14), tmp_path / "r_14.xlsx")
+        assert processor.last_diff is None
+
+        db.execute_query.return_value = [(1, 10.0), (2, 6.0), (3, 1.0)]
+        processor.generate_report(datetime(2025, 1, 15), tmp_path / "r_15.xlsx")
+
+        diff = processor.last_diff
+        assert (diff.added, diff.changed, diff.unchanged) == (1, 1, 1)
+        changes = tmp_path / ("r_15_cambios.xlsx" if mode == 'adjunto' else "r_15.xlsx")
+        assert processor.last_files[-1] == changes
+        assert len(processor.last_files) == (2 if mode == 'adjunto' else 1)
+        ws = load_workbook(changes)['Cambios']
+        assert ws.max_row == 3
+        assert 'diff' in processor.timer.snapshot()
+
+    @pytest.mark.parametrize('output_format', ['csv', 'xlsx'])
+    def test_memory_budget_spills_and_sorts(self, mock_components, tmp_path, output_format):
+        from datetime import datetime
+        from openpyxl import load_workbook
+        from src.core.excel import ExcelGenerator
+        from src.core.text import TextGenerator
+        from src.core.spill import MemoryBudget
+
+        config, db, email, excel, ftp = mock_components
+        memory_config = Mock()
+        memory_config.get.side_effect = lambda section, key, default=None: {
+            'presupuesto_mb': '0.001', 'directorio_temporal': str(tmp_path / 'spill'),
+            'ordenar_por': 'MONTO',
+        }.get(key, default)
+        memory_config.getint.side_effect = lambda section, key, default=None: 7
+        memory_config.getboolean.return_value = True
+        rows = [(i, f"item {i}", float((i * 37) % 100)) for i in range(100)]
+        db.iter_query.side_effect = lambda query, params: iter(
+            [rows[start:start + 30] for start in range(0, 100, 30)]
+        )
+        db.get_column_names.return_value = ['ID', 'NOMBRE', 'MONTO']
+
+        processor = ReportProcessor(config, db, email, ExcelGenerator(), ftp,
+                                    text_generator=TextGenerator(), memory=MemoryBudget(memory_config))
+        processor.output_format = output_format
+        path = tmp_path / f"r.{output_format}"
+        count = processor.generate_report(datetime(2025, 1, 15), path)
+
+        assert count == 100
+        if output_format == 'csv':
+            amounts = [line.split(';')[2] for line in path.read_text(encoding='utf-8-sig').splitlines()]
+            amounts = [float(a.replace(',', '.')) for a in amounts]
+        else:
+            amounts = [row[2] for row in load_workbook(path).active.iter_rows(values_only=True)]
+        assert amounts == sorted((float((i * 37) % 100) for i in range(100)), reverse=True)
+        assert list((tmp_path / 'spill').iterdir()) == []
+        assert {'extract', 'sort'} <= set(processor.timer.snapshot())
+        db.execute_query.assert_not_called()
+
+    def test_memory_budget_streams_summary_sheet(self, mock_components, tmp_path):
+        from datetime import datetime
+        from openpyxl import load_workbook
+        from src.core.excel import ExcelGenerator
+        from src.core.spill import MemoryBudget
+        from src.core.summary import SummaryStage
+
+        config, db, email, excel, ftp = mock_components
+        memory_config = Mock()
+        memory_config.get.side_effect = lambda section, key, default=None: {
+            'presupuesto_mb': '0.0001', 'directorio_temporal': str(tmp_path / 'spill'),
+        }.get(key, default)
+        memory_config.getint.side_effect = lambda section, key, default=None: 5
+        memory_config.getboolean.return_value = False
+        summary_config = Mock()
+        summary_config.getboolean.return_value = True
+        summary_config.get.side_effect = lambda section, key, default=None: {
+            ('RESUMEN', 'columnas'): 'VALUE',
+        }.get((section, key), default)
+        db.iter_query.return_value = iter([[(i, 2.0) for i in range(20)], [(20, 2.0)]])
+        db.get_column_names.return_value = ['ID', 'VALUE']
+
+        processor = ReportProcessor(config, db, email, ExcelGenerator(), ftp,
+                                    summary=SummaryStage(summary_config),
+                                    memory=MemoryBudget(memory_config))
+        count = processor.generate_report(datetime(2025, 1, 15), tmp_path / 'r.xlsx')
+
+        assert count == 21
+        wb = load_workbook(tmp_path / 'r.xlsx')
+        assert wb.sheetnames == ['Reporte', 'Resumen']
+        assert wb['Reporte'].max_row == 21
+        assert wb['Resumen']['C2'].value == 42.0
@@ -154,4 +154,56 @@ class TestDateRangeReprocessor:
         
         assert result.total == 3
         assert result.skipped == 3
-        assert len(processed) == 0
\ No newline at end of file
+        assert len(processed) == 0
+
+    def test_reprocess_range_with_sqlite_backend(self, mock_config, temp_report_path, tmp_path):
+        import sqlite3
+        from datetime import datetime
+        from src.core.database import DatabaseManager
+        from src.core.excel import ExcelGenerator
+        from src.reports.processor import ReportProcessor
+        from src.utils.synthetic import SyntheticDataGenerator, SyntheticSpec
+
+        db_path = tmp_path / "local.db"
+        SyntheticDataGenerator(
+            SyntheticSpec(rows=300, columns=3, start_date=datetime(2025, 1, 1), days=2)
+        ).load_sqlite(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE VIEW transactions AS SELECT report_date AS transaction_date FROM reports")
+        conn.commit()
+        conn.close()
+
+        config = Mock()
+        config.getboolean.return_value = False
+        config.get.side_effect = lambda section, key, default=None: {
+            ('DATABASE', 'motor'): 'sqlite',
+            ('DATABASE', 'ruta'): str(db_path),
+        }.get((section, key), default)
+        config.getint.side_effect = lambda section, key, default=None: default
+
+        reprocessor = DateRangeReprocessor(mock_config, temp_report_path)
+        with DatabaseManager(config) as db:
+            processor = ReportProcessor(config, db, Mock(), ExcelGenerator())
+            callback = reprocessor.processor_callback(processor, tmp_path / "out", send_email=False)
+            result = reprocessor.reprocess_range(
+                datetime(2025, 1, 1), datetime(2025, 1, 3), callback
+            )
+
+        assert result.successful == 2
+        assert result.failed == 1
+        assert (tmp_path / "out" / "reporte_20250101.xlsx").exists()
+        assert (tmp_path / "out" / "reporte_20250102.xlsx").exists()
+
+    def test_enqueue_range(self, mock_config, temp_report_path):
+        from datetime import datetime
+
+        reprocessor = DateRangeReprocessor(mock_config, temp_report_path)
+        queue = Mock()
+        queue.enqueue.return_value = 3
+
+        assert reprocessor.enqueue_range(
+            queue, 'ventas', datetime(2025, 1, 1), datetime(2025, 1, 3)
+        ) == 3
+        report, dates = queue.enqueue.call_args[0]
+        assert report == 'ventas'
+        assert dates == [datetime(2025, 1, 1), datetime(2025, 1, 2), datetime(2025, 1, 3)]
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for PeriodRollup."""
+
+import sys
+sys.path.append('.')
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+import pyarrow as pa
+from openpyxl import load_workbook
+
+from src.core.excel import ExcelGenerator
+from src.core.snapshot import SnapshotCache
+from src.core.exceptions import PipelineError
+from src.reports.processor import ReportProcessor
+from src.reports.rollup import PeriodRollup, period_bounds
+
+
+class TestPeriodBounds:
+
+    def test_monthly(self):
+        assert period_bounds(datetime(2024, 2, 10), 'monthly') == (
+            datetime(2024, 2, 1), datetime(2024, 2, 29)
+        )
+
+    def test_weekly(self):
+        assert period_bounds(datetime(2025, 1, 15, 12, 30), 'weekly') == (
+            datetime(2025, 1, 13), datetime(2025, 1, 19)
+        )
+
+    def test_unknown_period(self):
+        with pytest.raises(PipelineError, match="Unknown period"):
+            period_bounds(datetime(2025, 1, 15), 'yearly')
+
+
+class TestPeriodRollup:
+
+    @pytest.fixture
+    def processor(self, tmp_path):
+        config = Mock()
+        config.getboolean.return_value = False
+        config.get.return_value = 'ventas'
+
+        cache_config = Mock()
+        cache_config.getboolean.return_value = True
+        cache_config.get.return_value = str(tmp_path / "cache")
+        cache_config.getint.return_value = 10
+
+        db = Mock()
+        db.get_column_names.return_value = ['ID', 'AMOUNT']
+        db.get_source_fingerprint.side_effect = lambda date: f"fp-{date:%Y%m%d}"
+        db.execute_query.side_effect = lambda query, params: (
+            [(params['date'].day, 10.0)] if params['date'].weekday() < 5 else []
+        )
+
+        return ReportProcessor(
+            config, db, Mock(), ExcelGenerator(), snapshots=SnapshotCache(cache_config)
+        )
+
+    def test_requires_snapshot_cache(self):
+        processor = Mock()
+        processor.snapshots = None
+        with pytest.raises(PipelineError, match="snapshot cache"):
+            PeriodRollup(processor)
+
+    def test_collect_fetches_only_missing_days(self, processor):
+        processor.extract(datetime(2025, 1, 13), 'fp-20250113')
+        rollup = PeriodRollup(processor)
+
+        detail, result = rollup.collect(datetime(2025, 1, 13), datetime(2025, 1, 19))
+
+        assert result.days_cached == 1
+        assert result.days_fetched == 6
+        assert len(result.days_without_data) == 2
+        assert result.records == 5
+        assert detail.column_names == ['FECHA', 'ID', 'AMOUNT']
+        assert processor.db.execute_query.call_count == 7
+
+        _, second = rollup.collect(datetime(2025, 1, 13), datetime(2025, 1, 19))
+        assert second.days_cached == 5
+        assert processor.db.execute_query.call_count == 9
+
+    def test_collect_refetches_changed_days(self, processor):
+        rollup = PeriodRollup(processor)
+        rollup.collect(datetime(2025, 1, 13), datetime(2025, 1, 14))
+
+        processor.db.get_source_fingerprint.side_effect = lambda date: (
+            'fp-changed' if date.day == 14 else f"fp-{date:%Y%m%d}"
+        )
+        _, result = rollup.collect(datetime(2025, 1, 13), datetime(2025, 1, 14))
+
+        assert result.days_cached == 1
+        assert result.days_fetched == 1
+        assert processor.db.execute_query.call_count == 3
+
+    def test_summarize_by_day(self, processor):
+        rollup = PeriodRollup(processor)
+        detail, _ = rollup.collect(datetime(2025, 1, 13), datetime(2025, 1, 14))
+
+        headers, rows = rollup.summarize(detail)
+
+        assert headers == ['FECHA', 'REGISTROS', 'ID', 'AMOUNT']
+        assert [row[1:] for row in rows] == [[1, 13, 10.0], [1, 14, 10.0]]
+
+    def test_summarize_counts_null_keys(self):
+        detail = pa.table({'REGION': ['N', None, None], 'AMOUNT': [1.0, 2.0, 3.0]})
+
+        headers, rows = PeriodRollup.summarize(detail, ['REGION'])
+
+        assert headers == ['REGION', 'REGISTROS', 'AMOUNT']
+        assert sorted(rows, key=str) == sorted([['N', 1, 1.0], [None, 2, 5.0]], key=str)
+
+    def test_collect_rejects_existing_date_column(self, processor):
+        processor.db.get_column_names.return_value = ['ID', 'fecha']
+
+        with pytest.raises(PipelineError, match="already has a FECHA column"):
+            PeriodRollup(processor).collect(datetime(2025, 1, 13), datetime(2025, 1, 13))
+
+    def test_build_monthly_workbook(self, processor, tmp_path):
+        output = tmp_path / "monthly.xlsx"
+        result = PeriodRollup(processor).build(datetime(2025, 1, 15), output, 'monthly')
+
+        assert result.records == 23
+        wb = load_workbook(output)
+        assert wb.sheetnames == ['Detalle', 'Resumen']
+        assert wb['Detalle'].max_row == 24
+        assert wb['Resumen'].max_row == 24
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for CronExpression."""
+
+import sys
+sys.path.append('.')
+import pytest
+from datetime import datetime
+
+from src.utils.scheduler import CronExpression
+from src.core.exceptions import ConfigurationError
+
+
+class TestCronExpression:
+
+    def test_daily_time(self):
+        cron = CronExpression("30 7 * * *")
+        assert cron.next_after(datetime(2025, 1, 15, 7, 29)) == datetime(2025, 1, 15, 7, 30)
+        assert cron.next_after(datetime(2025, 1, 15, 7, 30)) == datetime(2025, 1, 16, 7, 30)
+
+    def test_weekdays_and_steps(self):
+        cron = CronExpression("*/15 8-9 * * 1-5")
+        # Saturday 2025-01-18 -> Monday 08:00
+        assert cron.next_after(datetime(2025, 1, 17, 9, 50)) == datetime(2025, 1, 20, 8, 0)
+        assert cron.minutes == {0, 15, 30, 45}
+        assert CronExpression("0 0 * * 7").weekdays == {0}
+
+    def test_day_or_weekday(self):
+        cron = CronExpression("0 6 1 * 1")
+        assert cron.matches(datetime(2025, 1, 1, 6, 0))
+        assert cron.matches(datetime(2025, 1, 6, 6, 0))
+        assert not cron.matches(datetime(2025, 1, 7, 6, 0))
+
+    def test_month_rollover(self):
+        cron = CronExpression("0 0 29 2 *")
+        assert cron.next_after(datetime(2025, 3, 1)) == datetime(2028, 2, 29)
+
+    @pytest.mark.parametrize('expression', ["* * *", "61 * * * *", "a * * * *", "*/0 * * * *"])
+    def test_invalid(self, expression):
+        with pytest.raises(ConfigurationError):
+            CronExpression(expression)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for SnapshotCache."""
+
+import sys
+sys.path.append('.')
+import os
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+from src.core.snapshot import SnapshotCache
+
+
+class TestSnapshotCache:
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        config = Mock()
+        config.getboolean.return_value = True
+        config.get.return_value = str(tmp_path / "cache")
+        config.getint.return_value = 1
+        return SnapshotCache(config)
+
+    @pytest.fixture
+    def rows(self):
+        return [
+            (1, 'Laptop', 1299.99, datetime(2025, 1, 15, 10, 0)),
+            (2, 'Mouse', None, datetime(2025, 1, 15, 11, 0)),
+        ]
+
+    def test_put_and_get_roundtrip(self, cache, rows):
+        date = datetime(2025, 1, 15)
+        path = cache.put('ventas', date, rows, ['ID', 'PRODUCT', 'AMOUNT', 'TS'], 'fp-1')
+
+        assert path.exists()
+        table = cache.get('ventas', date)
+        assert table.column_names == ['ID', 'PRODUCT', 'AMOUNT', 'TS']
+        assert SnapshotCache.table_rows(table) == rows
+
+    def test_previous_date(self, cache, rows):
+        for day in (10, 13, 15):
+            cache.put('ventas', datetime(2025, 1, day), rows)
+        (cache.directory / 'ventas' / 'notes.arrow').write_bytes(b'')
+
+        assert cache.previous_date('ventas', datetime(2025, 1, 15)) == datetime(2025, 1, 13)
+        assert cache.previous_date('ventas', datetime(2025, 1, 10)) is None
+        assert cache.previous_date('otro', datetime(2025, 1, 15)) is None
+
+    def test_generic_column_names(self, cache, rows):
+        table = SnapshotCache.table_from_rows(rows)
+        assert table.column_names == ['col_1', 'col_2', 'col_3', 'col_4']
+
+    def test_mixed_types_stored_as_text(self):
+        table = SnapshotCache.table_from_rows([(1, 'a'), ('x', 'b')])
+        assert table.column('col_1').to_pylist() == ['1', 'x']
+
+    def test_fingerprint_mismatch_invalidates(self, cache, rows):
+        date = datetime(2025, 1, 15)
+        cache.put('ventas', date, rows, fingerprint='fp-1')
+
+        assert cache.get('ventas', date, 'fp-1') is not None
+        assert cache.get('ventas', date, 'fp-2') is None
+        assert not cache.path_for('ventas', date).exists()
+
+    def test_read_metadata(self, cache, rows):
+        date = datetime(2025, 1, 15)
+        cache.put('ventas', date, rows, fingerprint='fp-1', metadata={'origen': 'oracle'})
+
+        metadata = cache.read_metadata('ventas', date)
+        assert metadata['fingerprint'] == 'fp-1'
+        assert metadata['origen'] == 'oracle'
+
+    def test_evict_least_recently_used(self, cache, rows):
+        old = datetime(2025, 1, 14)
+        new = datetime(2025, 1, 15)
+        cache.put('ventas', old, rows)
+        old_path = cache.path_for('ventas', old)
+        os.utime(old_path, (1, 1))
+        cache.put('ventas', new, rows)
+
+        cache.max_bytes = cache.path_for('ventas', new).stat().st_size
+        removed = cache.evict()
+
+        assert removed == [old_path]
+        assert cache.path_for('ventas', new).exists()
+
+    def test_watermark_roundtrip(self, cache, rows):
+        date = datetime(2025, 1, 15)
+        table = SnapshotCache.table_from_rows(rows, ['ID', 'PRODUCT', 'AMOUNT', 'TS'])
+        watermark = SnapshotCache.max_watermark(table, 'ts')
+        cache.put_table('ventas', date, table, metadata={'watermark': watermark})
+
+        stored = cache.get('ventas', date)
+        assert SnapshotCache.read_watermark(stored) == datetime(2025, 1, 15, 11, 0)
+
+    def test_read_integer_watermark(self):
+        table = SnapshotCache.table_from_rows([(1, 10), (2, 12)], ['ID', 'SEQ'])
+        table = table.replace_schema_metadata({b'watermark': SnapshotCache.max_watermark(table, 'SEQ').encode()})
+        assert SnapshotCache.read_watermark(table) == 12
+
+    def test_merge_upserts_by_key(self, rows):
+        names = ['ID', 'PRODUCT', 'AMOUNT', 'TS']
+        table = SnapshotCache.table_from_rows(rows, names)
+        delta = SnapshotCache.table_from_rows(
+            [(2, 'Mouse', 29.99, datetime(2025, 1, 15, 12, 0)),
+             (3, 'Hub', 24.99, datetime(2025, 1, 15, 12, 5))],
+            ['id', 'product', 'amount', 'ts']
+        )
+
+        merged = SnapshotCache.merge(table, delta, ['id'])
+
+        assert merged.column('ID').to_pylist() == [1, 2, 3]
+        assert merged.column('AMOUNT').to_pylist() == [1299.99, 29.99, 24.99]
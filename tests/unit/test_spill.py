@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for spill-to-disk row buffers."""
+
+import sys
+sys.path.append('.')
+import pytest
+from decimal import Decimal
+from datetime import datetime
+from unittest.mock import Mock
+
+from src.core.spill import SpillBuffer, MemoryBudget, row_memory
+from src.core.exceptions import PipelineError
+
+
+def make_rows(count):
+    return [[(i * 7919) % count, f"item {i}", Decimal('1.50'), datetime(2025, 1, 1, i % 24)]
+            for i in range(count)]
+
+
+class TestSpillBuffer:
+
+    def test_unlimited_stays_in_memory(self):
+        buffer = SpillBuffer()
+        buffer.extend(make_rows(100))
+        assert len(buffer) == 100
+        assert not buffer.spilled
+        assert buffer.rows == make_rows(100)
+
+    def test_spills_past_budget_and_keeps_order(self, tmp_path):
+        rows = make_rows(500)
+        buffer = SpillBuffer(budget_bytes=row_memory(rows[0]) * 50, directory=tmp_path, batch_rows=16)
+        buffer.extend(rows)
+
+        assert buffer.spilled
+        assert len(buffer.rows) <= 50
+        assert len(buffer) == 500
+        assert list(buffer) == rows
+        assert list(buffer) == rows
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_external_sort(self, tmp_path):
+        rows = make_rows(300)
+        buffer = SpillBuffer(budget_bytes=row_memory(rows[0]) * 40, directory=tmp_path, batch_rows=8)
+        buffer.extend(rows)
+
+        ordered = list(buffer.sorted(key=lambda row: row[0]))
+        assert ordered == sorted(rows, key=lambda row: row[0])
+        assert list(buffer.sorted(key=lambda row: row[1], reverse=True)) == \
+            sorted(rows, key=lambda row: row[1], reverse=True)
+
+    def test_close_removes_files(self, tmp_path):
+        with SpillBuffer(budget_bytes=1, directory=tmp_path) as buffer:
+            buffer.extend(make_rows(10))
+            list(buffer.sorted(key=lambda row: row[0]))
+            assert list(tmp_path.iterdir())
+        assert list(tmp_path.iterdir()) == []
+        assert len(buffer) == 0
+
+
+class TestMemoryBudget:
+
+    def make_budget(self, values):
+        config = Mock()
+        config.get.side_effect = lambda section, key, default=None: values.get(key, default)
+        config.getint.side_effect = lambda section, key, default=None: default
+        config.getboolean.side_effect = lambda section, key, default=None: \
+            values.get(key, default)
+        return MemoryBudget(config)
+
+    def test_disabled_by_default(self):
+        assert self.make_budget({}).enabled is False
+
+    def test_budget_from_config(self, tmp_path):
+        budget = self.make_budget({'presupuesto_mb': '0.5', 'directorio_temporal': str(tmp_path)})
+        assert budget.enabled
+        buffer = budget.buffer()
+        assert buffer.budget_bytes == 512 * 1024
+        assert buffer.directory == tmp_path
+
+    def test_sort_key_nulls_last(self):
+        budget = self.make_budget({'ordenar_por': 'monto, 1'})
+        key = budget.sort_key(['ID', 'MONTO'])
+        rows = [[2, None], [1, 5.0], [3, 1.0], [0, None]]
+        assert sorted(rows, key=key) == [[3, 1.0], [1, 5.0], [0, None], [2, None]]
+
+    def test_unknown_sort_column(self):
+        with pytest.raises(PipelineError, match='FECHA'):
+            self.make_budget({'ordenar_por': 'FECHA'}).sort_key(['ID'])
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for SummaryStage."""
+
+import sys
+sys.path.append('.')
+import pytest
+from unittest.mock import Mock
+
+from src.core.summary import SummaryStage
+from src.core.exceptions import PipelineError
+
+
+class TestSummaryStage:
+
+    @pytest.fixture
+    def mock_config(self):
+        config = Mock()
+        config.getboolean.side_effect = lambda section, key, default=False: True
+        config.get.side_effect = lambda section, key, default=None: {
+            ('RESUMEN', 'columnas'): 'amount, 4',
+            ('RESUMEN', 'agrupar_por'): 'product',
+            ('RESUMEN', 'columna_total'): 'amount',
+        }.get((section, key), default)
+        return config
+
+    @pytest.fixture
+    def columns(self):
+        return ['ID', 'PRODUCT', 'AMOUNT', 'QUANTITY']
+
+    def test_disabled_by_default(self):
+        config = Mock()
+        config.getboolean.return_value = False
+        stage = SummaryStage(config)
+        assert stage.enabled is False
+        assert stage.columns == []
+
+    def test_totals_across_batches(self, mock_config, columns):
+        stage = SummaryStage(mock_config)
+        stage.begin(columns)
+        stage.update([(1, 'A', 10.0, 2), (2, 'B', None, 3)])
+        stage.update([(3, 'A', 5.5, 1)])
+
+        summary = stage.finish()
+
+        assert summary.records == 3
+        assert summary.total_amount == 15.5
+        assert summary.columns['amount'].count == 2
+        assert summary.columns['amount'].minimum == 5.5
+        assert summary.columns['amount'].maximum == 10.0
+        assert summary.columns['4'].total == 6
+
+    def test_group_by(self, mock_config, columns):
+        stage = SummaryStage(mock_config)
+        stage.begin(columns)
+        stage.update([(1, 'A', 10.0, 2), (2, 'B', 1.0, 3)])
+        stage.update([(3, 'A', 5.5, 1)])
+
+        summary = stage.finish()
+
+        assert summary.groups['A'] == {'amount': 15.5, '4': 3.0, 'count': 2.0}
+        assert summary.groups['B']['count'] == 1.0
+
+    def test_to_sheet(self, mock_config, columns):
+        stage = SummaryStage(mock_config)
+        stage.begin(columns)
+        stage.update([(1, 'A', 10.0, 2)])
+
+        headers, rows = stage.finish().to_sheet()
+
+        assert headers == ['Columna', 'Registros', 'Total', 'Minimo', 'Maximo']
+        assert rows[0] == ['amount', 1, 10.0, 10.0, 10.0]
+        assert rows[3] == ['product', 'Registros', 'amount', '4']
+        assert rows[4] == ['A', 1, 10.0, 2.0]
+
+    def test_unknown_column(self, mock_config):
+        stage = SummaryStage(mock_config)
+        with pytest.raises(PipelineError, match="Summary column not found"):
+            stage.begin(['ID'])
+
+    def test_non_numeric_column(self, mock_config, columns):
+        stage = SummaryStage(mock_config)
+        stage.begin(columns)
+        with pytest.raises(PipelineError, match="not numeric"):
+            stage.update([(1, 'A', 'abc', 2)])
+
+    def test_update_batch_from_columns(self, mock_config, columns):
+        from src.core.columnar import ColumnBatch
+
+        stage = SummaryStage(mock_config)
+        stage.begin(columns)
+        stage.update_batch(ColumnBatch.from_rows(
+            [(1, 'A', 10, 2), (2, None, None, None), (3, 'A', 5, 1)], columns
+        ))
+
+        summary = stage.finish()
+
+        assert summary.records == 3
+        assert summary.total_amount == 15.0
+        assert summary.columns['4'].count == 2
+        assert summary.groups['A']['count'] == 2.0
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for SyntheticDataGenerator."""
+
+import sys
+sys.path.append('.')
+import sqlite3
+import pytest
+from datetime import datetime
+
+from src.utils.synthetic import SyntheticDataGenerator, SyntheticSpec, CHUNK_ROWS
+from src.core.exceptions import PipelineError
+
+
+class TestSyntheticDataGenerator:
+
+    def test_deterministic_for_same_seed(self):
+        spec = SyntheticSpec(rows=500, columns=5, null_ratio=0.1, seed=3)
+        assert SyntheticDataGenerator(spec).rows() == SyntheticDataGenerator(spec).rows()
+
+    def test_different_seed_changes_data(self):
+        first = SyntheticDataGenerator(SyntheticSpec(rows=100, seed=1)).rows()
+        second = SyntheticDataGenerator(SyntheticSpec(rows=100, seed=2)).rows()
+        assert first != second
+
+    def test_type_mix_allocation(self):
+        spec = SyntheticSpec(columns=4, type_mix={'int': 1, 'text': 3})
+        generator = SyntheticDataGenerator(spec)
+        assert sorted(generator.types) == ['int', 'text', 'text', 'text']
+        assert generator.column_names[:2] == ['id', 'report_date']
+
+    def test_shape_spread_and_cardinality(self):
+        spec = SyntheticSpec(
+            rows=CHUNK_ROWS + 10, columns=4, type_mix={'text': 1},
+            start_date=datetime(2025, 1, 15), days=3, cardinality=7
+        )
+        rows = SyntheticDataGenerator(spec).rows()
+
+        assert len(rows) == CHUNK_ROWS + 10
+        assert [row[0] for row in rows] == list(range(1, CHUNK_ROWS + 11))
+        assert {row[1] for row in rows} == {
+            '2025-01-15 00:00:00', '2025-01-16 00:00:00', '2025-01-17 00:00:00'
+        }
+        assert len({row[2] for row in rows}) == 7
+
+    def test_null_ratio(self):
+        spec = SyntheticSpec(rows=5000, columns=1, type_mix={'float': 1}, null_ratio=0.2)
+        rows = SyntheticDataGenerator(spec).rows()
+        nulls = sum(1 for row in rows if row[2] is None)
+        assert 800 < nulls < 1200
+
+    def test_native_dates(self):
+        spec = SyntheticSpec(rows=10, columns=1, type_mix={'datetime': 1})
+        row = SyntheticDataGenerator(spec).rows(native_dates=True)[0]
+        assert isinstance(row[1], datetime)
+        assert isinstance(row[2], datetime)
+
+    def test_invalid_spec(self):
+        with pytest.raises(PipelineError, match="Unknown column types"):
+            SyntheticDataGenerator(SyntheticSpec(type_mix={'blob': 1}))
+        with pytest.raises(PipelineError, match="null_ratio"):
+            SyntheticDataGenerator(SyntheticSpec(null_ratio=1.5))
+
+    def test_load_sqlite(self, tmp_path):
+        spec = SyntheticSpec(rows=2500, columns=3, days=2)
+        path = tmp_path / "load.db"
+
+        assert SyntheticDataGenerator(spec).load_sqlite(path) == 2500
+
+        conn = sqlite3.connect(path)
+        count = conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+        days = conn.execute("SELECT COUNT(DISTINCT report_date) FROM reports").fetchone()[0]
+        conn.close()
+        assert count == 2500
+        assert days == 2
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for RowTee."""
+
+import sys
+sys.path.append('.')
+import threading
+import pytest
+
+from src.core.tee import RowTee
+from src.core.exceptions import PipelineError
+
+
+class TestRowTee:
+
+    def test_every_writer_gets_every_row(self):
+        tee = RowTee(buffer_batches=2, batch_size=3)
+        tee.add('a', lambda rows: list(rows))
+        tee.add('b', lambda rows: sum(row[0] for row in rows))
+
+        results = tee.run([i] for i in range(10))
+
+        assert results['a'] == [[i] for i in range(10)]
+        assert results['b'] == 45
+        assert set(tee.timings) == {'a', 'b'}
+
+    def test_slow_writer_bounds_buffering(self):
+        release = threading.Event()
+        consumed = []
+
+        def source():
+            for i in range(100):
+                consumed.append(i)
+                yield [i]
+
+        def slow(rows):
+            release.wait(5)
+            return len(list(rows))
+
+        tee = RowTee(buffer_batches=2, batch_size=5)
+        tee.add('fast', lambda rows: len(list(rows)))
+        tee.add('slow', slow)
+        runner = threading.Thread(target=lambda: consumed.append(tee.run(source())))
+        runner.start()
+        runner.join(0.3)
+
+        # Two queued batches, one being put and one in the slow writer's hands
+        assert len(consumed) <= 4 * 5
+        release.set()
+        runner.join(5)
+        assert consumed[-1] == {'fast': 100, 'slow': 100}
+
+    def test_failed_writer_does_not_stall_others(self):
+        def broken(rows):
+            next(iter(rows))
+            raise ValueError("disk full")
+
+        tee = RowTee(buffer_batches=1, batch_size=1)
+        tee.add('broken', broken)
+        tee.add('ok', lambda rows: len(list(rows)))
+
+        with pytest.raises(PipelineError, match='broken: disk full'):
+            tee.run([i] for i in range(50))
+        assert 'ok' in tee.timings
+
+    def test_source_error_aborts_writers(self):
+        def source():
+            yield [1]
+            raise RuntimeError("cursor closed")
+
+        finished = []
+        tee = RowTee(batch_size=1)
+        tee.add('w', lambda rows: finished.append(list(rows)))
+
+        with pytest.raises(PipelineError, match='cursor closed'):
+            tee.run(source())
+        assert finished == []
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for TextGenerator."""
+
+import sys
+sys.path.append('.')
+from datetime import datetime
+from unittest.mock import Mock
+
+from src.core.text import TextGenerator
+
+
+class TestTextGenerator:
+
+    def test_european_format(self, tmp_path):
+        path = TextGenerator().generate_csv(
+            [[1, 'Ana', 1234.5, datetime(2025, 1, 15, 8, 30)], [2, None, 0.125, None]],
+            tmp_path / 'out' / 'report.csv',
+            ['ID', 'NAME', 'AMOUNT', 'DATE']
+        )
+
+        lines = path.read_text(encoding='utf-8-sig').splitlines()
+        assert lines == [
+            'ID;NAME;AMOUNT;DATE',
+            '1;Ana;1234,50;2025-01-15 08:30:00',
+            '2;;0,12;',
+        ]
+
+    def test_configured_separator_and_decimals(self, tmp_path):
+        config = Mock()
+        config.get.side_effect = lambda section, key, default=None: {
+            'formato_numero': 'americano', 'separador': ','
+        }.get(key, default)
+        config.getint.return_value = 1
+
+        path = TextGenerator(config).generate_csv(iter([[1.25, 'a,b']]), tmp_path / 'r.csv')
+
+        assert path.read_text(encoding='utf-8-sig').splitlines() == ['1.2,"a,b"']
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for database throttling."""
+
+import sys
+sys.path.append('.')
+import time
+import threading
+import pytest
+from unittest.mock import Mock
+
+from src.core.throttle import TokenBucket, ConcurrencyLimiter, SharedSlots, DatabaseThrottle
+
+
+class TestTokenBucket:
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=50, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            bucket.acquire()
+        assert time.monotonic() - start >= 0.035
+
+
+class TestConcurrencyLimiter:
+
+    def test_bounds_in_flight(self):
+        limiter = ConcurrencyLimiter(2)
+        peak = []
+
+        def work():
+            limiter.acquire()
+            peak.append(limiter.in_use)
+            time.sleep(0.02)
+            limiter.release()
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert max(peak) <= 2
+        assert limiter.in_use == 0
+
+    def test_adaptive_backs_off_and_recovers(self):
+        limiter = ConcurrencyLimiter(10, adaptive=True, target_latency=0.5)
+        for _ in range(20):
+            limiter.acquire()
+            limiter.release(2.0)
+        assert limiter.limit < 10
+
+        low = limiter.limit
+        for _ in range(50):
+            limiter.acquire()
+            limiter.release(0.01)
+        assert limiter.limit > low
+
+
+class TestSharedSlots:
+
+    def test_limit_across_instances(self, tmp_path):
+        first = SharedSlots(tmp_path / 'slots.db', limit=1)
+        second = SharedSlots(tmp_path / 'slots.db', limit=1)
+        slot_id, _ = first.acquire()
+        acquired = []
+
+        thread = threading.Thread(target=lambda: acquired.append(second.acquire()))
+        thread.start()
+        time.sleep(0.1)
+        assert acquired == []
+
+        first.release(slot_id)
+        thread.join(timeout=5)
+        assert len(acquired) == 1
+
+    def test_abandoned_slot_is_reclaimed(self, tmp_path):
+        slots = SharedSlots(tmp_path / 'slots.db', limit=1, lease_seconds=0)
+        slots.acquire()
+        slot_id, waited = slots.acquire()
+        assert slot_id
+
+
+class TestDatabaseThrottle:
+
+    @pytest.fixture
+    def settings(self):
+        return {'habilitado': True}
+
+    @pytest.fixture
+    def config(self, settings):
+        config = Mock()
+        config.getboolean.side_effect = lambda section, key, default=None: settings.get(key, default)
+        config.getint.side_effect = lambda section, key, default=None: settings.get(key, default)
+        config.get.side_effect = lambda section, key, default=None: settings.get(key, default)
+        return config
+
+    def test_disabled_is_noop(self, config, settings):
+        settings['habilitado'] = False
+        throttle = DatabaseThrottle(config)
+        with throttle.slot():
+            pass
+        assert throttle.stats().queries == 0
+
+    def test_slot_counts_queries(self, config, settings, tmp_path):
+        settings.update(max_concurrentes=2, archivo_compartido=str(tmp_path / 'slots.db'))
+        throttle = DatabaseThrottle(config)
+        with throttle.slot():
+            assert throttle.limiter.in_use == 1
+        stats = throttle.stats()
+        assert stats.queries == 1
+        assert stats.limit == 2
+
+    def test_failed_shared_slot_releases_limiter(self, config, settings, tmp_path):
+        settings.update(max_concurrentes=2, archivo_compartido=str(tmp_path / 'slots.db'))
+        throttle = DatabaseThrottle(config)
+        throttle.slots.acquire = Mock(side_effect=OSError("database is locked"))
+
+        with pytest.raises(OSError):
+            with throttle.slot():
+                pass
+
+        assert throttle.limiter.in_use == 0
+        assert throttle.stats().queries == 0
+
+    def test_lease_latency_feeds_adaptive_limit(self, config, settings):
+        settings['adaptativo'] = True
+        throttle = DatabaseThrottle(config)
+        throttle.limiter.release = Mock()
+
+        with throttle.slot() as lease:
+            lease.latency = 0.01
+            time.sleep(0.05)
+        with throttle.slot():
+            time.sleep(0.05)
+
+        samples = [c[0][0] for c in throttle.limiter.release.call_args_list]
+        assert samples[0] == 0.01
+        assert samples[1] >= 0.05
+
+    def test_shared_per_settings(self, config, settings):
+        settings['max_concurrentes'] = 3
+        assert DatabaseThrottle.shared(config) is DatabaseThrottle.shared(config)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for ArrivalWatcher."""
+
+import sys
+sys.path.append('.')
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+from src.reports.watcher import ArrivalWatcher
+from src.reports.processor import ProcessResult
+from src.core.exceptions import ConfigurationError
+
+
+class FakeClock:
+    """Clock advanced by the injected sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def __call__(self):
+        return self.now
+
+
+class TestArrivalWatcher:
+
+    @pytest.fixture
+    def processor(self):
+        processor = Mock()
+        processor.dry_run = False
+        processor.process.return_value = ProcessResult(success=True, records_processed=5)
+        return processor
+
+    @pytest.fixture
+    def settings(self):
+        return {}
+
+    @pytest.fixture
+    def config(self, settings):
+        config = Mock()
+        config.get.side_effect = lambda section, key, default=None: settings.get(key, default)
+        config.getint.side_effect = lambda section, key, default=None: int(settings.get(key, default))
+        config.getboolean.side_effect = lambda section, key, default=None: settings.get(key, default)
+        return config
+
+    def make_watcher(self, processor, config, counts):
+        processor.db.check_data_exists.side_effect = [(c > 0, c) for c in counts]
+        clock = FakeClock()
+        watcher = ArrivalWatcher(config, processor, sleep=clock.sleep, clock=clock)
+        return watcher, clock
+
+    def test_backoff_until_data_arrives(self, processor, config, settings):
+        settings.update(intervalo_inicial_segundos='10', factor='2', intervalo_maximo_segundos='25')
+        watcher, clock = self.make_watcher(processor, config, [0, 0, 0, 7])
+
+        result = watcher.wait_for_data(datetime(2025, 1, 15))
+
+        assert result.ready is True
+        assert result.polls == 4
+        assert result.records == 7
+        assert clock.sleeps == [10, 20, 25]
+
+    def test_stable_mode_waits_for_unchanged_count(self, processor, config, settings):
+        settings.update(modo='estable', lecturas_estables='3')
+        watcher, _ = self.make_watcher(processor, config, [0, 3, 8, 8, 8])
+
+        result = watcher.wait_for_data(datetime(2025, 1, 15))
+
+        assert result.ready is True
+        assert result.polls == 5
+
+    def test_marker_mode(self, processor, config, settings):
+        settings.update(modo='marca', tabla_marca='etl_control', columna_fecha='fecha_carga')
+        watcher, _ = self.make_watcher(processor, config, [5, 5])
+        processor.db.execute_prepared.side_effect = [[(0,)], [(1,)]]
+
+        result = watcher.wait_for_data(datetime(2025, 1, 15))
+
+        assert result.ready is True
+        assert result.polls == 2
+        query = processor.db.execute_prepared.call_args[0][0]
+        assert 'etl_control' in query and 'fecha_carga' in query
+
+    def test_timeout_notifies_once(self, processor, config, settings):
+        settings.update(intervalo_inicial_segundos='60', limite_minutos='3')
+        watcher, clock = self.make_watcher(processor, config, [0] * 10)
+
+        result = watcher.watch(datetime(2025, 1, 15), 'out.xlsx')
+
+        assert result.success is False
+        assert 'No data available' in result.error
+        assert clock.now == 180
+        processor.email.notify_no_data.assert_called_once()
+        processor.process.assert_not_called()
+
+    def test_watch_processes_when_ready(self, processor, config):
+        watcher, _ = self.make_watcher(processor, config, [0, 4])
+
+        result = watcher.watch(datetime(2025, 1, 15), 'out.xlsx', send_email=False)
+
+        assert result.success is True
+        processor.process.assert_called_once_with(
+            datetime(2025, 1, 15), 'out.xlsx', None, upload_ftp=True, send_email=False
+        )
+
+    def test_invalid_settings(self, processor, config, settings):
+        settings['modo'] = 'siempre'
+        with pytest.raises(ConfigurationError):
+            ArrivalWatcher(config, processor)
+        settings.update(modo='marca', tabla_marca='t; DROP TABLE x')
+        with pytest.raises(ConfigurationError):
+            ArrivalWatcher(config, processor)
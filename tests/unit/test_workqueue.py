@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the distributed work queue."""
+
+import sys
+sys.path.append('.')
+import time
+import threading
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+from src.utils.workqueue import WorkQueue, QueueWorker, PENDING, RUNNING, DONE, FAILED
+
+
+class TestWorkQueue:
+
+    @pytest.fixture
+    def make_queue(self, tmp_path):
+        def factory(lease=300, attempts=3):
+            config = Mock()
+            config.get.side_effect = lambda section, key, default=None: (
+                str(tmp_path / 'cola.db') if key == 'archivo' else default
+            )
+            config.getint.side_effect = lambda section, key, default=None: {
+                'lease_segundos': lease, 'max_intentos': attempts
+            }[key]
+            return WorkQueue(config)
+        return factory
+
+    def test_enqueue_is_idempotent(self, make_queue):
+        queue = make_queue()
+        dates = [datetime(2025, 1, d) for d in (1, 2, 3)]
+
+        assert queue.enqueue('ventas', dates) == 3
+        assert queue.enqueue('ventas', dates) == 0
+        assert queue.counts()[PENDING] == 3
+
+    def test_claims_are_exclusive_and_ordered(self, make_queue):
+        queue = make_queue()
+        queue.enqueue('ventas', [datetime(2025, 1, 2), datetime(2025, 1, 1)])
+
+        first = queue.claim('w1')
+        second = queue.claim('w2')
+
+        assert first.date == datetime(2025, 1, 1)
+        assert second.date == datetime(2025, 1, 2)
+        assert queue.claim('w3') is None
+        assert queue.counts()[RUNNING] == 2
+
+    def test_expired_lease_is_requeued(self, make_queue):
+        queue = make_queue(lease=0, attempts=2)
+        queue.enqueue('ventas', [datetime(2025, 1, 1)])
+
+        lost = queue.claim('w1')
+        time.sleep(0.01)
+        task = queue.claim('w2')
+
+        assert task.worker == 'w2'
+        assert task.attempts == 2
+        assert queue.complete(lost) is False
+        time.sleep(0.01)
+        assert queue.claim('w3') is None
+        assert queue.counts()[FAILED] == 1
+
+    def test_failure_retries_then_gives_up(self, make_queue):
+        queue = make_queue(attempts=2)
+        queue.enqueue('ventas', [datetime(2025, 1, 1)])
+
+        queue.fail(queue.claim('w1'), 'boom')
+        assert queue.counts()[PENDING] == 1
+        queue.fail(queue.claim('w1'), 'boom')
+        assert queue.counts()[FAILED] == 1
+
+    def test_requeue_keeps_done_unless_asked(self, make_queue):
+        queue = make_queue(attempts=1)
+        dates = [datetime(2025, 1, d) for d in (1, 2)]
+        queue.enqueue('ventas', dates)
+        queue.complete(queue.claim('w1'))
+        queue.fail(queue.claim('w1'), 'boom')
+
+        assert queue.requeue('ventas', dates) == 1
+        assert queue.counts() == {PENDING: 1, RUNNING: 0, DONE: 1, FAILED: 0}
+        assert queue.claim('w1').attempts == 1
+
+        assert queue.requeue('ventas', dates, include_done=True) == 2
+        assert queue.counts()[PENDING] == 2
+
+    def test_claim_filters_reports(self, make_queue):
+        queue = make_queue()
+        queue.enqueue('ventas', [datetime(2025, 1, 1)])
+        assert queue.claim('w1', ['stock']) is None
+
+
+class TestQueueWorker:
+
+    def test_workers_drain_the_queue(self, tmp_path):
+        config = Mock()
+        config.get.side_effect = lambda section, key, default=None: (
+            str(tmp_path / 'cola.db') if key == 'archivo' else default
+        )
+        config.getint.side_effect = lambda section, key, default=None: default
+        queue = WorkQueue(config)
+        queue.enqueue('ventas', [datetime(2025, 1, d) for d in range(1, 11)])
+
+        processed = []
+        lock = threading.Lock()
+
+        def callback(date):
+            with lock:
+                processed.append(date)
+            if date.day == 5:
+                raise ValueError("bad day")
+
+        workers = [QueueWorker(WorkQueue(config), {'ventas': callback}, f"w{i}") for i in range(3)]
+        results = []
+        threads = [threading.Thread(target=lambda w=w: results.append(w.run())) for w in workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sum(r.successful for r in results) == 9
+        assert queue.counts()[DONE] == 9
+        assert processed.count(datetime(2025, 1, 5)) == 3
+        assert queue.counts()[FAILED] == 1
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for direct xlsx rendering."""
+
+import sys
+from datetime import datetime
+
+from openpyxl import load_workbook
+
+sys.path.append('.')
+from src.core import xlsx
+
+
+class TestRendering:
+    """Test SpreadsheetML rendering helpers."""
+
+    def test_column_letter(self):
+        assert xlsx.column_letter(0) == 'A'
+        assert xlsx.column_letter(25) == 'Z'
+        assert xlsx.column_letter(26) == 'AA'
+        assert xlsx.column_letter(701) == 'ZZ'
+        assert xlsx.column_letter(702) == 'AAA'
+
+    def test_excel_serial(self):
+        assert xlsx.excel_serial(datetime(1900, 1, 1)) == 2
+        assert xlsx.excel_serial(datetime(2025, 1, 15, 12)) == 45672.5
+
+    def test_render_cell_types(self):
+        assert xlsx.render_cell('A1', None) == ''
+        assert xlsx.render_cell('A1', '') == ''
+        assert 's="1"' in xlsx.render_cell('A1', 1.5)
+        assert 's="2"' in xlsx.render_cell('A1', datetime(2025, 1, 15))
+        assert 't="b"' in xlsx.render_cell('A1', True)
+        assert '&lt;b&gt; &amp;' in xlsx.render_cell('A1', '<b> &\x01')
+
+    def test_shared_strings(self):
+        strings = xlsx.SharedStrings()
+        xml = xlsx.render_rows([['a', 'b'], ['a', 1]], strings=strings).decode('utf-8')
+        assert strings.strings == ['a', 'b']
+        assert '<c r="A2" t="s"><v>0</v></c>' in xml
+
+    def test_render_rows_numbering(self):
+        xml = xlsx.render_rows([[1], [2]], first_row=5).decode('utf-8')
+        assert '<row r="5">' in xml and 'r="A6"' in xml
+
+
+class TestPackage:
+    """Test assembling xlsx files."""
+
+    def test_write_package_readable(self, tmp_path):
+        path = tmp_path / 'out.xlsx'
+        rows = [[1, 'a', datetime(2025, 1, 15, 8, 30)], [2.5, None, True]]
+        header = xlsx.render_rows([['N', 'Texto', 'Fecha']], 1, xlsx.STYLE_HEADER)
+
+        xlsx.write_package(
+            path,
+            [('Datos', [header, xlsx.render_rows(rows, 2)]), ('Vacía', [])],
+            '#,##0.00'
+        )
+
+        wb = load_workbook(path)
+        assert wb.sheetnames == ['Datos', 'Vacía']
+        ws = wb['Datos']
+        assert [c.value for c in ws[1]] == ['N', 'Texto', 'Fecha']
+        assert ws['A1'].font.bold
+        assert ws['A2'].value == 1 and ws['A2'].number_format == '#,##0.00'
+        assert ws['C2'].value == datetime(2025, 1, 15, 8, 30)
+        assert ws['A3'].value == 2.5 and ws['B3'].value is None
+        assert ws['C3'].value is True
+
+    def test_workbook_writer_interleaves_sheets(self, tmp_path):
+        workbook = xlsx.WorkbookWriter('#,##0.00', block_rows=2)
+        first = workbook.add_sheet('Uno', xlsx.SheetLayout(freeze_header=True))
+        second = workbook.add_sheet('Dos')
+        first.header(['N', 'Texto'])
+        for i in range(5):
+            (first if i % 2 else second).append([i, f"t{i % 2}"])
+        first.layout.autofilter = 'A1:B3'
+
+        workbook.save(tmp_path / 'out.xlsx')
+
+        wb = load_workbook(tmp_path / 'out.xlsx')
+        assert [list(r) for r in wb['Uno'].iter_rows(values_only=True)] == [
+            ['N', 'Texto'], [1, 't1'], [3, 't1']
+        ]
+        assert [r[0] for r in wb['Dos'].iter_rows(values_only=True)] == [0, 2, 4]
+        assert wb['Uno']['A1'].font.bold and wb['Uno'].freeze_panes == 'A2'
+        assert wb['Uno'].auto_filter.ref == 'A1:B3'